@@ -1,10 +1,12 @@
 # [file name]: main.py - CORRECTED IMPORT
-from fastapi import FastAPI, Depends, HTTPException, Query, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from datetime import datetime, timedelta
 from typing import List, Optional
+import json
 import secrets
 import logging
 import bcrypt
@@ -13,22 +15,42 @@ import bcrypt
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-from app.database import get_db, engine, SessionLocal
+from app.database import get_db, engine, SessionLocal, add_missing_columns, add_missing_indexes
 from app.models import Base, User, Job, Application, SavedJob, Feedback
 from app.schemas import UserProfile, ApplicationResponse
-from app.services.matcher import calculate_match_score
+from app.services.matcher import calculate_match_score, get_user_match_profile, invalidate_user_match_profile
+from app.services.job_features import backfill_job_features, get_job_features
+from app.services.job_dedupe import backfill_job_fingerprints
+from app.services.job_text import job_search_text
+from app.services.batch_scorer import (
+    decode_cursor,
+    encode_cursor,
+    get_job_catalog,
+    get_scores,
+    top_k
+)
+from app.services.parallel_scorer import parallel_score_many
+from app.services.recommendations import get_top_matches, refresh_user_matches
 from app.services.ai_generator import (
     generate_cover_letter_with_ai, 
     generate_tailored_resume_with_ai,
     generate_interview_prep_with_ai
 )
+from app.services.embeddings import embedding_cache_stats
+from app.services.job_embeddings import backfill_job_embeddings, semantic_top_k
+from app.services.job_expiry import expire_jobs
+from app.services.cascade import CASCADE_EMBEDDING_WEIGHT, CASCADE_TOP_N, cascade_rank, server_timing
 # CORRECTED IMPORT - from services folder
-from app.services.enhanced_job_sources import fetch_all_enhanced_jobs
+from app.services.enhanced_job_sources import iter_enhanced_jobs, source_cache_stats, source_health
+from app.services.job_import import import_job_stream, save_watermarks
+from app.services.import_tasks import get_import, start_import
 
 # ... rest of the main.py code remains the same ...# ADD THIS
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine, Base.metadata)
+add_missing_indexes(engine, Base.metadata)
 
 app = FastAPI(
     title="Job Agent AI API",
@@ -48,6 +70,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
 def get_current_user(token: str = Depends(security), db: Session = Depends(get_db)):
@@ -99,6 +122,18 @@ def health_check(db: Session = Depends(get_db)):
         logger.error(f"Health check failed: {e}")
         return {"status": "unhealthy", "error": str(e)}
 
+@app.get("/embeddings/stats")
+def get_embedding_stats():
+    return embedding_cache_stats()
+
+@app.get("/sources/cache/stats")
+def get_source_cache_stats():
+    return source_cache_stats()
+
+@app.get("/sources/health")
+def get_source_health():
+    return source_health()
+
 # AUTH ENDPOINTS
 # ADD THIS NEW ENDPOINT to the AUTH ENDPOINTS section
 
@@ -194,8 +229,9 @@ def login(user_data: dict, db: Session = Depends(get_db)):
             # Update user data if provided
             if full_name:
                 user.full_name = full_name
-            if resume_text:
+            if resume_text and resume_text != user.resume_text:
                 user.resume_text = resume_text
+                invalidate_user_match_profile(user.id)
             db.commit()
             logger.info(f"User logged in: {email}")
         
@@ -316,6 +352,8 @@ def update_user(user_id: int, user_data: dict, db: Session = Depends(get_db)):
         
         db.commit()
         db.refresh(user)
+        invalidate_user_match_profile(user.id)
+        refresh_user_matches(db, user)
         return user
     except Exception as e:
         db.rollback()
@@ -405,138 +443,263 @@ def create_application(application_data: dict, db: Session = Depends(get_db)):
         raise HTTPException(500, "Internal server error")
 
 # JOBS ENDPOINTS
+def job_to_dict(job: Job, score: float) -> dict:
+    """Serialize a scored job the way the job list endpoints return it"""
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "description": job.description,
+        "apply_url": job.apply_url,
+        "salary_min": job.salary_min,
+        "salary_max": job.salary_max,
+        "salary": job.salary,
+        "score": score,
+        "matchScore": score,
+        "type": job.job_type,
+        "level": job.level,
+        "tags": [job.job_type, job.level] if job.job_type and job.level else ["Full-time", "Mid Level"]
+    }
+
+def page_of_jobs(db: Session, ranked: list, limit: int, response: Response) -> list:
+    """Load and serialize only the ranked winners, and point X-Next-Cursor past the last one.
+
+    Callers rank limit + 1 jobs; the extra one only tells whether a next page exists.
+    """
+    if len(ranked) > limit:
+        ranked = ranked[:limit]
+        last_id, last_score = ranked[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last_score, last_id)
+    
+    jobs_by_id = {job.id: job for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]))}
+    
+    return [job_to_dict(jobs_by_id[job_id], score) for job_id, score in ranked if job_id in jobs_by_id]
+
 @app.get("/jobs/recommended")
-def get_recommended_jobs(db: Session = Depends(get_db), user_id: int = Query(1)):
+def get_recommended_jobs(
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: int = Query(1),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    mode: str = Query("keyword", pattern="^(keyword|semantic|cascade)$"),
+    rerank_n: int = Query(CASCADE_TOP_N, ge=1, le=5000),
+    rerank_weight: float = Query(CASCADE_EMBEDDING_WEIGHT, ge=0, le=1)
+):
     try:
+        after = decode_cursor(cursor) if cursor else None
         user = db.query(User).filter(User.id == user_id).first()
-        jobs = db.query(Job).all()
-        
-        # Calculate match scores for all jobs
-        jobs_with_scores = []
-        for job in jobs:
-            score = calculate_match_score(job, user) if user else 75.0
-            jobs_with_scores.append({
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.description,
-                "apply_url": job.apply_url,
-                "salary_min": job.salary_min,
-                "salary_max": job.salary_max,
-                "salary": job.salary,
-                "score": score,
-                "matchScore": score,
-                "type": job.job_type,
-                "level": job.level,
-                "tags": [job.job_type, job.level] if job.job_type and job.level else ["Full-time", "Mid Level"]
-            })
-        
-        # Sort by match score and return top 50
-        sorted_jobs = sorted(jobs_with_scores, key=lambda x: x["matchScore"], reverse=True)
-        return sorted_jobs[:50]
+        
+        # Semantic mode ranks job embeddings against the resume embedding,
+        # and falls back to keyword ranking when embeddings are unavailable
+        ranked = semantic_top_k(user, limit + 1, after) if user and mode == "semantic" else None
+        if user and mode == "cascade":
+            timings = {}
+            ranked = cascade_rank(db, user, limit + 1, after, None, rerank_n, rerank_weight, timings)
+            response.headers["Server-Timing"] = server_timing(timings)
+        elif ranked is None and user:
+            # Indexed read of the materialized job_matches rows
+            ranked = get_top_matches(db, user, limit + 1, after)
+        elif ranked is None:
+            catalog = get_job_catalog(db)
+            ranked = top_k(catalog, get_scores(catalog, None), limit + 1, after)
+        
+        return page_of_jobs(db, ranked, limit, response)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
     except Exception as e:
         logger.error(f"Get recommended jobs error: {e}")
         raise HTTPException(500, "Internal server error")
 
+def filter_jobs(jobs_query, query: Optional[str], location: Optional[str], min_salary: Optional[int] = None):
+    """Apply the text, location and salary filters shared by search and batch scoring"""
+    if query:
+        # search_text is stored lowercased and whitespace-collapsed, so a plain LIKE does
+        # without lowercasing every description
+        jobs_query = jobs_query.filter(
+            Job.title.ilike(f"%{query}%") | 
+            Job.search_text.like(f"%{' '.join(query.lower().split())}%") |
+            Job.company.ilike(f"%{query}%")
+        )
+    
+    if location:
+        jobs_query = jobs_query.filter(Job.location.ilike(f"%{location}%"))
+    
+    # Jobs whose range reaches the floor, found through the salary_max index; an
+    # open-ended range ("$100k+", salary_max NULL) reaches any floor
+    if min_salary:
+        jobs_query = jobs_query.filter(
+            (Job.salary_max >= min_salary) | (Job.salary_max.is_(None) & Job.salary_min.isnot(None))
+        )
+    
+    return jobs_query
+
 @app.get("/jobs/search")
 def search_jobs(
+    response: Response,
     query: Optional[str] = Query(None),
     location: Optional[str] = Query(None),
+    min_salary: Optional[int] = Query(None, ge=0),
     db: Session = Depends(get_db),
-    user_id: int = Query(1)
+    user_id: int = Query(1),
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    mode: str = Query("keyword", pattern="^(keyword|cascade)$"),
+    rerank_n: int = Query(CASCADE_TOP_N, ge=1, le=5000),
+    rerank_weight: float = Query(CASCADE_EMBEDDING_WEIGHT, ge=0, le=1)
 ):
     try:
-        jobs_query = db.query(Job)
+        after = decode_cursor(cursor) if cursor else None
+        jobs_query = filter_jobs(db.query(Job.id), query, location, min_salary)
         user = db.query(User).filter(User.id == user_id).first()
         
-        if query:
-            jobs_query = jobs_query.filter(
-                Job.title.ilike(f"%{query}%") | 
-                Job.description.ilike(f"%{query}%") |
-                Job.company.ilike(f"%{query}%")
+        # Only ids come back from the filter, scores come from the cached catalog vector
+        matching_ids = [row.id for row in jobs_query]
+        catalog = get_job_catalog(db)
+        if user and mode == "cascade":
+            timings = {}
+            ranked = cascade_rank(
+                db, user, limit + 1, after, catalog.positions(matching_ids), rerank_n, rerank_weight, timings
+            )
+            response.headers["Server-Timing"] = server_timing(timings)
+        else:
+            profile = get_user_match_profile(user) if user else None
+            ranked = top_k(catalog, get_scores(catalog, profile), limit + 1, after, catalog.positions(matching_ids))
+        
+        return page_of_jobs(db, ranked, limit, response)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        logger.error(f"Search jobs error: {e}")
+        raise HTTPException(500, "Internal server error")
+
+# Score matrices bigger than this are streamed as NDJSON unless a format is requested
+SCORE_BATCH_STREAM_THRESHOLD = 10000
+
+@app.post("/jobs/score-batch")
+def score_batch(score_data: dict, db: Session = Depends(get_db)):
+    """Score many (user, job) pairs in one call.
+    
+    Body: user_ids, plus either job_ids or the query/location/min_salary search filters
+    (all jobs if none are given). Optional format: "json" or "ndjson", and
+    mode: "parallel" to score on the shared-memory process pool.
+    """
+    try:
+        user_ids = score_data.get("user_ids") or []
+        job_ids = score_data.get("job_ids")
+        output_format = score_data.get("format")
+        mode = score_data.get("mode", "serial")
+        
+        if not user_ids:
+            raise HTTPException(400, "user_ids is required")
+        if output_format not in (None, "json", "ndjson"):
+            raise HTTPException(400, "format must be json or ndjson")
+        if mode not in ("serial", "parallel"):
+            raise HTTPException(400, "mode must be serial or parallel")
+        
+        # Each user's profile and each job's features are loaded exactly once
+        users_by_id = {user.id: user for user in db.query(User).filter(User.id.in_(user_ids))}
+        users = [users_by_id[user_id] for user_id in user_ids if user_id in users_by_id]
+        profiles = [get_user_match_profile(user) for user in users]
+        
+        jobs_query = db.query(Job).options(defer(Job.description))
+        if job_ids is not None:
+            jobs_query = jobs_query.filter(Job.id.in_(job_ids))
+        else:
+            jobs_query = filter_jobs(
+                jobs_query, score_data.get("query"), score_data.get("location"), score_data.get("min_salary")
             )
+        jobs = jobs_query.order_by(Job.id).all()
+        
+        if mode == "parallel":
+            # Score the whole catalog across worker processes, then pick the requested columns
+            catalog = get_job_catalog(db)
+            positions = catalog.positions([job.id for job in jobs])
+            result_job_ids = [int(job_id) for job_id in catalog.job_ids[positions]]
+            matrix = parallel_score_many(catalog, profiles)[:, positions]
+            
+            def score_rows():
+                for user, scores in zip(users, matrix):
+                    yield user.id, scores.tolist()
+        else:
+            job_features = [get_job_features(job) for job in jobs]
+            result_job_ids = [job.id for job in jobs]
+            
+            def score_rows():
+                for user, profile in zip(users, profiles):
+                    yield user.id, [calculate_match_score(features, user, profile) for features in job_features]
         
-        if location:
-            jobs_query = jobs_query.filter(Job.location.ilike(f"%{location}%"))
+        missing_user_ids = [user_id for user_id in user_ids if user_id not in users_by_id]
         
-        jobs = jobs_query.limit(100).all()
+        if output_format is None:
+            output_format = "ndjson" if len(users) * len(jobs) > SCORE_BATCH_STREAM_THRESHOLD else "json"
         
-        # Calculate match scores
-        result = []
-        for job in jobs:
-            score = calculate_match_score(job, user) if user else 75.0
-            result.append({
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.description,
-                "apply_url": job.apply_url,
-                "salary_min": job.salary_min,
-                "salary_max": job.salary_max,
-                "salary": job.salary,
-                "score": score,
-                "matchScore": score,
-                "type": job.job_type,
-                "level": job.level,
-                "tags": [job.job_type, job.level] if job.job_type and job.level else ["Full-time", "Mid Level"]
-            })
-        
-        return sorted(result, key=lambda x: x["matchScore"], reverse=True)
+        if output_format == "ndjson":
+            def ndjson_lines():
+                yield json.dumps({"job_ids": result_job_ids, "missing_user_ids": missing_user_ids}) + "\n"
+                for user_id, scores in score_rows():
+                    yield json.dumps({"user_id": user_id, "scores": scores}) + "\n"
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+        
+        rows = list(score_rows())
+        return {
+            "user_ids": [user_id for user_id, _ in rows],
+            "job_ids": result_job_ids,
+            "missing_user_ids": missing_user_ids,
+            "scores": [scores for _, scores in rows]
+        }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Search jobs error: {e}")
+        logger.error(f"Score batch error: {e}")
         raise HTTPException(500, "Internal server error")
 
-@app.post("/jobs/import")
-def import_jobs(import_data: dict, db: Session = Depends(get_db)):
+@app.post("/jobs/import", status_code=status.HTTP_202_ACCEPTED)
+def import_jobs(import_data: dict):
     try:
         query = import_data.get("query", "cloud engineer")
-        user_id = import_data.get("user_id", 1)
-        
-        # Fetch enhanced real jobs from multiple sources
-        jobs_data = fetch_all_enhanced_jobs(query)
-        
-        # Import to database
-        imported_count = 0
-        for job_data in jobs_data:
-            # Check if job already exists
-            existing = db.query(Job).filter(
-                Job.title == job_data.get("title"),
-                Job.company == job_data.get("company")
-            ).first()
-            
-            if not existing:
-                job = Job(
-                    title=job_data.get("title", ""),
-                    company=job_data.get("company", ""),
-                    description=job_data.get("description", ""),
-                    location=job_data.get("location", "Remote"),
-                    apply_url=job_data.get("apply_url", ""),
-                    job_type=job_data.get("job_type", "Full-time"),
-                    level=job_data.get("level", "Mid Level"),
-                    salary_min=job_data.get("salary_min"),
-                    salary_max=job_data.get("salary_max"),
-                    salary=job_data.get("salary"),
-                    score=75.0
-                )
-                db.add(job)
-                imported_count += 1
         
-        db.commit()
+        # Runs in the background: incremental from each source's watermark unless a
+        # full sync is asked for, and shared with an identical import already underway
+        task, coalesced = start_import(query, full_sync=bool(import_data.get("full_sync")))
         
-        logger.info(f"Imported {imported_count} jobs for query: {query}")
+        logger.info(f"Import task {task.id} for query: {query}" + (" (coalesced)" if coalesced else ""))
         return {
-            "status": "success",
-            "imported": imported_count,
-            "total_found": len(jobs_data),
-            "message": f"Successfully imported {imported_count} new jobs"
+            "status": task.status,
+            "task_id": task.id,
+            "coalesced": coalesced,
+            "message": f"Import {'already ' if coalesced else ''}{task.status} for: {query}"
         }
     except Exception as e:
-        db.rollback()
         logger.error(f"Import jobs error: {e}")
         raise HTTPException(500, "Internal server error")
 
+@app.get("/jobs/import/{task_id}")
+def get_import_status(task_id: str):
+    task = get_import(task_id)
+    if task is None:
+        raise HTTPException(404, "Import task not found")
+    return task.to_dict()
+
+@app.post("/jobs/expire")
+def expire_old_jobs(expire_data: dict, db: Session = Depends(get_db)):
+    """Delete postings older than max_age_days (default JOB_MAX_AGE_DAYS) that nobody applied to or saved"""
+    try:
+        max_age_days = expire_data.get("max_age_days")
+        if max_age_days is not None and (not isinstance(max_age_days, int) or max_age_days <= 0):
+            raise HTTPException(400, "max_age_days must be a positive integer")
+        
+        expired_count = expire_jobs(db, max_age_days)
+        logger.info(f"Expired {expired_count} jobs")
+        return {"status": "success", "expired": expired_count}
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Expire jobs error: {e}")
+        raise HTTPException(500, "Internal server error")
+
 # SAVED JOBS ENDPOINTS
 @app.get("/users/{user_id}/saved-jobs")
 def get_saved_jobs(user_id: int, db: Session = Depends(get_db)):
@@ -662,7 +825,7 @@ def generate_cover_letter(request_data: dict, db: Session = Depends(get_db)):
             user_data,
             job.title, 
             job.company,
-            job.description or ""
+            job_search_text(job)
         )
         
         print(f"✅ COVER LETTER GENERATED: {len(result.get('content', ''))} chars")
@@ -706,7 +869,7 @@ def generate_tailored_resume(request_data: dict, db: Session = Depends(get_db)):
         result = generate_tailored_resume_with_ai(
             user_data,
             job.title,
-            job.description or ""
+            job_search_text(job)
         )
         
         print(f"✅ RESUME GENERATED: {len(result.get('content', ''))} chars")
@@ -739,7 +902,7 @@ def generate_interview_prep(request_data: dict, db: Session = Depends(get_db)):
             user_data,
             job.title,
             job.company,
-            job.description or ""
+            job_search_text(job)
         )
         
         return result
@@ -757,26 +920,25 @@ def startup_event():
         jobs_count = db.query(Job).count()
         if jobs_count == 0:
             print("📥 Importing initial enhanced real jobs...")
-            jobs_data = fetch_all_enhanced_jobs("cloud engineer devops")
-            for job_data in jobs_data:
-                job = Job(
-                    title=job_data.get("title", ""),
-                    company=job_data.get("company", ""),
-                    description=job_data.get("description", ""),
-                    location=job_data.get("location", "Remote"),
-                    apply_url=job_data.get("apply_url", ""),
-                    job_type=job_data.get("job_type", "Full-time"),
-                    level=job_data.get("level", "Mid Level"),
-                    salary_min=job_data.get("salary_min"),
-                    salary_max=job_data.get("salary_max"),
-                    salary=job_data.get("salary"),
-                    score=75.0
-                )
-                db.add(job)
-            db.commit()
-            print(f"✅ Imported {len(jobs_data)} enhanced real jobs")
+            source_report = {}
+            counts = import_job_stream(db, iter_enhanced_jobs("cloud engineer devops", report=source_report), embed=False)
+            save_watermarks(db, source_report)
+            backfill_job_embeddings(db)
+            print(f"✅ Imported {counts['imported']} enhanced real jobs")
         else:
             print(f"✅ Database has {jobs_count} jobs")
+            backfilled = backfill_job_features(db)
+            if backfilled:
+                print(f"✅ Computed match features for {backfilled} existing jobs")
+            fingerprinted = backfill_job_fingerprints(db)
+            if fingerprinted:
+                print(f"✅ Fingerprinted {fingerprinted} existing jobs")
+            expired = expire_jobs(db)
+            if expired:
+                print(f"✅ Expired {expired} old jobs")
+            embedded = backfill_job_embeddings(db)
+            if embedded:
+                print(f"✅ Embedded {embedded} existing jobs")
             
     except Exception as e:
         print(f"❌ Startup error: {e}")
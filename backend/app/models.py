@@ -1,5 +1,5 @@
 # [file name]: models.py - COMPLETE
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, ForeignKey, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -23,12 +23,17 @@ class User(Base):
     desired_salary_max = Column(Integer, default=200000)
     skills = Column(Text, default="AWS, Azure, Terraform, Kubernetes, Docker, Python, DevOps")
     
+    # Profile hash the job_matches rows were computed from, NULL until first materialized
+    matches_profile_hash = Column(String, nullable=True)
+    
     # Relationships
     applications = relationship("Application", back_populates="user")
     saved_jobs = relationship("SavedJob", back_populates="user")
 
 class Job(Base):
     __tablename__ = "jobs"
+    # Never reuse the ids of deleted jobs; embeddings and caches are keyed by id
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     external_id = Column(String, unique=True, index=True, nullable=True)
@@ -40,10 +45,57 @@ class Job(Base):
     job_type = Column(String, default="Full-time")
     level = Column(String, default="Mid Level")
     salary = Column(String, nullable=True)
-    salary_min = Column(Integer, nullable=True)
-    salary_max = Column(Integer, nullable=True)
+    # Annual USD, parsed from salary at ingestion (see services/salary_parser.py)
+    salary_min = Column(Integer, nullable=True, index=True)
+    salary_max = Column(Integer, nullable=True, index=True)
     score = Column(Float, default=50.0)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Match features computed once at ingestion (see services/job_features.py)
+    skill_mask = Column(BigInteger, nullable=True)
+    level_code = Column(Integer, nullable=True)
+    location_key = Column(String, nullable=True)
+    is_remote = Column(Boolean, nullable=True)
+    features_version = Column(Integer, nullable=True)
+    
+    # Lowercased plain text of the description, capped in length (see services/job_text.py);
+    # what keyword search reads instead of the raw HTML
+    search_text = Column(Text, nullable=True)
+
+    # Content signature dedupe compares postings by (see services/job_dedupe.py):
+    # SHA-1 of the normalized content, and its SimHash stored as a signed 64-bit value
+    fingerprint = Column(String(40), nullable=True)
+    simhash = Column(BigInteger, nullable=True)
+
+class JobMatch(Base):
+    __tablename__ = "job_matches"
+    __table_args__ = (
+        Index("ix_job_matches_user_score", "user_id", "score", "job_id"),
+    )
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    score = Column(Float, nullable=False)
+
+class SourceWatermark(Base):
+    __tablename__ = "source_watermarks"
+    
+    # Newest publication time (UTC epoch) a source's last complete sync delivered;
+    # the next sync only fetches postings from then on
+    source = Column(String, primary_key=True)
+    value = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class SourceCursor(Base):
+    __tablename__ = "source_cursors"
+    
+    # Where a source's last sync stopped short of its watermark: the page to read
+    # from next, and the newest publication time (UTC epoch) it had delivered,
+    # which becomes the watermark once a sync gets through
+    source = Column(String, primary_key=True)
+    page = Column(Integer, nullable=False)
+    newest = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
 class Application(Base):
     __tablename__ = "applications"
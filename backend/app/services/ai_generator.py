@@ -3,6 +3,8 @@ import re
 from datetime import datetime
 from typing import Dict, Any, List
 
+from app.services.skills import extract_skills
+
 def generate_cover_letter_with_ai(user_data: Dict, job_title: str, company: str, job_description: str) -> Dict[str, Any]:
     """Generate REAL personalized cover letter - FIXED VERSION"""
     
@@ -323,60 +325,7 @@ def enhance_summary_for_jd(summary: str, job_title: str, jd_keywords: List[str],
 # [KEEP ALL YOUR ORIGINAL FUNCTIONS FROM HERE DOWN - NO CHANGES NEEDED]
 def extract_skills_from_text(text: str) -> List[str]:
     """Extract technical skills from text - REAL processing"""
-    if not text:
-        return []
-    
-    text_lower = text.lower()
-    skills_found = []
-    
-    # Comprehensive skill patterns
-    skill_patterns = {
-        'python': ['python', 'python3'],
-        'javascript': ['javascript', 'js'],
-        'typescript': ['typescript', 'ts'],
-        'java': ['java'],
-        'react': ['react', 'react.js'],
-        'angular': ['angular'],
-        'vue': ['vue'],
-        'node': ['node', 'node.js'],
-        'express': ['express'],
-        'django': ['django'],
-        'flask': ['flask'],
-        'spring': ['spring', 'spring boot'],
-        'aws': ['aws', 'amazon web services'],
-        'azure': ['azure', 'microsoft azure'],
-        'gcp': ['gcp', 'google cloud'],
-        'docker': ['docker'],
-        'kubernetes': ['kubernetes', 'k8s'],
-        'terraform': ['terraform'],
-        'ansible': ['ansible'],
-        'jenkins': ['jenkins'],
-        'git': ['git', 'github', 'gitlab'],
-        'linux': ['linux', 'unix'],
-        'bash': ['bash', 'shell scripting'],
-        'sql': ['sql', 'mysql', 'postgresql', 'mongodb'],
-        'ci/cd': ['ci/cd', 'continuous integration'],
-        'devops': ['devops'],
-        'sre': ['sre', 'site reliability'],
-        'microservices': ['microservices'],
-        'api': ['api', 'rest api'],
-        'machine learning': ['machine learning', 'ml'],
-        'data analysis': ['data analysis'],
-        'cloud': ['cloud'],
-        'infrastructure': ['infrastructure'],
-        'automation': ['automation'],
-        'mobile': ['mobile', 'android', 'ios'],
-        'kotlin': ['kotlin'],
-        'swift': ['swift'],
-        'react native': ['react native'],
-        'flutter': ['flutter']
-    }
-    
-    for skill, patterns in skill_patterns.items():
-        if any(pattern in text_lower for pattern in patterns):
-            skills_found.append(skill)
-    
-    return list(set(skills_found))
+    return extract_skills(text)
 
 def extract_experience_level(resume_text: str) -> str:
     """Extract experience level from resume text"""
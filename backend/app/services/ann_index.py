@@ -0,0 +1,275 @@
+# [file name]: ann_index.py - IVF-PQ approximate nearest-neighbour index in NumPy
+import json
+import os
+import shutil
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Coarse lists probed per query; more probes trade latency for recall
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+
+# Segments appended by incremental inserts are merged once there are this many
+ANN_MAX_SEGMENTS = 8
+
+# Rows used to train the product-quantizer codebooks
+PQ_TRAIN_ROWS = 16384
+
+
+def _kmeans(x: np.ndarray, k: int, iterations: int = 12, seed: int = 0) -> np.ndarray:
+    """Lloyd's k-means on float32 rows, with empty clusters reseeded from random points"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(x, centroids)
+        counts = np.bincount(assignment, minlength=k)
+        empty = counts == 0
+        # Sum each cluster's rows with one reduceat over the rows sorted by cluster
+        order = np.argsort(assignment, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[~empty]
+        centroids[~empty] = np.add.reduceat(x[order], starts, axis=0) / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = x[rng.choice(len(x), int(empty.sum()), replace=False)]
+    return centroids
+
+
+def _nearest(x: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """Index of the closest centroid (L2) for every row, computed in chunks"""
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), chunk):
+        block = x[start:start + chunk]
+        out[start:start + chunk] = np.argmin(centroid_norms - 2 * block @ centroids.T, axis=1)
+    return out
+
+
+class _Segment:
+    """Rows grouped by inverted list: list l owns rows offsets[l]:offsets[l + 1]"""
+
+    def __init__(self, ids: np.ndarray, codes: np.ndarray, offsets: np.ndarray, alive: Optional[np.ndarray] = None):
+        self.ids = ids
+        self.codes = codes
+        self.offsets = offsets
+        self.alive = np.ones(len(ids), dtype=bool) if alive is None else alive
+        self.path: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, ids: np.ndarray, codes: np.ndarray, lists: np.ndarray, n_lists: int) -> "_Segment":
+        order = np.argsort(lists, kind="stable")
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(lists, minlength=n_lists), out=offsets[1:])
+        return cls(np.ascontiguousarray(ids[order]), np.ascontiguousarray(codes[order]), offsets)
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        for name in ("ids", "codes", "offsets"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        self.path = path
+        self.save_alive()
+
+    def save_alive(self) -> None:
+        if self.path:
+            np.save(os.path.join(self.path, "alive.npy"), self.alive)
+
+    @classmethod
+    def load(cls, path: str) -> "_Segment":
+        # The tombstone mask is small and mutable, the rest stays memory-mapped
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ("ids", "codes", "offsets")]
+        segment = cls(*arrays, alive=np.load(os.path.join(path, "alive.npy")))
+        segment.path = path
+        return segment
+
+
+class IVFPQIndex:
+    """Inverted-file index with product-quantized residuals, for inner-product search.
+
+    Vectors are assigned to the nearest of n_lists coarse centroids and the
+    residual is compressed to n_subvectors one-byte codes. A query scores
+    only the rows of its nprobe closest lists, from a per-query lookup table,
+    so each candidate costs n_subvectors table reads instead of a full dot
+    product.
+
+    Inserts go to a new immutable segment and deletions only flip bits in a
+    segment's tombstone mask, so neither rewrites the codes. Segments on
+    disk are plain .npy files loaded with mmap_mode="r".
+
+    Inserts, deletions and compaction are serialized by a lock; a search
+    reads the segment list as it was when the search started.
+    """
+
+    def __init__(self, centroids: np.ndarray, codebooks: np.ndarray, path: Optional[str] = None):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.codebooks = np.asarray(codebooks, dtype=np.float32)
+        self.path = path
+        self.segments: List[_Segment] = []
+        self._next_segment = 0
+        self._lock = threading.RLock()
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def dim(self) -> int:
+        return self.centroids.shape[1]
+
+    @property
+    def n_subvectors(self) -> int:
+        return self.codebooks.shape[0]
+
+    def __len__(self) -> int:
+        return sum(int(segment.alive.sum()) for segment in self.segments)
+
+    @classmethod
+    def train(cls, vectors, n_lists: int, n_subvectors: int, path: Optional[str] = None, seed: int = 0) -> "IVFPQIndex":
+        """Learn the coarse centroids and PQ codebooks from a sample of vectors"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        if dim % n_subvectors:
+            raise ValueError(f"Dimension {dim} is not divisible by {n_subvectors} subvectors")
+        centroids = _kmeans(vectors, n_lists, seed=seed)
+        # 256 codewords per subspace need far fewer training rows than the coarse lists
+        sample = np.random.default_rng(seed).permutation(len(vectors))[:PQ_TRAIN_ROWS]
+        residuals = vectors[sample] - centroids[_nearest(vectors[sample], centroids)]
+        sub_dim = dim // n_subvectors
+        codebooks = np.zeros((n_subvectors, 256, sub_dim), dtype=np.float32)
+        for j in range(n_subvectors):
+            book = _kmeans(residuals[:, j * sub_dim:(j + 1) * sub_dim], 256, seed=seed + j + 1)
+            codebooks[j, :len(book)] = book
+        return cls(centroids, codebooks, path)
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        lists = _nearest(vectors, self.centroids)
+        residuals = vectors - self.centroids[lists]
+        sub_dim = self.dim // self.n_subvectors
+        codes = np.empty((len(vectors), self.n_subvectors), dtype=np.uint8)
+        for j in range(self.n_subvectors):
+            codes[:, j] = _nearest(residuals[:, j * sub_dim:(j + 1) * sub_dim], self.codebooks[j])
+        return lists, codes
+
+    def add(self, ids: Iterable[int], vectors) -> int:
+        """Insert vectors as a new segment (persisted at once when the index has a path).
+
+        Rows already stored under the same ids are tombstoned first, so an id
+        reused for a new job only ever finds the new vector.
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if not len(ids):
+            return 0
+        lists, codes = self._encode(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        segment = _Segment.build(ids, codes, lists, self.n_lists)
+        with self._lock:
+            self.remove(ids)
+            if self.path:
+                segment.save(os.path.join(self.path, f"segment-{self._next_segment:06d}"))
+            self._next_segment += 1
+            self.segments = self.segments + [segment]
+            if len(self.segments) > ANN_MAX_SEGMENTS:
+                self.compact()
+        return len(ids)
+
+    def remove(self, ids: Iterable[int]) -> int:
+        """Tombstone ids so searches skip them; the rows go away on the next compaction"""
+        ids = np.asarray(list(ids), dtype=np.int64)
+        removed = 0
+        with self._lock:
+            for segment in self.segments:
+                hit = np.isin(segment.ids, ids) & segment.alive
+                if hit.any():
+                    segment.alive[hit] = False
+                    segment.save_alive()
+                    removed += int(hit.sum())
+        return removed
+
+    def search(self, query, k: int, nprobe: int = ANN_NPROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate (ids, inner products) of the k best rows, best first"""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        coarse = self.centroids @ query
+        nprobe = min(nprobe, self.n_lists)
+        probes = np.argpartition(-coarse, nprobe - 1)[:nprobe]
+
+        # table[j, c]: contribution of code c in subspace j to the inner product
+        sub_query = query.reshape(self.n_subvectors, -1)
+        table = np.einsum("jcd,jd->jc", self.codebooks, sub_query)
+        subspaces = np.arange(self.n_subvectors)
+
+        found_ids, found_scores = [], []
+        for segment in list(self.segments):
+            for probe in probes:
+                start, end = segment.offsets[probe], segment.offsets[probe + 1]
+                if start == end:
+                    continue
+                alive = segment.alive[start:end]
+                codes = segment.codes[start:end][alive]
+                found_ids.append(segment.ids[start:end][alive])
+                found_scores.append(coarse[probe] + table[subspaces, codes].sum(axis=1))
+
+        if not found_ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        ids = np.concatenate(found_ids)
+        scores = np.concatenate(found_scores)
+        if len(ids) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return ids[order], scores[order]
+
+    def compact(self) -> None:
+        """Merge all segments into one and drop tombstoned rows"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        ids = np.concatenate([segment.ids[segment.alive] for segment in self.segments] or [np.zeros(0, np.int64)])
+        codes = np.concatenate(
+            [segment.codes[segment.alive] for segment in self.segments]
+            or [np.zeros((0, self.n_subvectors), np.uint8)]
+        )
+        lists = np.concatenate([
+            np.repeat(np.arange(self.n_lists), np.diff(segment.offsets))[segment.alive]
+            for segment in self.segments
+        ] or [np.zeros(0, np.int64)])
+        merged = _Segment.build(ids, codes, lists, self.n_lists)
+        if self.path:
+            # Write the merged segment before removing the old ones
+            old = [name for name in os.listdir(self.path) if name.startswith("segment-")]
+            merged.save(os.path.join(self.path, f"segment-{self._next_segment:06d}"))
+            for name in old:
+                shutil.rmtree(os.path.join(self.path, name))
+            merged = _Segment.load(os.path.join(self.path, f"segment-{self._next_segment:06d}"))
+        self._next_segment += 1
+        self.segments = [merged]
+
+    def save(self, path: str, meta: Optional[dict] = None) -> None:
+        """Write the trained quantizers and every segment under path"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "centroids.npy"), self.centroids)
+        np.save(os.path.join(path, "codebooks.npy"), self.codebooks)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(dict(meta or {}, n_lists=self.n_lists, n_subvectors=self.n_subvectors, dim=self.dim), f)
+        self.path = path
+        for i, segment in enumerate(self.segments):
+            segment.save(os.path.join(path, f"segment-{i:06d}"))
+        self._next_segment = len(self.segments)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFPQIndex":
+        """Open a saved index; segments are memory-mapped, not read into memory"""
+        index = cls(np.load(os.path.join(path, "centroids.npy")), np.load(os.path.join(path, "codebooks.npy")), path)
+        names = sorted(name for name in os.listdir(path) if name.startswith("segment-"))
+        index.segments = [_Segment.load(os.path.join(path, name)) for name in names]
+        index._next_segment = int(names[-1].split("-")[1]) + 1 if names else 0
+        return index
+
+    @staticmethod
+    def read_meta(path: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,300 @@
+# [file name]: batch_scorer.py - vectorized match scoring over the whole catalog
+import base64
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+from app.services.job_features import FEATURES_VERSION, LEVEL_LEAD, LEVEL_SENIOR, JobFeatures, get_job_features
+from app.services.matcher import SKILL_WEIGHTS, UserMatchProfile
+from app.services.skills import SKILL_INDEX
+
+# Only the weighted skills take part in scoring, see calculate_advanced_match_score
+_SCORED_SKILLS = list(SKILL_WEIGHTS)
+_SCORED_BITS = np.array([SKILL_INDEX[skill] for skill in _SCORED_SKILLS], dtype=np.int64)
+_SCORED_WEIGHTS = np.array([SKILL_WEIGHTS[skill] for skill in _SCORED_SKILLS], dtype=np.float64)
+
+
+# Per-job arrays the scoring kernel reads, see score_columns()
+CATALOG_COLUMNS = ("skill_matrix", "skill_totals", "level_codes", "location_codes", "salary_min", "salary_max")
+
+
+class ProfileTerms(NamedTuple):
+    """A user profile reduced to what the scoring kernel needs"""
+    skill_weights: np.ndarray
+    levels: np.ndarray
+    senior: bool
+    location_points: Optional[np.ndarray]
+    salary_floor: Optional[int]
+
+
+class JobCatalog:
+    """Column arrays of every job's match features.
+
+    Produces the same scores as calculate_advanced_match_score for all jobs
+    at once, in a handful of NumPy operations.
+    """
+
+    def __init__(self, job_ids, skill_masks, level_codes, location_keys, salary_min, salary_max):
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+        masks = np.asarray(skill_masks, dtype=np.int64)
+
+        # Skill membership matrix (jobs x scored skills) and each job's total skill weight
+        self.skill_matrix = ((masks[:, None] >> _SCORED_BITS[None, :]) & 1).astype(np.float64)
+        self.skill_totals = self.skill_matrix @ _SCORED_WEIGHTS
+        self.level_codes = np.asarray(level_codes, dtype=np.int8)
+
+        # Locations repeat a lot, so keep one code per job and the distinct strings once
+        self.location_keys, location_codes = np.unique(np.asarray(location_keys, dtype=object).astype(str), return_inverse=True)
+        self.location_codes = location_codes.astype(np.int32)
+        self.location_remote = np.array(
+            [any(word in key for word in ('remote', 'anywhere', 'global')) for key in self.location_keys], dtype=bool
+        )
+        self.is_remote = self.location_remote[self.location_codes] if len(self.job_ids) else np.zeros(0, dtype=bool)
+
+        self.salary_min = np.asarray(salary_min, dtype=np.float64)
+        self.salary_max = np.asarray(salary_max, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def positions(self, job_ids) -> np.ndarray:
+        """Catalog row of each job id, ids not in the catalog are dropped"""
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        positions = np.searchsorted(self.job_ids, job_ids)
+        positions = np.minimum(positions, max(len(self) - 1, 0))
+        if not len(self):
+            return positions[:0]
+        return positions[self.job_ids[positions] == job_ids]
+
+    @classmethod
+    def from_features(cls, rows: Iterable[Tuple[int, JobFeatures]]) -> "JobCatalog":
+        # Rows are kept in id order so positions() can binary search
+        rows = sorted(rows, key=lambda row: row[0])
+        return cls(
+            job_ids=[job_id for job_id, _ in rows],
+            skill_masks=[features.skill_mask for _, features in rows],
+            level_codes=[features.level_code for _, features in rows],
+            location_keys=[features.location_key for _, features in rows],
+            salary_min=[features.salary_min if features.salary_min is not None else np.nan for _, features in rows],
+            salary_max=[features.salary_max if features.salary_max is not None else np.nan for _, features in rows],
+        )
+
+    @classmethod
+    def from_db(cls, db) -> "JobCatalog":
+        """Build the catalog from the stored feature columns, without loading descriptions"""
+        from app.models import Job
+
+        rows = []
+        stale_ids = []
+        for row in db.query(
+            Job.id, Job.skill_mask, Job.level_code, Job.location_key, Job.is_remote,
+            Job.salary_min, Job.salary_max, Job.features_version
+        ).order_by(Job.id):
+            if row.features_version != FEATURES_VERSION:
+                stale_ids.append(row.id)
+                continue
+            rows.append((row.id, JobFeatures(
+                skill_mask=row.skill_mask or 0,
+                level_code=row.level_code or 0,
+                location_key=row.location_key or "",
+                is_remote=bool(row.is_remote),
+                salary_min=row.salary_min,
+                salary_max=row.salary_max,
+            )))
+
+        if stale_ids:
+            for job in db.query(Job).filter(Job.id.in_(stale_ids)):
+                rows.append((job.id, get_job_features(job)))
+
+        return cls.from_features(rows)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The per-job arrays score_columns() works on"""
+        return {name: getattr(self, name) for name in CATALOG_COLUMNS}
+
+    def profile_terms(self, profile: UserMatchProfile) -> ProfileTerms:
+        """Reduce a profile to the small arrays the scoring kernel needs"""
+        location_points = None
+        if profile.locations:
+            # Location is evaluated once per distinct location string
+            location_points = np.zeros(len(self.location_keys))
+            for i, key in enumerate(self.location_keys):
+                if not key:
+                    continue
+                if any(loc in key for loc in profile.locations):
+                    location_points[i] = 20
+                elif 'remote' in key and profile.wants_remote:
+                    location_points[i] = 20
+                elif self.location_remote[i]:
+                    location_points[i] = 15
+
+        return ProfileTerms(
+            skill_weights=_SCORED_WEIGHTS * ((profile.skill_mask >> _SCORED_BITS) & 1),
+            levels=np.fromiter(profile.levels, dtype=np.int8, count=len(profile.levels)),
+            senior=LEVEL_SENIOR in profile.levels,
+            location_points=location_points,
+            salary_floor=profile.salary_floor,
+        )
+
+    def score(self, profile: Optional[UserMatchProfile]) -> np.ndarray:
+        """Match score of every job in the catalog for one user profile"""
+        if profile is None:
+            return np.full(len(self), 75.0)
+        return score_columns(self.columns(), self.profile_terms(profile))
+
+
+def score_columns(columns: Dict[str, np.ndarray], terms: ProfileTerms) -> np.ndarray:
+    """Scoring kernel over catalog columns, any contiguous slice of them works too"""
+    size = len(columns["skill_totals"])
+
+    # Skill match (50 points), normalized to each job's own skills
+    matched = columns["skill_matrix"] @ terms.skill_weights
+    totals = columns["skill_totals"]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skill_score = np.where(totals > 0, np.minimum(matched / totals * 50, 50), 25.0)
+
+    # Experience level (15 points)
+    level_codes = columns["level_codes"]
+    level_score = np.where(np.isin(level_codes, terms.levels), 15.0, 0.0)
+    if terms.senior:
+        level_score = np.where((level_score == 0) & (level_codes == LEVEL_LEAD), 12.0, level_score)
+
+    # Location (20 points)
+    if terms.location_points is not None:
+        location_score = terms.location_points[columns["location_codes"]]
+    else:
+        location_score = np.zeros(size)
+
+    # Salary (15 points); missing or zero salaries never score, like the scalar version
+    salary_score = np.zeros(size)
+    floor = terms.salary_floor
+    if floor:
+        salary_max = np.nan_to_num(columns["salary_max"])
+        salary_min = np.nan_to_num(columns["salary_min"])
+        above_floor = salary_max >= floor
+        ratio = np.minimum(salary_max / floor, 2.0)
+        salary_score = np.where(
+            (salary_max > 0) & above_floor, np.minimum(15 * ratio, 15),
+            np.where((salary_min > 0) & (salary_min >= floor), 10.0, 0.0),
+        )
+
+    return np.minimum(skill_score + level_score + location_score + salary_score, 100)
+
+
+# Score vectors of recently active users, so paging does not rescore the catalog
+SCORE_CACHE_SIZE = 32
+
+_catalog: Optional[JobCatalog] = None
+_catalog_signature = None
+_catalog_lock = threading.Lock()
+_score_cache: "OrderedDict[Optional[UserMatchProfile], np.ndarray]" = OrderedDict()
+
+
+def invalidate_job_catalog() -> None:
+    """Force the next get_job_catalog() to rebuild, call after writing jobs"""
+    global _catalog, _catalog_signature
+    with _catalog_lock:
+        _catalog = None
+        _catalog_signature = None
+        _score_cache.clear()
+
+
+def get_job_catalog(db) -> JobCatalog:
+    """Process-wide catalog, rebuilt when jobs are added or removed"""
+    from app.models import Job
+
+    global _catalog, _catalog_signature
+    # Cheap check so other worker processes notice imports they did not run
+    signature = tuple(db.query(func.count(Job.id), func.max(Job.id)).one())
+    with _catalog_lock:
+        if _catalog is not None and _catalog_signature == signature:
+            return _catalog
+
+    catalog = JobCatalog.from_db(db)
+    with _catalog_lock:
+        _catalog = catalog
+        _catalog_signature = signature
+        _score_cache.clear()
+    return catalog
+
+
+def get_scores(catalog: JobCatalog, profile: Optional[UserMatchProfile]) -> np.ndarray:
+    """catalog.score(profile), cached for the current catalog"""
+    with _catalog_lock:
+        cached = _score_cache.get(profile) if catalog is _catalog else None
+        if cached is not None:
+            _score_cache.move_to_end(profile)
+            return cached
+
+    scores = catalog.score(profile)
+    with _catalog_lock:
+        if catalog is _catalog:
+            _score_cache[profile] = scores
+            while len(_score_cache) > SCORE_CACHE_SIZE:
+                _score_cache.popitem(last=False)
+    return scores
+
+
+class CandidateSet:
+    """Just enough of a catalog for top_k over an arbitrary list of job ids"""
+
+    def __init__(self, job_ids):
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+
+def encode_cursor(score: float, job_id: int) -> str:
+    """Opaque cursor pointing just after (score, job_id) in ranking order"""
+    return base64.urlsafe_b64encode(f"{score!r}:{job_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of encode_cursor, raises ValueError for anything malformed"""
+    try:
+        score, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(score), int(job_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def top_k(
+    catalog: JobCatalog,
+    scores: np.ndarray,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+    positions: Optional[np.ndarray] = None,
+) -> List[Tuple[int, float]]:
+    """(job_id, score) of the best `limit` jobs, highest score first and ties in id order.
+
+    `positions` restricts the ranking to some catalog rows and `after` skips
+    everything up to and including a cursor position. Only the winners are
+    sorted, the rest of the catalog is partitioned in linear time.
+    """
+    if positions is None:
+        positions = np.arange(len(catalog))
+    candidate_scores = scores[positions]
+    candidate_ids = catalog.job_ids[positions]
+
+    if after is not None:
+        after_score, after_id = after
+        keep = (candidate_scores < after_score) | ((candidate_scores == after_score) & (candidate_ids > after_id))
+        candidate_scores = candidate_scores[keep]
+        candidate_ids = candidate_ids[keep]
+
+    if limit <= 0 or not len(candidate_ids):
+        return []
+
+    if len(candidate_ids) > limit:
+        # Everything strictly above the k-th score wins, ties at the k-th score go by id
+        kth_score = -np.partition(-candidate_scores, limit - 1)[limit - 1]
+        winners = np.flatnonzero(candidate_scores >= kth_score)
+        candidate_scores = candidate_scores[winners]
+        candidate_ids = candidate_ids[winners]
+
+    order = np.lexsort((candidate_ids, -candidate_scores))[:limit]
+    return [(int(candidate_ids[i]), float(candidate_scores[i])) for i in order]
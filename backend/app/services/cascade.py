@@ -0,0 +1,62 @@
+# [file name]: cascade.py - two-stage ranking: keyword match score, then embedding rerank
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.batch_scorer import CandidateSet, get_job_catalog, get_scores, top_k
+from app.services.job_embeddings import semantic_scores_for
+from app.services.matcher import get_user_match_profile
+
+# Keyword-stage survivors that get an embedding rerank, and the weight of the
+# semantic score in the blended 0-100 score
+CASCADE_TOP_N = int(os.getenv("CASCADE_TOP_N", "200"))
+CASCADE_EMBEDDING_WEIGHT = float(os.getenv("CASCADE_EMBEDDING_WEIGHT", "0.3"))
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Server-Timing header value from stage name -> seconds"""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+def cascade_rank(
+    db,
+    user,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+    positions: Optional[np.ndarray] = None,
+    top_n: int = CASCADE_TOP_N,
+    weight: float = CASCADE_EMBEDDING_WEIGHT,
+    timings: Optional[Dict[str, float]] = None,
+) -> List[Tuple[int, float]]:
+    """(job_id, blended score) page from the keyword top_n reranked with embeddings.
+
+    Stage one is the vectorized calculate_advanced_match_score over the
+    catalog (or the `positions` subset). Only its top_n survivors are blended
+    as (1 - weight) * keyword + weight * semantic, so paging stops after top_n
+    results. Survivors not embedded yet keep their keyword score and are
+    embedded in the background. Without embeddings the keyword order is kept.
+    """
+    timings = {} if timings is None else timings
+
+    start = time.perf_counter()
+    catalog = get_job_catalog(db)
+    shortlist = top_k(catalog, get_scores(catalog, get_user_match_profile(user)), top_n, None, positions)
+    job_ids = [job_id for job_id, _ in shortlist]
+    keyword = np.array([score for _, score in shortlist], dtype=np.float64)
+    timings["keyword"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    semantic = semantic_scores_for(user, job_ids) if weight > 0 else None
+    timings["embedding"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blended = keyword
+    if semantic:
+        # Jobs not embedded yet keep their keyword score
+        semantic_scores = np.array([semantic.get(job_id, score) for job_id, score in shortlist], dtype=np.float64)
+        blended = np.round((1 - weight) * keyword + weight * semantic_scores, 2)
+    ranked = top_k(CandidateSet(job_ids), blended, limit, after)
+    timings["rerank"] = time.perf_counter() - start
+    return ranked
@@ -0,0 +1,163 @@
+# [file name]: embedding_backends.py - pluggable embedding backends (OpenAI or in-process)
+import abc
+import hashlib
+import math
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.embedding_client import EMBEDDING_BATCH_SIZE, embed_batch, get_batcher
+
+# "openai" (remote, needs OPENAI_API_KEY) or "local" (hashed TF-IDF, no network)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "512"))
+LOCAL_EMBEDDING_IDF_PATH = os.getenv("LOCAL_EMBEDDING_IDF_PATH", "./local_embedding_idf.npy")
+
+
+class EmbeddingBackend(abc.ABC):
+    """Turns texts into vectors. `name` identifies the vector space in caches and stored matrices."""
+
+    name = "base"
+    # Remote backends go through the embedding cache; local ones are cheaper to recompute
+    cacheable = True
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    @abc.abstractmethod
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32 array"""
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """OpenAI embeddings API through the shared, batching client"""
+
+    def __init__(self, model: str = EMBEDDING_MODEL):
+        self.model = model
+        self.name = model
+
+    def embed(self, text: str) -> np.ndarray:
+        # Concurrent misses from other requests share one multi-input API call
+        return np.asarray(get_batcher(self.model).embed(text), dtype=np.float32)
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            vectors.extend(embed_batch(texts[start:start + EMBEDDING_BATCH_SIZE], self.model))
+        return np.asarray(vectors, dtype=np.float32)
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we will with you your".split()
+)
+
+
+def _tokens(text: str) -> List[str]:
+    """Lowercased word tokens without stop words, plus adjacent-word bigrams"""
+    words = [word for word in _TOKEN_RE.findall((text or "").lower()) if word not in _STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """Hashed TF-IDF projected to a dense vector, computed in-process.
+
+    Tokens are hashed into n_features buckets (sublinear term frequency times
+    IDF), and that sparse vector goes through a fixed very-sparse random
+    projection: each bucket adds +-w to `nonzeros` of the `dim` outputs. The
+    projection roughly preserves cosine similarity and never needs the
+    n_features x dim matrix, only a row of positions and signs per bucket.
+    """
+
+    cacheable = False
+
+    def __init__(self, dim: int = LOCAL_EMBEDDING_DIM, n_features: int = 2 ** 18, nonzeros: int = 4,
+                 idf: Optional[np.ndarray] = None, seed: int = 0):
+        self.dim = dim
+        self.n_features = n_features
+        rng = np.random.default_rng(seed)
+        self._positions = rng.integers(0, dim, size=(n_features, nonzeros), dtype=np.int64)
+        self._signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(n_features, nonzeros))
+        self._feature = lru_cache(maxsize=1 << 16)(self._hash_token)
+        self.set_idf(idf)
+
+    def set_idf(self, idf: Optional[np.ndarray]) -> None:
+        self.idf = None if idf is None else np.asarray(idf, dtype=np.float32)
+        # The vector space changes with the IDF table, so it is part of the name
+        suffix = hashlib.sha256(self.idf.tobytes()).hexdigest()[:8] if self.idf is not None else "tf"
+        self.name = f"local-hash-{self.dim}-{suffix}"
+
+    def _hash_token(self, token: str) -> int:
+        return zlib.crc32(token.encode("utf-8")) % self.n_features
+
+    def features(self, text: str) -> Dict[int, float]:
+        """Hashed bucket -> sublinear TF-IDF weight for one text"""
+        counts: Dict[int, int] = {}
+        for token in _tokens(text):
+            feature = self._feature(token)
+            counts[feature] = counts.get(feature, 0) + 1
+        if self.idf is None:
+            return {feature: 1.0 + math.log(count) for feature, count in counts.items()}
+        return {feature: (1.0 + math.log(count)) * float(self.idf[feature]) for feature, count in counts.items()}
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32 unit vectors"""
+        feature = self._feature
+        doc_features = [[feature(token) for token in _tokens(text)] for text in texts]
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), [len(doc) for doc in doc_features])
+        features = np.fromiter((f for doc in doc_features for f in doc), dtype=np.int64, count=len(rows))
+
+        out = np.zeros(len(texts) * self.dim, dtype=np.float64)
+        if len(features):
+            # Term counts per (text, bucket) for the whole batch at once
+            pairs, counts = np.unique(rows * self.n_features + features, return_counts=True)
+            rows, features = np.divmod(pairs, self.n_features)
+            weights = 1.0 + np.log(counts)
+            if self.idf is not None:
+                weights = weights * self.idf[features]
+            flat = rows[:, None] * self.dim + self._positions[features]
+            out += np.bincount(flat.ravel(), weights=(weights[:, None] * self._signs[features]).ravel(), minlength=len(out))
+        vectors = out.reshape(len(texts), self.dim).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def fit_idf(self, texts: Sequence[str], path: Optional[str] = LOCAL_EMBEDDING_IDF_PATH) -> None:
+        """Learn smoothed IDF weights from a corpus (e.g. the job catalog) and save them"""
+        df = np.zeros(self.n_features, dtype=np.int64)
+        for text in texts:
+            df[list({self._feature(token) for token in _tokens(text)})] += 1
+        idf = np.log((1 + len(texts)) / (1 + df)) + 1
+        self.set_idf(idf.astype(np.float32))
+        if path:
+            np.save(path, self.idf)
+
+    @classmethod
+    def from_saved_idf(cls, path: str = LOCAL_EMBEDDING_IDF_PATH) -> "HashingEmbeddingBackend":
+        idf = np.load(path) if path and os.path.exists(path) else None
+        return cls(idf=idf)
+
+
+BACKENDS: Dict[str, Callable[[], EmbeddingBackend]] = {
+    "openai": OpenAIEmbeddingBackend,
+    "local": HashingEmbeddingBackend.from_saved_idf,
+}
+
+_backend: Optional[EmbeddingBackend] = None
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    """The deployment's backend, chosen by EMBEDDING_BACKEND"""
+    global _backend
+    if _backend is None:
+        if EMBEDDING_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown EMBEDDING_BACKEND {EMBEDDING_BACKEND!r}, expected one of {sorted(BACKENDS)}")
+        _backend = BACKENDS[EMBEDDING_BACKEND]()
+    return _backend
@@ -0,0 +1,173 @@
+# [file name]: embedding_client.py - pooled, batching embedding client
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from openai import AsyncOpenAI, OpenAI
+except ImportError:
+    AsyncOpenAI = OpenAI = None  # type: ignore
+
+# Point OPENAI_BASE_URL at benchmarks/fake_embeddings_server.py to run offline
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# A batch is sent once it holds EMBEDDING_BATCH_SIZE texts or its oldest text
+# has waited EMBEDDING_BATCH_WAIT_MS
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "10"))
+
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _client_kwargs() -> dict:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key or OpenAI is None:
+        raise RuntimeError("OpenAI embeddings not configured")
+    # Retries are ours (with backoff across the whole batch), not the SDK's
+    return {"api_key": api_key, "base_url": OPENAI_BASE_URL, "max_retries": 0}
+
+
+def get_client():
+    """Process-wide OpenAI client; its httpx pool keeps connections alive between calls"""
+    with _clients_lock:
+        if "sync" not in _clients:
+            _clients["sync"] = OpenAI(**_client_kwargs())
+        return _clients["sync"]
+
+
+def get_async_client():
+    """Process-wide AsyncOpenAI client for the async helpers"""
+    with _clients_lock:
+        if "async" not in _clients:
+            _clients["async"] = AsyncOpenAI(**_client_kwargs())
+        return _clients["async"]
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter, in seconds"""
+    return random.uniform(0, min(8.0, 0.25 * 2 ** attempt))
+
+
+def embed_batch(texts: Sequence[str], model: str) -> List[List[float]]:
+    """Embed several texts in one request, retrying transient failures"""
+    for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+        try:
+            resp = get_client().embeddings.create(model=model, input=list(texts))
+            return [item.embedding for item in sorted(resp.data, key=lambda item: item.index)]
+        except RuntimeError:
+            raise
+        except Exception as e:
+            if attempt == EMBEDDING_MAX_RETRIES:
+                print("[embeddings] batch failed after retries:", repr(e))
+                raise RuntimeError("Embedding call failed") from e
+            time.sleep(_backoff(attempt))
+    return []
+
+
+async def aembed_batch(texts: Sequence[str], model: str) -> List[List[float]]:
+    """Async embed_batch"""
+    for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+        try:
+            resp = await get_async_client().embeddings.create(model=model, input=list(texts))
+            return [item.embedding for item in sorted(resp.data, key=lambda item: item.index)]
+        except RuntimeError:
+            raise
+        except Exception as e:
+            if attempt == EMBEDDING_MAX_RETRIES:
+                print("[embeddings] batch failed after retries:", repr(e))
+                raise RuntimeError("Embedding call failed") from e
+            await asyncio.sleep(_backoff(attempt))
+    return []
+
+
+async def aembed_many(
+    texts: Sequence[str],
+    model: str,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    concurrency: int = EMBEDDING_CONCURRENCY,
+) -> List[List[float]]:
+    """Embed any number of texts as batches, with at most `concurrency` requests in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(chunk: Sequence[str]) -> List[List[float]]:
+        async with semaphore:
+            return await aembed_batch(chunk, model)
+
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+    return [vector for chunk_vectors in results for vector in chunk_vectors]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text requests into multi-input API calls.
+
+    Callers block in embed() while a background thread gathers texts until
+    the batch is full or the latency budget runs out, then sends them as one
+    request. Identical texts in a batch are only sent once.
+    """
+
+    def __init__(self, model: str, max_batch: int = EMBEDDING_BATCH_SIZE, max_wait_ms: float = EMBEDDING_BATCH_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests_sent = 0
+        self.texts_embedded = 0
+        self._pending: List[Tuple[str, Future]] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def embed(self, text: str) -> List[float]:
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+            self._pending.append((text, future))
+            self._cond.notify()
+        return future.result()
+
+    def _take_batch(self) -> List[Tuple[str, Future]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            unique_texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = dict(zip(unique_texts, embed_batch(unique_texts, self.model)))
+                self.requests_sent += 1
+                self.texts_embedded += len(unique_texts)
+                for text, future in batch:
+                    future.set_result(vectors[text])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+_batchers: Dict[str, EmbeddingBatcher] = {}
+
+
+def get_batcher(model: str) -> EmbeddingBatcher:
+    """Shared batcher per model"""
+    with _clients_lock:
+        if model not in _batchers:
+            _batchers[model] = EmbeddingBatcher(model)
+        return _batchers[model]
@@ -1,44 +1,191 @@
 import os
-import math
-from typing import List
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
-try:
-    from openai import OpenAI
-except ImportError:
-    OpenAI = None  # type: ignore
+import numpy as np
 
+from app.services.embedding_backends import get_embedding_backend
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    if not a or not b or len(a) != len(b):
+# In-memory LRU size (vectors) and the persistent SQLite store behind it
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embeddings_cache.db")
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Content address of a text for one model: sha256 of the whitespace-normalized text"""
+    digest = hashlib.sha256(_normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: bounded in-memory LRU over a SQLite store"""
+
+    def __init__(self, path: Optional[str] = EMBEDDING_CACHE_PATH, max_size: int = EMBEDDING_CACHE_SIZE):
+        self.max_size = max_size
+        # float32 arrays: 4 bytes per dimension instead of a boxed Python float
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dim INTEGER, vector BLOB)"
+            )
+            self._db.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, count: bool = True) -> Optional[np.ndarray]:
+        """Cached vector or None; count=False skips the hit/miss counters for re-checks"""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += count
+                return vector
+
+            row = None
+            if self._db is not None:
+                row = self._db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += count
+                return None
+
+            vector = np.frombuffer(row[0], dtype=np.float32)
+            self._remember(key, vector)
+            self.disk_hits += count
+            return vector
+
+    def put(self, key: str, vector) -> np.ndarray:
+        """Store a vector as float32 and return the stored array"""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                    (key, len(vector), vector.tobytes()),
+                )
+                self._db.commit()
+        return vector
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": sum(vector.nbytes for vector in self._memory.values()),
+            }
+
+
+# Opened on first use, so importing this module creates nothing on disk
+embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """The process-wide embedding cache, opened on first use"""
+    global embedding_cache
+    with _embedding_cache_lock:
+        if embedding_cache is None:
+            embedding_cache = EmbeddingCache()
+        return embedding_cache
+
+
+# One lock per key being embedded right now, so concurrent misses embed a text once
+_inflight: Dict[str, threading.Lock] = {}
+_inflight_lock = threading.Lock()
+
+
+def _cosine_similarity(a, b) -> float:
+    if a is None or b is None or not len(a) or len(a) != len(b):
         return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(y * y for y in b))
+    va = np.asarray(a, dtype=np.float64)
+    vb = np.asarray(b, dtype=np.float64)
+    na = np.linalg.norm(va)
+    nb = np.linalg.norm(vb)
     if na == 0 or nb == 0:
         return 0.0
-    return dot / (na * nb)
+    return float(va @ vb / (na * nb))
 
 
-def get_embedding(text: str) -> List[float]:
+def get_embedding(text: str) -> np.ndarray:
     """
-    Uses OpenAI embeddings if OPENAI_API_KEY is set.
+    Embeds with the configured backend, through the embedding cache for remote ones.
     Any error -> raise RuntimeError so caller can fall back.
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or OpenAI is None:
-        raise RuntimeError("OpenAI embeddings not configured")
+    backend = get_embedding_backend()
+    if not backend.cacheable:
+        return backend.embed(text)
 
-    try:
-        client = OpenAI(api_key=api_key)
-        resp = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text,
-        )
-        return resp.data[0].embedding  # type: ignore[no-any-return]
-    except Exception as e:
-        # Log and degrade gracefully
-        print("[embeddings] error while getting embedding:", repr(e))
-        raise RuntimeError("Embedding call failed") from e
+    cache = get_embedding_cache()
+    key = embedding_cache_key(backend.name, text)
+    vector = cache.get(key)
+    if vector is not None:
+        return vector
+
+    with _inflight_lock:
+        key_lock = _inflight.setdefault(key, threading.Lock())
+    with key_lock:
+        try:
+            # Another thread may have embedded it while we waited
+            vector = cache.get(key, count=False)
+            if vector is None:
+                vector = cache.put(key, backend.embed(text))
+            return vector
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+
+def get_embeddings(texts: List[str]) -> List[np.ndarray]:
+    """Embeddings for many texts, sending only the cache misses, in batched requests"""
+    backend = get_embedding_backend()
+    if not backend.cacheable:
+        return list(backend.embed_batch(texts))
+
+    cache = get_embedding_cache()
+    keys = [embedding_cache_key(backend.name, text) for text in texts]
+    vectors: Dict[str, np.ndarray] = {}
+    missing: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key in vectors or key in missing:
+            continue
+        vector = cache.get(key)
+        if vector is None:
+            missing[key] = text
+        else:
+            vectors[key] = vector
+
+    missing_keys = list(missing)
+    for key, vector in zip(missing_keys, backend.embed_batch([missing[key] for key in missing_keys])):
+        vectors[key] = cache.put(key, vector)
+
+    return [vectors[key] for key in keys]
+
+
+def embedding_cache_stats() -> Dict[str, float]:
+    """Hit/miss counters of the embedding cache"""
+    return get_embedding_cache().stats()
 
 
 def embedding_similarity(text_a: str, text_b: str) -> float:
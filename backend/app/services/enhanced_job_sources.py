@@ -1,94 +1,281 @@
 # [file name]: enhanced_job_sources.py - COMPLETE FIXED
+import os
+import time
+import queue
+import hashlib
+import sqlite3
+import threading
 import requests
-from typing import List, Dict
-import json
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlencode
+from uuid import uuid4
+from datetime import datetime, timezone
 
-def fetch_remotive_jobs() -> List[Dict]:
-    """Fetch from Remotive API"""
-    try:
-        url = "https://remotive.com/api/remote-jobs"
-        params = {
-            'category': 'software-dev',
-            'limit': 20
+from app.services.job_dedupe import DedupeIndex, job_signature, stable_external_id
+from app.services.json_stream import iter_json_array
+from app.services.source_connectors import Connector, ConnectorRegistry, SourceUnavailable
+
+# Board endpoints, overridable to point at local stand-ins (benchmarks/fake_job_boards.py)
+REMOTIVE_URL = os.getenv("REMOTIVE_API_URL", "https://remotive.com/api/remote-jobs")
+ARBEITNOW_URL = os.getenv("ARBEITNOW_API_URL", "https://www.arbeitnow.com/api/job-board-api")
+REMOTEOK_URL = os.getenv("REMOTEOK_API_URL", "https://remoteok.com/api")
+
+# Per-read timeout of a source, and how long an iter_enhanced_jobs call waits
+# on sources overall; whatever is still outstanding by then is left out
+SOURCE_TIMEOUT = 10
+JOB_FETCH_DEADLINE = float(os.getenv("JOB_FETCH_DEADLINE", "8"))
+
+# How long a background import waits on sources; rate limits pace a paginated
+# board's pages, so a first sync of a large board takes minutes
+IMPORT_FETCH_DEADLINE = float(os.getenv("IMPORT_FETCH_DEADLINE", "900"))
+
+# Board responses and their ETag/Last-Modified validators are kept on disk; a
+# response younger than the TTL is replayed without a request, an older one is
+# revalidated with a conditional request. An empty directory disables the cache.
+SOURCE_CACHE_DIR = os.getenv("SOURCE_CACHE_DIR", "./source_cache")
+SOURCE_CACHE_TTL = float(os.getenv("SOURCE_CACHE_TTL", "300"))
+
+# Bytes read from a response or cached body at a time, and how many parsed jobs
+# may wait between the source threads and the consumer
+STREAM_CHUNK_BYTES = 64 * 1024
+STREAM_QUEUE_SIZE = 1000
+
+# Most pages of a paginated board read in one sync; an incremental sync stops
+# at the first page with nothing newer than the source's watermark
+SOURCE_MAX_PAGES = int(os.getenv("SOURCE_MAX_PAGES", "100"))
+
+# One pooled session keeps connections to each board alive between imports
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+_session.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+# Long-lived pool: a source that misses the deadline finishes in the background
+# instead of holding up the caller
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="job-source")
+
+class SourceCache:
+    """HTTP cache for board feeds: validators in SQLite, bodies as files beside it.
+    
+    Bodies are written to disk as they download and read back in chunks on a
+    hit, so a response is never held in memory whole.
+    """
+
+    def __init__(self, directory: Optional[str] = SOURCE_CACHE_DIR, ttl: float = SOURCE_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        self._db = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "fetched_at REAL, size INTEGER)"
+            )
+            self._db.commit()
+
+    def _count(self, source: str, outcome: str, downloaded: int = 0, saved: int = 0) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(source, {
+                "requests": 0, "fresh_hits": 0, "not_modified": 0, "misses": 0,
+                "bytes_downloaded": 0, "bytes_saved": 0,
+            })
+            stats["requests"] += 1
+            stats[outcome] += 1
+            stats["bytes_downloaded"] += downloaded
+            stats["bytes_saved"] += saved
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, fetched_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._body_path(key)):
+            return None
+        return dict(zip(("etag", "last_modified", "fetched_at", "size"), row))
+
+    def _replay(self, key: str) -> Iterator[bytes]:
+        with open(self._body_path(key), "rb") as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_BYTES), b""):
+                yield chunk
+
+    def _download(self, source: str, key: Optional[str], response: requests.Response) -> Iterator[bytes]:
+        """Chunks of a 200 response, written through to the cache and stored once complete"""
+        size = 0
+        partial = None
+        try:
+            if key is None:
+                for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                    size += len(chunk)
+                    yield chunk
+                return
+
+            path = self._body_path(key)
+            partial = f"{path}.{uuid4().hex}.part"
+            with open(partial, "wb") as f:
+                for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                    f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+            os.replace(partial, path)
+            partial = None
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, last_modified, fetched_at, size) VALUES (?, ?, ?, ?, ?)",
+                    (key, response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time(), size),
+                )
+                self._db.commit()
+        finally:
+            response.close()
+            # A body the consumer stopped reading halfway is not cached
+            if partial is not None and os.path.exists(partial):
+                os.remove(partial)
+            self._count(source, "misses", downloaded=size)
+
+    def stream(self, source: str, url: str, array_key: Optional[str] = None, params: Optional[Dict] = None,
+               headers: Optional[Dict] = None, timeout: float = SOURCE_TIMEOUT) -> Iterator[Any]:
+        """Elements of a GET's JSON array (the `array_key` member, or the whole
+        document), replayed from the cache when it is fresh or unchanged"""
+        key = None
+        entry = None
+        headers = dict(headers or {})
+        if self._db is not None:
+            key = url + ("?" + urlencode(sorted(params.items())) if params else "")
+            entry = self._entry(key)
+            if entry and time.time() - entry["fetched_at"] < self.ttl:
+                self._count(source, "fresh_hits", saved=entry["size"])
+                yield from iter_json_array(self._replay(key), array_key)
+                return
+            if entry and entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = _session.get(url, params=params, headers=headers, timeout=timeout, stream=True)
+        if entry and response.status_code == 304:
+            response.close()
+            with self._lock:
+                self._db.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+            self._count(source, "not_modified", saved=entry["size"])
+            yield from iter_json_array(self._replay(key), array_key)
+            return
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
+        yield from iter_json_array(self._download(source, key, response), array_key)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-source request outcomes, bytes downloaded and saved, and hit rate"""
+        with self._lock:
+            return {
+                source: {
+                    **stats,
+                    "hit_rate": (stats["fresh_hits"] + stats["not_modified"]) / stats["requests"],
+                }
+                for source, stats in self._stats.items()
+            }
+
+
+# Opened on first use, so importing this module creates nothing on disk
+source_cache: Optional[SourceCache] = None
+_source_cache_lock = threading.Lock()
+
+def get_source_cache() -> SourceCache:
+    """The process-wide board cache, opened on first use"""
+    global source_cache
+    with _source_cache_lock:
+        if source_cache is None:
+            source_cache = SourceCache()
+        return source_cache
+
+def source_cache_stats() -> Dict[str, Dict[str, float]]:
+    """Cache counters of every board fetched so far"""
+    return source_cache.stats() if source_cache is not None else {}
+
+def _posted_at(value: Any) -> Optional[float]:
+    """Publication time of a posting as a UTC epoch, from an epoch number or an ISO date"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            posted = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if posted.tzinfo is None:
+            posted = posted.replace(tzinfo=timezone.utc)
+        return posted.timestamp()
+    return None
+
+def parse_remotive_jobs(postings: Iterable[Dict]) -> Iterator[Dict]:
+    """Normalized jobs from Remotive's `jobs` array"""
+    for job in postings:
+        yield {
+            "external_id": f"remotive_{job.get('id')}",
+            "title": job.get('title', ''),
+            "company": job.get('company_name', ''),
+            "location": job.get('candidate_required_location', 'Remote'),
+            "description": job.get('description', ''),
+            "apply_url": job.get('url', ''),
+            "job_type": "Full-time",
+            "level": "Mid Level",
+            "salary": job.get('salary', ''),
+            "posted_at": _posted_at(job.get('publication_date'))
         }
-        
-        response = requests.get(url, params=params, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            jobs = []
-            for job in data.get('jobs', []):
-                jobs.append({
-                    "external_id": f"remotive_{job.get('id')}",
-                    "title": job.get('title', ''),
-                    "company": job.get('company_name', ''),
-                    "location": job.get('candidate_required_location', 'Remote'),
-                    "description": job.get('description', ''),
-                    "apply_url": job.get('url', ''),
-                    "job_type": "Full-time",
-                    "level": "Mid Level",
-                    "salary": job.get('salary', '')
-                })
-            return jobs
-    except Exception as e:
-        print(f"Remotive Jobs error: {e}")
-    return []
 
-def fetch_arbeitnow_jobs() -> List[Dict]:
-    """Fetch from Arbeitnow API"""
-    try:
-        url = "https://www.arbeitnow.com/api/job-board-api"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            jobs = []
-            for job in data.get('data', [])[:20]:  # Limit to 20 jobs
-                jobs.append({
-                    "external_id": f"arbeitnow_{job.get('slug')}",
-                    "title": job.get('title', ''),
-                    "company": job.get('company_name', ''),
-                    "location": job.get('location', 'Remote'),
-                    "description": f"{job.get('description', '')} {job.get('tags', '')}",
-                    "apply_url": job.get('url', ''),
-                    "job_type": "Full-time",
-                    "level": "Mid Level",
-                    "salary": None
-                })
-            return jobs
-    except Exception as e:
-        print(f"Arbeitnow Jobs error: {e}")
-    return []
+# No limit: Remotive returns the whole category as one document
+REMOTIVE_PARAMS = {
+    'category': 'software-dev'
+}
 
-def fetch_remoteok_jobs() -> List[Dict]:
-    """Fetch from RemoteOK API"""
-    try:
-        url = "https://remoteok.com/api"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+def parse_arbeitnow_jobs(postings: Iterable[Dict]) -> Iterator[Dict]:
+    """Normalized jobs from Arbeitnow's `data` array"""
+    for job in postings:
+        yield {
+            "external_id": f"arbeitnow_{job.get('slug')}",
+            "title": job.get('title', ''),
+            "company": job.get('company_name', ''),
+            "location": job.get('location', 'Remote'),
+            "description": f"{job.get('description', '')} {job.get('tags', '')}",
+            "apply_url": job.get('url', ''),
+            "job_type": "Full-time",
+            "level": "Mid Level",
+            "salary": None,
+            "posted_at": _posted_at(job.get('created_at'))
+        }
+
+def parse_remoteok_jobs(postings: Iterable[Dict]) -> Iterator[Dict]:
+    """Normalized jobs from RemoteOK's top-level array"""
+    for job in islice(postings, 1, None):  # Skip first element (metadata)
+        yield {
+            "external_id": f"remoteok_{job.get('id')}",
+            "title": job.get('position', ''),
+            "company": job.get('company', ''),
+            "location": 'Remote',
+            "description": job.get('description', ''),
+            "apply_url": f"https://remoteok.com/l/{job.get('id')}",
+            "job_type": "Full-time",
+            "level": "Mid Level",
+            "salary": job.get('salary', ''),
+            # Annual USD figures, 0 when the posting gives none
+            "salary_min": job.get('salary_min') or None,
+            "salary_max": job.get('salary_max') or None,
+            "posted_at": _posted_at(job.get('epoch') or job.get('date'))
         }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            jobs = []
-            for job in data[1:21]:  # Skip first element (metadata), take next 20
-                jobs.append({
-                    "external_id": f"remoteok_{job.get('id')}",
-                    "title": job.get('position', ''),
-                    "company": job.get('company', ''),
-                    "location": 'Remote',
-                    "description": job.get('description', ''),
-                    "apply_url": f"https://remoteok.com/l/{job.get('id')}",
-                    "job_type": "Full-time",
-                    "level": "Mid Level",
-                    "salary": job.get('salary', '')
-                })
-            return jobs
-    except Exception as e:
-        print(f"RemoteOK Jobs error: {e}")
-    return []
 
-def fetch_authentic_jobs() -> List[Dict]:
+REMOTEOK_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+def fetch_authentic_jobs(timeout: float = SOURCE_TIMEOUT) -> List[Dict]:
     """Fetch from Authentic Jobs API"""
     try:
         # Fallback sample data since API key might not be available
@@ -112,7 +299,7 @@ def fetch_authentic_jobs() -> List[Dict]:
         ]
         
         return [{
-            "external_id": f"authentic_{hash(job['title'] + job['company'])}",
+            "external_id": stable_external_id("authentic", job),
             **job,
             "job_type": "Full-time",
             "level": "Senior"
@@ -122,7 +309,7 @@ def fetch_authentic_jobs() -> List[Dict]:
         print(f"Authentic Jobs error: {e}")
     return []
 
-def fetch_we_work_remotely() -> List[Dict]:
+def fetch_we_work_remotely(timeout: float = SOURCE_TIMEOUT) -> List[Dict]:
     """Fetch from We Work Remotely"""
     try:
         # Sample data for We Work Remotely
@@ -154,7 +341,7 @@ def fetch_we_work_remotely() -> List[Dict]:
         ]
         
         return [{
-            "external_id": f"wwr_{hash(job['title'] + job['company'])}",
+            "external_id": stable_external_id("wwr", job),
             **job,
             "job_type": "Full-time",
             "level": "Senior"
@@ -164,28 +351,203 @@ def fetch_we_work_remotely() -> List[Dict]:
         print(f"We Work Remotely error: {e}")
     return []
 
-def fetch_all_enhanced_jobs(query: str = "cloud engineer") -> List[Dict]:
-    """Fetch from ALL enhanced job sources"""
-    print(f"🔍 Fetching enhanced jobs from all sources for: {query}")
+def _is_newer(job: Dict, since: Optional[float]) -> bool:
+    # Ties are kept: a posting from the watermark's second may not have been seen yet,
+    # and one that was is dropped by the import's dedupe
+    return since is None or job.get("posted_at") is None or job["posted_at"] >= since
+
+def _board_fetcher(source: str, url: str, array_key: Optional[str] = None, params: Optional[Dict] = None,
+                   headers: Optional[Dict] = None, paginated: bool = False):
+    """Connector fetcher for a JSON board feed, streamed through the source cache.
     
-    all_jobs = []
+    Only postings at or after `since` are yielded. Boards list newest first,
+    so a paginated one is read from start_page until a page brings nothing
+    newer; every page after the first takes a rate-limit token through
+    throttle, and its jobs carry their page as "source_page".
+    """
+    def fetch(parse: Callable[[Iterable[Any]], Iterable[Dict]], timeout: float, since: Optional[float] = None,
+              throttle: Optional[Callable[[], None]] = None, start_page: int = 1) -> Iterator[Dict]:
+        for page in range(start_page, start_page + SOURCE_MAX_PAGES) if paginated else [None]:
+            page_params = dict(params or {})
+            if page is not None:
+                page_params["page"] = page
+                if page > start_page and throttle is not None:
+                    throttle()
+            seen = 0
+            new = 0
+            for job in parse(get_source_cache().stream(source, url, array_key, params=page_params or None, headers=headers, timeout=timeout)):
+                seen += 1
+                if _is_newer(job, since):
+                    new += 1
+                    yield job if page is None else {**job, "source_page": page}
+            if not seen or not new:
+                return
+    return fetch
+
+def _sample_fetcher(fetch_samples: Callable[..., List[Dict]]):
+    """Connector fetcher for a built-in sample source, whose jobs are already normalized"""
+    def fetch(parse: Callable[[Iterable[Any]], Iterable[Dict]], timeout: float, since: Optional[float] = None,
+              throttle: Optional[Callable[[], None]] = None, start_page: int = 1) -> Iterable[Dict]:
+        return parse(fetch_samples(timeout=timeout))
+    return fetch
+
+def _already_normalized(jobs: Iterable[Dict]) -> Iterable[Dict]:
+    return jobs
+
+# Every source iter_enhanced_jobs queries; sample sources never leave the
+# process, so they are not rate limited
+CONNECTORS = ConnectorRegistry()
+CONNECTORS.register(Connector("Remotive", _board_fetcher("Remotive", REMOTIVE_URL, "jobs", params=REMOTIVE_PARAMS), parse_remotive_jobs))
+CONNECTORS.register(Connector("Arbeitnow", _board_fetcher("Arbeitnow", ARBEITNOW_URL, "data", paginated=True), parse_arbeitnow_jobs))
+CONNECTORS.register(Connector("RemoteOK", _board_fetcher("RemoteOK", REMOTEOK_URL, headers=REMOTEOK_HEADERS), parse_remoteok_jobs))
+CONNECTORS.register(Connector("Authentic Jobs", _sample_fetcher(fetch_authentic_jobs), _already_normalized, rate_per_minute=None))
+CONNECTORS.register(Connector("We Work Remotely", _sample_fetcher(fetch_we_work_remotely), _already_normalized, rate_per_minute=None))
+
+def source_health() -> Dict[str, Dict]:
+    """Circuit state, call counts and latency of every connector"""
+    return CONNECTORS.health()
+
+class _SourceDone:
+    """End-of-source marker a connector thread puts on the job queue"""
+
+    def __init__(self, name: str, info: Dict, error: Optional[Exception] = None):
+        self.name = name
+        self.info = info
+        self.error = error
+
+def _pump(connector: Connector, timeout: float, since: Optional[float], resume: Optional[Dict],
+          out: queue.Queue, cancelled: threading.Event) -> None:
+    """Stream one connector's jobs onto the queue, then a _SourceDone.
     
-    # Existing reliable sources
-    print("📥 Fetching from Remotive...")
-    all_jobs.extend(fetch_remotive_jobs())
+    A source that completes reports the newest publication time it delivered
+    as its new watermark; one cut short keeps the old one, since the postings
+    it did not reach are older than those it did. A resumed sync starts at
+    the page the interrupted one stopped at, and completes with the newest
+    publication time that one had delivered.
+    """
+    def offer(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    start = time.perf_counter()
+    count = 0
+    watermark = since
+    if resume is not None and resume.get("newest") is not None and (watermark is None or resume["newest"] > watermark):
+        watermark = resume["newest"]
+    try:
+        for job in connector.stream(timeout, since, resume["page"] if resume else 1):
+            if not offer((connector.name, job)):
+                return
+            count += 1
+            if job.get("posted_at") is not None and (watermark is None or job["posted_at"] > watermark):
+                watermark = job["posted_at"]
+    except SourceUnavailable as e:
+        # Held back before the first request, or rate limited between pages:
+        # the jobs already delivered are kept, the watermark is not advanced
+        latency_ms = round((time.perf_counter() - start) * 1000, 1) if count else 0.0
+        offer(_SourceDone(connector.name, {"status": e.status, "jobs": count, "latency_ms": latency_ms}))
+        return
+    except Exception as e:
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        offer(_SourceDone(connector.name, {"status": "error", "jobs": count, "latency_ms": latency_ms, "error": str(e)}, e))
+        return
+    info = {"status": "ok", "jobs": count, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+    if watermark is not None:
+        info["watermark"] = watermark
+    offer(_SourceDone(connector.name, info))
+
+def iter_source_jobs(deadline: float = JOB_FETCH_DEADLINE, report: Optional[Dict[str, Dict]] = None,
+                     watermarks: Optional[Dict[str, float]] = None,
+                     resume: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+    """Jobs from every connector, yielded as they stream in concurrently.
     
-    print("📥 Fetching from Arbeitnow...")
-    all_jobs.extend(fetch_arbeitnow_jobs())
+    With watermarks, a source only delivers postings published at or after
+    its watermark, and a completed source's report carries its new one.
+    A paginated source that does not complete reports where to resume
+    ({"page", "newest"}: the page of the last job it delivered and the
+    newest publication time so far); with resume, the next sync picks up
+    from there instead of page 1.
     
-    print("📥 Fetching from RemoteOK...")
-    all_jobs.extend(fetch_remoteok_jobs())
+    `deadline` bounds the time spent waiting on sources, not the time the
+    caller spends on the jobs it is handed. Sources still outstanding after
+    it are reported as timeouts (jobs they already delivered are kept); a
+    failing source as an error, and one its connector held back as
+    circuit_open or rate_limited. The report is filled in as sources finish.
+    """
+    report = {} if report is None else report
+    timeout = min(SOURCE_TIMEOUT, deadline)
+    out: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancelled = threading.Event()
+    pending = {connector.name: 0 for connector in CONNECTORS}
+    resume = dict(resume or {})
+    progress: Dict[str, Dict] = {}
+    for connector in CONNECTORS:
+        _fetch_pool.submit(_pump, connector, timeout, (watermarks or {}).get(connector.name),
+                           resume.get(connector.name), out, cancelled)
     
-    # New enhanced sources
-    print("📥 Fetching from Authentic Jobs...")
-    all_jobs.extend(fetch_authentic_jobs())
+    def resume_point(name: str) -> Optional[Dict]:
+        """Where a source cut short should resume, None if it delivered no page"""
+        if name not in progress:
+            return resume.get(name)
+        newest = [value for value in (progress[name]["newest"], (resume.get(name) or {}).get("newest")) if value is not None]
+        return {"page": progress[name]["page"], "newest": max(newest) if newest else None}
+    
+    waited = 0.0
+    try:
+        while pending and waited < deadline:
+            start = time.perf_counter()
+            try:
+                item = out.get(timeout=deadline - waited)
+            except queue.Empty:
+                break
+            finally:
+                waited += time.perf_counter() - start
+            if isinstance(item, _SourceDone):
+                pending.pop(item.name)
+                report[item.name] = item.info
+                if item.info["status"] != "ok" and resume_point(item.name) is not None:
+                    report[item.name]["resume"] = resume_point(item.name)
+                if item.error is not None:
+                    print(f"{item.name} Jobs error: {item.error}")
+                continue
+            name, job = item
+            pending[name] += 1
+            page = job.pop("source_page", None)
+            if page is not None:
+                seen = progress.setdefault(name, {"page": page, "newest": None})
+                seen["page"] = page
+                if job.get("posted_at") is not None and (seen["newest"] is None or job["posted_at"] > seen["newest"]):
+                    seen["newest"] = job["posted_at"]
+            yield job
+    finally:
+        cancelled.set()
     
-    print("📥 Fetching from We Work Remotely...")
-    all_jobs.extend(fetch_we_work_remotely())
+    for name, delivered in pending.items():
+        print(f"⏱️ {name} missed the {deadline:.1f}s deadline")
+        report[name] = {"status": "timeout", "jobs": delivered, "latency_ms": round(deadline * 1000, 1)}
+        if resume_point(name) is not None:
+            report[name]["resume"] = resume_point(name)
+    print("📥 Sources: " + ", ".join(f"{name} {info['status']} {info['latency_ms']:.0f}ms" for name, info in report.items()))
+
+def fetch_sources(deadline: float = JOB_FETCH_DEADLINE) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """Every connector's jobs as one list, and the per-source report (see iter_source_jobs)"""
+    report: Dict[str, Dict] = {}
+    jobs = list(iter_source_jobs(deadline, report))
+    return jobs, report
+
+def iter_enhanced_jobs(query: str = "cloud engineer", deadline: float = JOB_FETCH_DEADLINE,
+                       report: Optional[Dict[str, Dict]] = None, watermarks: Optional[Dict[str, float]] = None,
+                       resume: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+    """Deduplicated jobs from ALL enhanced job sources, as a stream; `report`
+    is filled with the per-source status and latency once it is exhausted.
+    With watermarks only postings newer than each source's are fetched, and
+    with resume interrupted syncs continue where they stopped."""
+    print(f"🔍 Fetching enhanced jobs from all sources for: {query}")
     
     # Sample jobs to ensure we always have content
     print("📥 Adding sample jobs...")
@@ -246,20 +608,21 @@ def fetch_all_enhanced_jobs(query: str = "cloud engineer") -> List[Dict]:
         }
     ]
     
-    all_jobs.extend([{
-        "external_id": f"enhanced_{hash(job['title'] + job['company'])}",
+    sample_jobs = [{
+        "external_id": stable_external_id("enhanced", job),
         **job,
         "job_type": "Full-time"
-    } for job in sample_enhanced_jobs])
+    } for job in sample_enhanced_jobs]
     
-    # Remove duplicates
-    unique_jobs = []
-    seen = set()
-    for job in all_jobs:
-        key = f"{job['title']}_{job['company']}"
-        if key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
+    # Remove duplicates, including postings cross-listed on several sources; jobs carry
+    # their fingerprint and SimHash so the import does not compute them again
+    unique_count = 0
+    seen = DedupeIndex()
+    for job in chain(iter_source_jobs(deadline, report, watermarks, resume), sample_jobs):
+        signature = job_signature(job)
+        if seen.match(job.get("external_id"), signature) is None:
+            seen.add(job.get("external_id"), signature)
+            unique_count += 1
+            yield {**job, "fingerprint": signature.fingerprint, "simhash": signature.simhash}
     
-    print(f"🎉 Enhanced job fetch complete: {len(unique_jobs)} total jobs")
-    return unique_jobs
\ No newline at end of file
+    print(f"🎉 Enhanced job fetch complete: {unique_count} total jobs")
\ No newline at end of file
@@ -0,0 +1,125 @@
+# [file name]: import_tasks.py - job imports run in the background with progress
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.database import SessionLocal
+from app.services.enhanced_job_sources import IMPORT_FETCH_DEADLINE, iter_enhanced_jobs
+from app.services.job_import import import_job_stream, load_resume_points, load_watermarks, save_watermarks
+
+# Finished tasks stay queryable this long
+IMPORT_TASK_TTL = int(os.getenv("IMPORT_TASK_TTL", "3600"))
+
+# Imports write the same tables, so they run one at a time
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-import")
+
+
+class ImportTask:
+    """One background import: queued -> running -> succeeded | failed"""
+
+    def __init__(self, query: str, full_sync: bool):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.full_sync = full_sync
+        self.status = "queued"
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.found = 0
+        self.imported = 0
+        # Filled in by the source fetch as each source finishes
+        self.sources: Dict[str, Dict] = {}
+        self.error: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.id,
+            "query": self.query,
+            "full_sync": self.full_sync,
+            "status": self.status,
+            "found": self.found,
+            "imported": self.imported,
+            "sources": dict(self.sources),
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+_tasks: Dict[str, ImportTask] = {}
+# Queued or running task per import key, so duplicate requests share it
+_active: Dict[Tuple[str, bool], str] = {}
+_lock = threading.Lock()
+
+
+def _import_key(query: str, full_sync: bool) -> Tuple[str, bool]:
+    return " ".join(query.lower().split()), full_sync
+
+
+def _forget_expired() -> None:
+    cutoff = datetime.utcnow() - timedelta(seconds=IMPORT_TASK_TTL)
+    for task_id in [task_id for task_id, task in _tasks.items() if task.finished_at is not None and task.finished_at < cutoff]:
+        del _tasks[task_id]
+
+
+def _run_import(task: ImportTask) -> None:
+    task.status = "running"
+    task.started_at = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        watermarks = {} if task.full_sync else load_watermarks(db)
+        resume = {} if task.full_sync else load_resume_points(db)
+
+        def progress(counts: Dict[str, int]) -> None:
+            task.found = counts["found"]
+            task.imported = counts["imported"]
+
+        counts = import_job_stream(
+            db, iter_enhanced_jobs(task.query, IMPORT_FETCH_DEADLINE, task.sources, watermarks, resume), on_batch=progress
+        )
+        progress(counts)
+        save_watermarks(db, task.sources)
+        # finished_at before the status, so a task is never done without it
+        task.finished_at = datetime.utcnow()
+        task.status = "succeeded"
+        print(f"✅ Import {task.id} imported {task.imported} of {task.found} jobs for: {task.query}")
+    except Exception as e:
+        db.rollback()
+        task.finished_at = datetime.utcnow()
+        task.status = "failed"
+        task.error = str(e)
+        print(f"❌ Import {task.id} failed: {e}")
+    finally:
+        db.close()
+        with _lock:
+            key = _import_key(task.query, task.full_sync)
+            if _active.get(key) == task.id:
+                del _active[key]
+
+
+def start_import(query: str, full_sync: bool = False) -> Tuple[ImportTask, bool]:
+    """(task, coalesced): a new queued import, or the one already queued or running for the same query"""
+    key = _import_key(query, full_sync)
+    with _lock:
+        _forget_expired()
+        task_id = _active.get(key)
+        if task_id is not None:
+            return _tasks[task_id], True
+        task = ImportTask(query, full_sync)
+        _tasks[task.id] = task
+        _active[key] = task.id
+    _executor.submit(_run_import, task)
+    return task, False
+
+
+def get_import(task_id: str) -> Optional[ImportTask]:
+    with _lock:
+        return _tasks.get(task_id)
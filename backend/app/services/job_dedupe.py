@@ -0,0 +1,265 @@
+# [file name]: job_dedupe.py - stable content fingerprints and near-duplicate detection
+import hashlib
+import os
+import re
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Union
+
+import numpy as np
+
+from app.services.job_text import html_to_text
+
+# Postings of the same company whose SimHashes differ in at most this many of 64 bits
+# are near-duplicates
+NEAR_DUPLICATE_DISTANCE = int(os.getenv("NEAR_DUPLICATE_DISTANCE", "12"))
+
+# A posting's SimHash is cut into this many bands; only stored postings of the same
+# company that share one band exactly are compared with it
+SIMHASH_BANDS = 8
+
+# Most postings compared per band, newest first, so a lookup costs the same for
+# an employer with thousands of postings
+MAX_BAND_CANDIDATES = 32
+
+# Word n-grams hashed into the SimHash; bigrams keep short postings that only differ
+# in formatting or an appended tag list within a few bits
+SHINGLE_WORDS = 2
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "gmbh", "corp", "corporation", "co", "company", "limited", "ag", "sa", "bv"}
+
+
+@dataclass(frozen=True)
+class ContentSignature:
+    """What dedupe compares a posting by"""
+    fingerprint: str
+    simhash: int
+    company: int
+    title: int
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercased words of a text with HTML tags and entities removed"""
+    return " ".join(_TOKEN.findall(html_to_text(text).lower()))
+
+
+def company_key(company: Optional[str]) -> str:
+    """Normalized company name without legal suffixes ('TechStart Inc.' -> 'techstart')"""
+    words = normalize_text(company).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def content_fingerprint(job_data: Dict) -> str:
+    """SHA-1 of a posting's normalized title, company and description.
+
+    Unlike hash(), it is the same in every process, so it can be stored and
+    used to build ids.
+    """
+    parts = [
+        normalize_text(job_data.get("title")),
+        company_key(job_data.get("company")),
+        normalize_text(job_data.get("description")),
+    ]
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def stable_external_id(prefix: str, job_data: Dict) -> str:
+    """external_id for a source without ids of its own"""
+    return f"{prefix}_{content_fingerprint(job_data)[:16]}"
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of a normalized text's word shingles, 0 for an empty text"""
+    words = text.split()
+    if not words:
+        return 0
+    shingles = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))]
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little") for shingle in shingles],
+        dtype="<u8",
+    )
+    # Each bit is set when most shingle hashes have it set
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+def _crc(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def job_signature(job_data: Dict) -> ContentSignature:
+    """Signature of a normalized source job, reusing a fingerprint and SimHash it already carries"""
+    title = normalize_text(job_data.get("title"))
+    company = _crc(company_key(job_data.get("company")))
+    if job_data.get("fingerprint") and job_data.get("simhash") is not None:
+        return ContentSignature(job_data["fingerprint"], job_data["simhash"], company, _crc(title))
+    text = f"{title} {normalize_text(job_data.get('description'))}".strip()
+    return ContentSignature(content_fingerprint(job_data), simhash(text), company, _crc(title))
+
+
+def to_signed64(value: int) -> int:
+    """An unsigned 64-bit SimHash as the signed value a BIGINT column holds"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_signed64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class DedupeIndex:
+    """Every known posting's external_id, fingerprint and SimHash, for O(1) dedupe.
+
+    Exact duplicates (same external_id or fingerprint) are set lookups. Near
+    duplicates, the same posting cross-listed on several boards with its text
+    reformatted, are looked for among the postings of the same company only:
+    one with the same normalized title is a set lookup, and SimHashes are
+    bucketed by company and band so that only postings sharing a band are
+    checked for being within max_distance bits. A lookup reads a bounded
+    number of candidates however many jobs, or postings of one company, are
+    indexed.
+    """
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_DISTANCE, bands: int = SIMHASH_BANDS):
+        self.max_distance = max_distance
+        self.bands = bands
+        self._band_bits = 64 // bands
+        self.external_ids: Set[str] = set()
+        # First 64 bits of each SHA-1, a quarter of the memory of the hex strings
+        self.fingerprints: Set[int] = set()
+        # (company, title) CRCs packed into one int
+        self._titles: Set[int] = set()
+        self._simhashes = array("Q")
+        # (company, band, band value) packed into one int -> entries, a bare int while there is one
+        self._buckets: Dict[int, Union[int, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._simhashes)
+
+    @staticmethod
+    def _fingerprint_key(fingerprint: str) -> int:
+        return int(fingerprint[:16], 16)
+
+    @staticmethod
+    def _title_key(signature: ContentSignature) -> int:
+        return signature.company << 32 | signature.title
+
+    def _bucket_keys(self, signature: ContentSignature) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        base = signature.company * self.bands
+        return [
+            (base + band) << self._band_bits | (signature.simhash >> band * self._band_bits) & mask
+            for band in range(self.bands)
+        ]
+
+    def match(self, external_id: Optional[str], signature: ContentSignature) -> Optional[str]:
+        """How a posting duplicates a known one ("external_id", "fingerprint" or
+        "near_duplicate"), None for a new posting"""
+        if external_id and external_id in self.external_ids:
+            return "external_id"
+        if self._fingerprint_key(signature.fingerprint) in self.fingerprints:
+            return "fingerprint"
+        if self._title_key(signature) in self._titles:
+            return "near_duplicate"
+        if not signature.simhash:
+            return None
+        for key in self._bucket_keys(signature):
+            entries = self._buckets.get(key)
+            if entries is None:
+                continue
+            for entry in (entries,) if isinstance(entries, int) else entries[-MAX_BAND_CANDIDATES:]:
+                if (self._simhashes[entry] ^ signature.simhash).bit_count() <= self.max_distance:
+                    return "near_duplicate"
+        return None
+
+    def add(self, external_id: Optional[str], signature: ContentSignature) -> None:
+        if external_id:
+            self.external_ids.add(external_id)
+        self.fingerprints.add(self._fingerprint_key(signature.fingerprint))
+        self._titles.add(self._title_key(signature))
+        entry = len(self._simhashes)
+        self._simhashes.append(signature.simhash)
+        if not signature.simhash:
+            return
+        for key in self._bucket_keys(signature):
+            entries = self._buckets.get(key)
+            if entries is None:
+                self._buckets[key] = entry
+            elif isinstance(entries, int):
+                self._buckets[key] = [entries, entry]
+            else:
+                entries.append(entry)
+
+    @classmethod
+    def from_db(cls, db, batch_size: int = 10000) -> "DedupeIndex":
+        """Index every stored job from its signature columns, without loading
+        descriptions except for rows stored before they existed"""
+        from app.models import Job
+
+        index = cls()
+        unsigned_ids = []
+        rows = db.query(Job.id, Job.external_id, Job.title, Job.company, Job.fingerprint, Job.simhash).yield_per(batch_size)
+        for row in rows:
+            if row.fingerprint is None or row.simhash is None:
+                unsigned_ids.append(row.id)
+                continue
+            index.add(row.external_id, job_signature({
+                "title": row.title, "company": row.company,
+                "fingerprint": row.fingerprint, "simhash": from_signed64(row.simhash),
+            }))
+
+        for start in range(0, len(unsigned_ids), batch_size):
+            for job in db.query(Job).filter(Job.id.in_(unsigned_ids[start:start + batch_size])):
+                index.add(job.external_id, job_signature(_job_as_dict(job)))
+        return index
+
+
+def _job_as_dict(job) -> Dict:
+    return {"title": job.title, "company": job.company, "description": job.description}
+
+
+def apply_job_signature(job, signature: Optional[ContentSignature] = None) -> None:
+    """Store the fingerprint and SimHash on a Job row"""
+    signature = signature or job_signature(_job_as_dict(job))
+    job.fingerprint = signature.fingerprint
+    job.simhash = to_signed64(signature.simhash)
+
+
+def backfill_job_fingerprints(db, batch_size: int = 1000) -> int:
+    """Fingerprint jobs stored before fingerprints existed"""
+    from app.models import Job
+
+    backfilled = 0
+    while True:
+        stale = db.query(Job).filter((Job.fingerprint.is_(None)) | (Job.simhash.is_(None))).limit(batch_size).all()
+        if not stale:
+            return backfilled
+        for job in stale:
+            apply_job_signature(job)
+        db.commit()
+        backfilled += len(stale)
+
+
+_index: Optional[DedupeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_dedupe_index(db) -> DedupeIndex:
+    """The process-wide index of stored jobs, loaded on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DedupeIndex.from_db(db)
+        return _index
+
+
+def invalidate_dedupe_index() -> None:
+    """Drop the index after jobs are deleted, or an import failed to commit what it indexed"""
+    global _index
+    with _index_lock:
+        _index = None
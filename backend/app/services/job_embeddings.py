@@ -0,0 +1,517 @@
+# [file name]: job_embeddings.py - persistent job embedding matrix for semantic ranking
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.database import SessionLocal
+from app.models import Job
+from app.services.ann_index import IVFPQIndex
+from app.services.batch_scorer import CandidateSet, top_k
+from app.services.embedding_backends import HashingEmbeddingBackend, get_embedding_backend
+from app.services.embeddings import get_embedding, get_embeddings
+from app.services.quantization import (
+    EMBEDDING_DIMS,
+    EMBEDDING_STORAGE,
+    STORAGE_DTYPES,
+    dequantize,
+    dot_scores,
+    quantize_int8,
+    truncate
+)
+
+# vectors.f32 (or vectors.i8 plus scales.f32) holds one unit-length row per job,
+# ids.i64 the matching job ids and deleted_rows.i64 the rows of expired jobs; the
+# ANN index lives in ann/
+JOB_EMBEDDINGS_DIR = os.getenv("JOB_EMBEDDINGS_DIR", "./job_embeddings")
+
+# Below this many jobs an exact scan is fast enough and no ANN index is built
+ANN_MIN_JOBS = int(os.getenv("ANN_MIN_JOBS", "100000"))
+
+# ANN candidates per requested result, re-scored exactly from the matrix
+ANN_CANDIDATES = int(os.getenv("ANN_CANDIDATES", "10"))
+
+# Only the start of long descriptions is embedded
+JOB_EMBEDDING_TEXT_CHARS = 4000
+
+
+def job_embedding_text(job) -> str:
+    """Text embedded for a job: title, company, location and the start of the description"""
+    parts = [job.title, job.company, job.location, (job.description or "")[:JOB_EMBEDDING_TEXT_CHARS]]
+    return "\n".join(part for part in parts if part)
+
+
+def user_embedding_text(user) -> str:
+    """Text embedded for a user: resume plus the skills field"""
+    return "\n".join(part for part in (user.resume_text, user.skills) if part)
+
+
+class JobEmbeddingMatrix:
+    """Append-only, memory-mapped matrix of normalized job embeddings.
+
+    Rows are appended to a flat file and read back through np.memmap, so the
+    matrix is shared with the page cache instead of living on the heap and
+    reloads without parsing anything. With unit rows, cosine similarity to a
+    query is one matrix-vector product.
+
+    `storage` picks float32 or int8 rows (4x smaller, scored block by block),
+    and `dims` keeps only a prefix of each embedding.
+    """
+
+    def __init__(self, directory: str = JOB_EMBEDDINGS_DIR, model: Optional[str] = None,
+                 storage: str = EMBEDDING_STORAGE, dims: int = EMBEDDING_DIMS):
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown embedding storage {storage!r}, expected one of {sorted(STORAGE_DTYPES)}")
+        self.directory = directory
+        self.model = model or get_embedding_backend().name
+        self.storage = storage
+        self.truncate_dims = dims
+        self.dim = 0
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.vectors = np.zeros((0, 0), dtype=STORAGE_DTYPES[storage])
+        self.scales: Optional[np.ndarray] = None
+        self.alive = np.zeros(0, dtype=bool)
+        self._rows: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.i8" if self.storage == "int8" else "vectors.f32")
+
+    @property
+    def _scales_path(self) -> str:
+        return os.path.join(self.directory, "scales.f32")
+
+    @property
+    def _ids_path(self) -> str:
+        return os.path.join(self.directory, "ids.i64")
+
+    @property
+    def _deleted_rows_path(self) -> str:
+        return os.path.join(self.directory, "deleted_rows.i64")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @property
+    def ann_path(self) -> str:
+        return os.path.join(self.directory, "ann")
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def __contains__(self, job_id: int) -> bool:
+        # Expired ids are absent: SQLite can hand a deleted job's id to a new job
+        row = self._rows.get(job_id)
+        return row is not None and bool(self.alive[row])
+
+    def live_count(self) -> int:
+        return int(self.alive.sum())
+
+    def positions(self, job_ids) -> np.ndarray:
+        """Rows of the given live job ids, in row order (unknown ids are skipped)"""
+        rows = np.fromiter((self._rows.get(int(job_id), -1) for job_id in job_ids), dtype=np.int64)
+        rows = np.unique(rows[rows >= 0])
+        return rows[self.alive[rows]]
+
+    def _load(self) -> None:
+        try:
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        layout = (self.model, self.storage, self.truncate_dims)
+        stored = (meta.get("model"), meta.get("storage", "float32"), meta.get("truncate", 0))
+        if stored != layout:
+            # Vectors from another model or layout are not comparable, start over
+            print(f"[embeddings] job matrix was built as {stored}, rebuilding as {layout}")
+            self._reset()
+            return
+        self.dim = meta["dim"]
+        self._map()
+
+    def _map(self) -> None:
+        dtype = STORAGE_DTYPES[self.storage]
+        ids = np.fromfile(self._ids_path, dtype=np.int64) if os.path.exists(self._ids_path) else np.zeros(0, np.int64)
+        row_bytes = self.dim * np.dtype(dtype).itemsize
+        stored_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        # An interrupted append can leave one file a row ahead of the other
+        rows = min(len(ids), stored_rows)
+        scales = None
+        if self.storage == "int8":
+            scales = np.fromfile(self._scales_path, dtype=np.float32) if os.path.exists(self._scales_path) else np.zeros(0, np.float32)
+            rows = min(rows, len(scales))
+            scales = scales[:rows]
+        self.job_ids = ids[:rows]
+        self.scales = scales
+        self.vectors = (
+            np.memmap(self._vectors_path, dtype=dtype, mode="r", shape=(rows, self.dim))
+            if rows else np.zeros((0, self.dim), dtype=dtype)
+        )
+        self.alive = np.ones(rows, dtype=bool)
+        if os.path.exists(self._deleted_rows_path):
+            deleted_rows = np.fromfile(self._deleted_rows_path, dtype=np.int64)
+            self.alive[deleted_rows[deleted_rows < rows]] = False
+        # Only live rows are looked up by id; a reused id maps to its newest row
+        self._rows = {int(self.job_ids[row]): int(row) for row in np.flatnonzero(self.alive)}
+
+    def _reset(self) -> None:
+        for name in ("vectors.f32", "vectors.i8", "scales.f32", "ids.i64", "deleted_rows.i64", "meta.json"):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.ann_path, ignore_errors=True)
+        self.dim = 0
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.vectors = np.zeros((0, 0), dtype=STORAGE_DTYPES[self.storage])
+        self.scales = None
+        self.alive = np.zeros(0, dtype=bool)
+        self._rows = {}
+
+    def add(self, job_ids: Iterable[int], vectors) -> List[int]:
+        """Append embeddings for jobs not stored yet, or stored and since expired;
+        returns the ids that were added"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        vectors = truncate(vectors, self.truncate_dims)
+
+        with self._lock:
+            if not self.dim:
+                os.makedirs(self.directory, exist_ok=True)
+                self.dim = vectors.shape[1]
+                with open(self._meta_path, "w") as f:
+                    json.dump({
+                        "model": self.model, "dim": self.dim, "storage": self.storage, "truncate": self.truncate_dims
+                    }, f)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match {self.dim}")
+
+            seen = set()
+            keep = []
+            for i, job_id in enumerate(job_ids):
+                if job_id not in seen and job_id not in self:
+                    seen.add(job_id)
+                    keep.append(i)
+            if not keep:
+                return []
+
+            # Rows first, so a crash never leaves an id without its vector
+            rows = vectors[keep]
+            if self.storage == "int8":
+                rows, scales = quantize_int8(rows)
+                with open(self._scales_path, "ab") as f:
+                    f.write(scales.tobytes())
+                self.scales = np.concatenate([self.scales, scales]) if self.scales is not None else scales
+            with open(self._vectors_path, "ab") as f:
+                f.write(rows.tobytes())
+            added = np.asarray(job_ids, dtype=np.int64)[keep]
+            with open(self._ids_path, "ab") as f:
+                f.write(added.tobytes())
+
+            # Remap the grown file; only the new rows need indexing
+            first = len(self.job_ids)
+            self.job_ids = np.concatenate([self.job_ids, added])
+            self.vectors = np.memmap(
+                self._vectors_path, dtype=STORAGE_DTYPES[self.storage], mode="r", shape=(len(self.job_ids), self.dim)
+            )
+            self.alive = np.concatenate([self.alive, np.ones(len(added), dtype=bool)])
+            self._rows.update((int(job_id), first + i) for i, job_id in enumerate(added))
+            return added.tolist()
+
+    def remove(self, job_ids: Iterable[int]) -> int:
+        """Tombstone expired jobs; their rows stay in the file but are never ranked,
+        and their ids are free to be embedded again"""
+        with self._lock:
+            rows = [self._rows.pop(job_id) for job_id in set(job_ids) if job_id in self._rows]
+            if not rows:
+                return 0
+            with open(self._deleted_rows_path, "ab") as f:
+                f.write(np.asarray(rows, dtype=np.int64).tobytes())
+            self.alive[rows] = False
+            return len(rows)
+
+    def prepare_query(self, query_vector) -> np.ndarray:
+        """The query cut to the stored dimensions and normalized"""
+        query = truncate(query_vector, self.truncate_dims)[0]
+        if query.shape[0] != self.dim:
+            raise ValueError(f"Query dimension {query.shape[0]} does not match {self.dim}")
+        return query
+
+    def rows(self, rows) -> np.ndarray:
+        """float32 copies of some stored rows"""
+        return dequantize(self.vectors[rows], None if self.scales is None else self.scales[rows])
+
+    def similarities(self, query_vector) -> np.ndarray:
+        """Cosine similarity of every stored job to the query, in row order"""
+        if not len(self):
+            return np.zeros(0, dtype=np.float64)
+        return dot_scores(self.vectors, self.scales, self.prepare_query(query_vector))
+
+    def similarities_at(self, query_vector, rows: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query to some rows only"""
+        scales = None if self.scales is None else self.scales[rows]
+        return dot_scores(self.vectors[rows], scales, self.prepare_query(query_vector))
+
+    def scores(self, query_vector, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Similarities mapped onto the 0-100 match score scale"""
+        sims = self.similarities(query_vector) if rows is None else self.similarities_at(query_vector, rows)
+        return np.round((sims + 1.0) * 50.0, 2)
+
+    def top_k(self, query_vector, k: int) -> List[Tuple[int, float]]:
+        """(job_id, cosine) of the k most similar live jobs, best first"""
+        sims = np.where(self.alive, self.similarities(query_vector), -np.inf)
+        k = min(k, self.live_count())
+        if k <= 0:
+            return []
+        if len(sims) > k:
+            best = np.argpartition(-sims, k - 1)[:k]
+        else:
+            best = np.arange(len(sims))
+        best = best[np.argsort(-sims[best], kind="stable")]
+        return [(int(self.job_ids[i]), float(sims[i])) for i in best]
+
+
+_job_matrix: Optional[JobEmbeddingMatrix] = None
+_ann_index: Optional[IVFPQIndex] = None
+_job_matrix_lock = threading.Lock()
+# Serializes changes to the ANN index and its one-time build
+_ann_lock = threading.Lock()
+_ann_building = False
+
+
+def get_job_matrix() -> JobEmbeddingMatrix:
+    global _job_matrix, _ann_index
+    with _job_matrix_lock:
+        if _job_matrix is None:
+            _job_matrix = JobEmbeddingMatrix()
+            meta = IVFPQIndex.read_meta(_job_matrix.ann_path)
+            if meta and meta.get("model") == _job_matrix.model and meta.get("dim") == _job_matrix.dim:
+                _ann_index = IVFPQIndex.load(_job_matrix.ann_path)
+        return _job_matrix
+
+
+def get_ann_index() -> Optional[IVFPQIndex]:
+    """The IVF-PQ index over the job matrix, once the catalog is big enough to have one"""
+    get_job_matrix()
+    return _ann_index
+
+
+def _subvector_count(dim: int) -> int:
+    """Most PQ subvectors (bytes per job) up to 64 that evenly split the dimension"""
+    return next(m for m in (64, 48, 32, 24, 16, 12, 8, 6, 4, 3, 2, 1) if dim % m == 0)
+
+
+def build_ann_index(matrix: JobEmbeddingMatrix, sample_size: int = 65536, seed: int = 0,
+                    rows: Optional[np.ndarray] = None) -> IVFPQIndex:
+    """Train an IVF-PQ index on a sample of live rows, fill it with all of them (or
+    the given rows) and save it"""
+    rows = np.flatnonzero(matrix.alive) if rows is None else rows
+    rng = np.random.default_rng(seed)
+    sample = np.sort(rng.choice(rows, min(sample_size, len(rows)), replace=False))
+    n_lists = max(1, min(int(4 * np.sqrt(len(rows))), len(sample) // 39))
+    index = IVFPQIndex.train(matrix.rows(sample), n_lists, _subvector_count(matrix.dim), seed=seed)
+
+    shutil.rmtree(matrix.ann_path, ignore_errors=True)
+    index.save(matrix.ann_path, {"model": matrix.model})
+    for start in range(0, len(rows), 65536):
+        chunk = rows[start:start + 65536]
+        index.add(matrix.job_ids[chunk], matrix.rows(chunk))
+    index.compact()
+    return index
+
+
+def _build_ann_index_in_background(matrix: JobEmbeddingMatrix) -> None:
+    """Build the index off the request path, then catch it up with the rows
+    added and the jobs expired while it was being built"""
+    global _ann_index, _ann_building
+    try:
+        rows = np.flatnonzero(matrix.alive)
+        built_upto = len(matrix)
+        print(f"[embeddings] building ANN index over {len(rows)} jobs")
+        index = build_ann_index(matrix, rows=rows)
+        with _ann_lock:
+            if _job_matrix is not matrix:
+                return
+            later = np.arange(built_upto, len(matrix))
+            later = later[matrix.alive[later]]
+            if len(later):
+                index.add(matrix.job_ids[later], matrix.rows(later))
+            index.remove(matrix.job_ids[rows[~matrix.alive[rows]]])
+            _ann_index = index
+    except Exception as e:
+        print("[embeddings] ANN index build failed, reason:", repr(e))
+    finally:
+        with _ann_lock:
+            _ann_building = False
+
+
+def _update_ann_index(matrix: JobEmbeddingMatrix, job_ids: List[int], vectors) -> None:
+    global _ann_building
+    with _ann_lock:
+        if _ann_index is not None:
+            _ann_index.add(job_ids, truncate(vectors, matrix.truncate_dims))
+            return
+        if _ann_building or matrix.live_count() < ANN_MIN_JOBS:
+            return
+        # Until it is ready, semantic ranking scans the matrix exactly
+        _ann_building = True
+    threading.Thread(target=_build_ann_index_in_background, args=(matrix,), daemon=True, name="ann-build").start()
+
+
+def embed_job_texts(texts: Dict[int, str]) -> int:
+    """Embed the texts of jobs missing from the matrix, by job id, and index them;
+    0 when embeddings are unavailable"""
+    matrix = get_job_matrix()
+    texts = {job_id: text for job_id, text in texts.items() if job_id not in matrix}
+    if not texts:
+        return 0
+    try:
+        vectors = get_embeddings(list(texts.values()))
+    except RuntimeError as e:
+        print("[embeddings] skipping job embeddings, reason:", repr(e))
+        return 0
+    vectors_by_id = dict(zip(texts, vectors))
+    added = matrix.add(list(texts), vectors)
+    if added:
+        _update_ann_index(matrix, added, [vectors_by_id[job_id] for job_id in added])
+    return len(added)
+
+
+def embed_jobs(jobs: List[Job]) -> int:
+    """Embed jobs missing from the matrix and index them; 0 when embeddings are unavailable"""
+    matrix = get_job_matrix()
+    return embed_job_texts({job.id: job_embedding_text(job) for job in jobs if job.id not in matrix})
+
+
+def remove_job_embeddings(job_ids: Iterable[int]) -> int:
+    """Drop expired jobs from semantic ranking and from the ANN index"""
+    job_ids = list(job_ids)
+    removed = get_job_matrix().remove(job_ids)
+    with _ann_lock:
+        if _ann_index is not None:
+            _ann_index.remove(job_ids)
+    return removed
+
+
+def fit_local_embeddings(db) -> bool:
+    """Learn the local backend's IDF weights from the job catalog if it has none yet"""
+    global _job_matrix, _ann_index
+    backend = get_embedding_backend()
+    if not isinstance(backend, HashingEmbeddingBackend) or backend.idf is not None:
+        return False
+    texts = [job_embedding_text(row) for row in db.query(Job.title, Job.company, Job.location, Job.description)]
+    if not texts:
+        return False
+    backend.fit_idf(texts)
+    # The vector space changed, stored job vectors are reloaded (and rebuilt) under the new name
+    with _job_matrix_lock, _ann_lock:
+        _job_matrix = None
+        _ann_index = None
+    return True
+
+
+def backfill_job_embeddings(db, batch_size: int = 1000) -> int:
+    """Embed every stored job that has no row in the matrix yet"""
+    fit_local_embeddings(db)
+    matrix = get_job_matrix()
+    missing_ids = [job_id for (job_id,) in db.query(Job.id) if job_id not in matrix]
+    added = 0
+    for start in range(0, len(missing_ids), batch_size):
+        jobs = db.query(Job).filter(Job.id.in_(missing_ids[start:start + batch_size])).all()
+        embedded = embed_jobs(jobs)
+        if not embedded:
+            break
+        added += embedded
+    return added
+
+
+# Jobs a request found unembedded, embedded one batch at a time off the request path
+_embed_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-embedding")
+_queued_ids: Set[int] = set()
+_queued_lock = threading.Lock()
+
+
+def _embed_queued(batch_size: int = 1000) -> None:
+    with _queued_lock:
+        job_ids = list(_queued_ids)
+    db = SessionLocal()
+    try:
+        for start in range(0, len(job_ids), batch_size):
+            embed_jobs(db.query(Job).filter(Job.id.in_(job_ids[start:start + batch_size])).all())
+    except Exception as e:
+        print("[embeddings] background job embedding failed, reason:", repr(e))
+    finally:
+        db.close()
+        # Dropped only now, so a request meanwhile does not queue them twice
+        with _queued_lock:
+            _queued_ids.difference_update(job_ids)
+
+
+def queue_job_embeddings(job_ids: Iterable[int]) -> None:
+    """Embed jobs missing from the matrix in the background"""
+    with _queued_lock:
+        new_ids = set(job_ids) - _queued_ids
+        _queued_ids.update(new_ids)
+    if new_ids:
+        _embed_executor.submit(_embed_queued)
+
+
+def semantic_scores_for(user, job_ids: List[int]) -> Optional[Dict[int, float]]:
+    """0-100 semantic score of the jobs already in the matrix for the user; the
+    others are queued for embedding and left out until they are in"""
+    text = user_embedding_text(user)
+    if not text or not job_ids:
+        return None
+    matrix = get_job_matrix()
+    missing = [job_id for job_id in job_ids if job_id not in matrix]
+    if missing:
+        queue_job_embeddings(missing)
+    rows = matrix.positions(job_ids)
+    if not len(rows):
+        return None
+    try:
+        query = np.asarray(get_embedding(text), dtype=np.float32)
+    except RuntimeError as e:
+        print("[embeddings] semantic scores unavailable, reason:", repr(e))
+        return None
+    return dict(zip(matrix.job_ids[rows].tolist(), matrix.scores(query, rows).tolist()))
+
+
+def semantic_top_k(user, limit: int, after: Optional[Tuple[float, int]] = None) -> Optional[List[Tuple[int, float]]]:
+    """(job_id, 0-100 score) page ranked by resume/job embedding similarity, or None if unavailable.
+
+    Small catalogs are scanned exactly. With an ANN index, its candidates are
+    re-scored exactly from the matrix, and the candidate pool grows until the
+    page past the cursor is full.
+    """
+    matrix = get_job_matrix()
+    text = user_embedding_text(user)
+    if not matrix.live_count() or not text:
+        return None
+    try:
+        query = np.asarray(get_embedding(text), dtype=np.float32)
+    except RuntimeError as e:
+        print("[embeddings] semantic ranking unavailable, reason:", repr(e))
+        return None
+
+    index = get_ann_index()
+    if index is None:
+        return top_k(matrix, matrix.scores(query), limit, after, np.flatnonzero(matrix.alive))
+
+    query = matrix.prepare_query(query)
+    k = limit * ANN_CANDIDATES
+    while True:
+        candidate_ids, _ = index.search(query, k)
+        rows = matrix.positions(candidate_ids)
+        candidates = CandidateSet(matrix.job_ids[rows])
+        ranked = top_k(candidates, matrix.scores(query, rows), limit, after)
+        if len(ranked) == limit or len(candidate_ids) < k:
+            return ranked
+        k *= 4
@@ -0,0 +1,48 @@
+# [file name]: job_expiry.py - removal of expired job postings
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from app.models import Application, Job, JobMatch, SavedJob, User
+from app.services.batch_scorer import invalidate_job_catalog
+from app.services.job_dedupe import invalidate_dedupe_index
+from app.services.job_embeddings import remove_job_embeddings
+
+# Jobs older than this are expired at startup and by POST /jobs/expire (0 keeps everything)
+JOB_MAX_AGE_DAYS = int(os.getenv("JOB_MAX_AGE_DAYS", "0"))
+
+
+def delete_jobs(db, job_ids: Iterable[int]) -> int:
+    """Delete jobs with their materialized matches, embeddings and index entries"""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return 0
+
+    # Users who lose a materialized match get their top N rebuilt on the next read
+    affected_users = db.query(JobMatch.user_id).filter(JobMatch.job_id.in_(job_ids)).distinct()
+    db.query(User).filter(User.id.in_(affected_users.scalar_subquery())).update(
+        {User.matches_profile_hash: None}, synchronize_session=False
+    )
+    db.query(JobMatch).filter(JobMatch.job_id.in_(job_ids)).delete(synchronize_session=False)
+    deleted = db.query(Job).filter(Job.id.in_(job_ids)).delete(synchronize_session=False)
+    db.commit()
+
+    invalidate_job_catalog()
+    invalidate_dedupe_index()
+    remove_job_embeddings(job_ids)
+    return deleted
+
+
+def expire_jobs(db, max_age_days: Optional[int] = None) -> int:
+    """Delete jobs older than max_age_days that nobody has applied to or saved"""
+    max_age_days = JOB_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    if max_age_days <= 0:
+        return 0
+
+    cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    expired = db.query(Job.id).filter(
+        Job.created_at < cutoff,
+        Job.id.notin_(db.query(Application.job_id).filter(Application.job_id.isnot(None))),
+        Job.id.notin_(db.query(SavedJob.job_id).filter(SavedJob.job_id.isnot(None)))
+    )
+    return delete_jobs(db, [job_id for (job_id,) in expired])
@@ -0,0 +1,150 @@
+# [file name]: job_features.py - precomputed job match features
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.job_text import description_text, make_search_text
+from app.services.salary_parser import MAX_ANNUAL_SALARY, MIN_ANNUAL_SALARY, parse_salary
+from app.services.skills import skill_mask
+
+# Bump when the taxonomy or any normalization below changes so stored rows get recomputed
+FEATURES_VERSION = 5
+
+LEVEL_UNKNOWN = 0
+LEVEL_JUNIOR = 1
+LEVEL_MID = 2
+LEVEL_SENIOR = 3
+LEVEL_LEAD = 4
+
+LEVEL_CODES = {
+    'junior': LEVEL_JUNIOR,
+    'mid': LEVEL_MID,
+    'senior': LEVEL_SENIOR,
+    'lead': LEVEL_LEAD,
+}
+
+REMOTE_WORDS = ('remote', 'anywhere', 'global')
+
+
+@dataclass(frozen=True)
+class JobFeatures:
+    """Everything the matcher needs to know about a job"""
+    skill_mask: int
+    level_code: int
+    location_key: str
+    is_remote: bool
+    salary_min: Optional[int]
+    salary_max: Optional[int]
+
+
+def normalize_level(level: Optional[str]) -> int:
+    """Map free-text levels like 'Mid Level' or 'Sr. Engineer' to a level code"""
+    level_lower = (level or "").lower()
+    if any(word in level_lower for word in ['lead', 'principal', 'staff']):
+        return LEVEL_LEAD
+    if 'senior' in level_lower or re.search(r'\bsr\b', level_lower):
+        return LEVEL_SENIOR
+    if any(word in level_lower for word in ['mid', 'intermediate']):
+        return LEVEL_MID
+    if any(word in level_lower for word in ['junior', 'entry', 'associate', 'intern']):
+        return LEVEL_JUNIOR
+    return LEVEL_UNKNOWN
+
+
+def normalize_location(location: Optional[str]) -> Tuple[str, bool]:
+    """Lowercased location plus whether it is open to remote candidates"""
+    location_key = " ".join((location or "").lower().split())
+    return location_key, any(word in location_key for word in REMOTE_WORDS)
+
+
+def parse_salary_range(salary: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Annual USD (min, max) of a free-text salary, see salary_parser.parse_salary"""
+    parsed = parse_salary(salary)
+    if parsed is None:
+        return None, None
+    return parsed.salary_min, parsed.salary_max
+
+
+def _salary_bounds(job_data: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    """The parsed salary text, else the numeric bounds a source gave (0 means none)"""
+    salary_min, salary_max = parse_salary_range(job_data.get("salary"))
+    if salary_min is not None or salary_max is not None:
+        return salary_min, salary_max
+
+    bounds = [int(value) for value in (job_data.get("salary_min"), job_data.get("salary_max"))
+              if value and MIN_ANNUAL_SALARY <= value <= MAX_ANNUAL_SALARY]
+    if not bounds:
+        return None, None
+    return min(bounds), max(bounds)
+
+
+def compute_job_features(job_data: Dict[str, Any]) -> JobFeatures:
+    """Derive match features from an ingested job dict"""
+    location_key, is_remote = normalize_location(job_data.get("location"))
+
+    salary_min, salary_max = _salary_bounds(job_data)
+
+    return JobFeatures(
+        # The whole description, not the stored search_text, which is cut short
+        skill_mask=skill_mask(description_text(job_data.get("description"))),
+        level_code=normalize_level(job_data.get("level")),
+        location_key=location_key,
+        is_remote=is_remote,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+
+
+def _job_as_dict(job) -> Dict[str, Any]:
+    return {
+        "description": getattr(job, 'description', ""),
+        "level": getattr(job, 'level', ""),
+        "location": getattr(job, 'location', ""),
+        "salary": getattr(job, 'salary', None),
+        "salary_min": getattr(job, 'salary_min', None),
+        "salary_max": getattr(job, 'salary_max', None),
+    }
+
+
+def apply_job_features(job) -> None:
+    """Compute and store the feature record, and the search_text for keyword search, on a Job row"""
+    job.search_text = make_search_text(job.description)
+    features = compute_job_features(_job_as_dict(job))
+    job.skill_mask = features.skill_mask
+    job.level_code = features.level_code
+    job.location_key = features.location_key
+    job.is_remote = features.is_remote
+    job.salary_min = features.salary_min
+    job.salary_max = features.salary_max
+    job.features_version = FEATURES_VERSION
+
+
+def get_job_features(job) -> JobFeatures:
+    """Read the stored feature record, computing it only for rows that predate it"""
+    if isinstance(job, JobFeatures):
+        return job
+    if getattr(job, 'features_version', None) != FEATURES_VERSION:
+        return compute_job_features(_job_as_dict(job))
+
+    return JobFeatures(
+        skill_mask=job.skill_mask or 0,
+        level_code=job.level_code or LEVEL_UNKNOWN,
+        location_key=job.location_key or "",
+        is_remote=bool(job.is_remote),
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+    )
+
+
+def backfill_job_features(db) -> int:
+    """Populate features for jobs stored before the current FEATURES_VERSION"""
+    from app.models import Job
+
+    stale = db.query(Job).filter(
+        (Job.features_version.is_(None)) | (Job.features_version != FEATURES_VERSION)
+    ).all()
+    for job in stale:
+        apply_job_features(job)
+    if stale:
+        db.commit()
+    return len(stale)
@@ -0,0 +1,131 @@
+# [file name]: job_import.py - batched insertion of streamed source jobs
+import os
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.models import Job, SourceCursor, SourceWatermark
+from app.services.batch_scorer import invalidate_job_catalog
+from app.services.job_dedupe import (
+    ContentSignature, apply_job_signature, get_dedupe_index, invalidate_dedupe_index, job_signature
+)
+from app.services.job_embeddings import embed_job_texts, job_embedding_text
+from app.services.job_features import apply_job_features, get_job_features
+from app.services.recommendations import add_jobs_to_matches
+
+# Jobs checked, inserted and committed together while an import streams in
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+
+def build_job(job_data: dict, signature: Optional[ContentSignature] = None) -> Job:
+    """Create a Job row from a normalized source dict, with its match features and content signature"""
+    job = Job(
+        external_id=job_data.get("external_id"),
+        title=job_data.get("title", ""),
+        company=job_data.get("company", ""),
+        description=job_data.get("description", ""),
+        location=job_data.get("location", "Remote"),
+        apply_url=job_data.get("apply_url", ""),
+        job_type=job_data.get("job_type", "Full-time"),
+        level=job_data.get("level", "Mid Level"),
+        salary_min=job_data.get("salary_min"),
+        salary_max=job_data.get("salary_max"),
+        salary=job_data.get("salary"),
+        score=75.0
+    )
+    apply_job_features(job)
+    apply_job_signature(job, signature or job_signature(job_data))
+    return job
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Consecutive lists of up to size items"""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_job_stream(db, jobs: Iterable[Dict], batch_size: int = IMPORT_BATCH_SIZE, embed: bool = True,
+                      on_batch: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+    """Insert the jobs of a stream that are not stored yet, one batch at a time.
+
+    Only one batch is held in memory. Each job is looked up in the dedupe
+    index (same external_id or content fingerprint, or a near-duplicate of a
+    stored posting), so the check costs the same however many jobs are
+    stored. New jobs are committed, scored into materialized matches and,
+    with embed, embedded. on_batch gets the running counts after every batch.
+    """
+    index = get_dedupe_index(db)
+    counts = {"found": 0, "imported": 0, "near_duplicates": 0}
+    for batch in batched(jobs, batch_size):
+        counts["found"] += len(batch)
+        new_jobs = []
+        for job_data in batch:
+            signature = job_signature(job_data)
+            duplicate = index.match(job_data.get("external_id"), signature)
+            if duplicate is None:
+                index.add(job_data.get("external_id"), signature)
+                new_jobs.append(build_job(job_data, signature))
+            elif duplicate == "near_duplicate":
+                counts["near_duplicates"] += 1
+        if new_jobs:
+            try:
+                db.add_all(new_jobs)
+                db.flush()
+                # Read what scoring and embedding need while the rows are loaded;
+                # the commit expires them and each access would reload a row
+                features = [(job.id, get_job_features(job)) for job in new_jobs]
+                texts = {job.id: job_embedding_text(job) for job in new_jobs} if embed else {}
+                db.commit()
+            except Exception:
+                # The index already holds the batch's jobs
+                db.rollback()
+                invalidate_dedupe_index()
+                raise
+            invalidate_job_catalog()
+            add_jobs_to_matches(db, features)
+            if embed:
+                embed_job_texts(texts)
+            counts["imported"] += len(new_jobs)
+        if on_batch is not None:
+            on_batch(dict(counts))
+    return counts
+
+
+def load_watermarks(db) -> Dict[str, float]:
+    """Stored sync watermark of every source that has one"""
+    return {row.source: float(row.value) for row in db.query(SourceWatermark)}
+
+
+def load_resume_points(db) -> Dict[str, Dict]:
+    """Where each source whose last sync was cut short should pick up"""
+    return {
+        row.source: {"page": row.page, "newest": float(row.newest) if row.newest is not None else None}
+        for row in db.query(SourceCursor)
+    }
+
+
+def save_watermarks(db, report: Dict[str, Dict]) -> int:
+    """Store the new watermarks of the sources a completed import reports, and
+    the resume points of those cut short; call only once every job of the
+    import is committed"""
+    saved = 0
+    for source, info in report.items():
+        if info.get("status") == "ok":
+            db.query(SourceCursor).filter(SourceCursor.source == source).delete(synchronize_session=False)
+            if info.get("watermark") is None:
+                continue
+            db.merge(SourceWatermark(source=source, value=repr(float(info["watermark"])), updated_at=datetime.utcnow()))
+            saved += 1
+        elif info.get("resume") is not None:
+            resume = info["resume"]
+            db.merge(SourceCursor(
+                source=source, page=resume["page"],
+                newest=repr(float(resume["newest"])) if resume.get("newest") is not None else None,
+                updated_at=datetime.utcnow()
+            ))
+    db.commit()
+    return saved
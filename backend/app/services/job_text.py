@@ -0,0 +1,44 @@
+# [file name]: job_text.py - ingest-time cleanup of job description markup
+import html
+import os
+import re
+from typing import Optional
+
+# Stored search_text is cut to about this many characters
+SEARCH_TEXT_MAX_CHARS = int(os.getenv("SEARCH_TEXT_MAX_CHARS", "4000"))
+
+# Tags that end a line of text, the rest are dropped in place
+_BLOCK_TAG = re.compile(r"<\s*/?\s*(?:br|p|div|li|ul|ol|h[1-6]|tr|table|section|blockquote|pre)\b[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]*>")
+_BLANKS = re.compile(r"[ \t\r\f\v\u00a0]+")
+
+
+def html_to_text(markup: Optional[str]) -> str:
+    """Plain text of an HTML fragment: tags removed, entities decoded,
+    whitespace collapsed and one line per block"""
+    text = _TAG.sub(" ", _BLOCK_TAG.sub("\n", markup or ""))
+    lines = (_BLANKS.sub(" ", line).strip() for line in html.unescape(text).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def description_text(description: Optional[str]) -> str:
+    """Lowercased plain text of a whole description"""
+    return html_to_text(description).lower()
+
+
+def make_search_text(description: Optional[str]) -> str:
+    """description_text cut at a word boundary near SEARCH_TEXT_MAX_CHARS"""
+    text = description_text(description)
+    if len(text) <= SEARCH_TEXT_MAX_CHARS:
+        return text
+    cut = text[:SEARCH_TEXT_MAX_CHARS]
+    boundary = max(cut.rfind(" "), cut.rfind("\n"))
+    return cut[:boundary] if boundary > 0 else cut
+
+
+def job_search_text(job) -> str:
+    """The search_text stored on a job, derived on the fly for rows that predate it"""
+    search_text = getattr(job, 'search_text', None)
+    if search_text is None:
+        return make_search_text(getattr(job, 'description', None))
+    return search_text
@@ -0,0 +1,115 @@
+# [file name]: json_stream.py - incremental parsing of large JSON arrays
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}:"
+
+
+class _Reader:
+    """Text buffer over a stream of byte chunks, refilled only as parsing needs it"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk's text; False once the stream is exhausted"""
+        # Consumed text is dropped, so the buffer only ever holds about one element
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        while not self.eof:
+            try:
+                text = self._decode(next(self._chunks))
+            except StopIteration:
+                text = self._decode(b"", final=True)
+                self.eof = True
+            if text:
+                self.buf += text
+                return True
+        return False
+
+    def drain(self) -> None:
+        """Read the rest of the stream unparsed, so its producer runs to completion"""
+        for _ in self._chunks:
+            pass
+        self.eof = True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it, "" at the end"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number or literal cut off by the chunk boundary ("1." of "1.5") decodes as a
+            # shorter one; it is only complete once a delimiter follows
+            complete = isinstance(value, (dict, list, str)) or (end < len(self.buf) and self.buf[end] in _DELIMITERS)
+            if not complete and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: Optional[str] = None) -> Iterator[Any]:
+    """Elements of a JSON array, decoded one at a time from a byte stream.
+
+    With key, the array is that member of a top-level object (members before
+    it are decoded and skipped); without, the document is the array. A
+    document without the key yields nothing. Whatever follows the array is
+    read but not parsed, so the chunk producer always runs to its end.
+    """
+    reader = _Reader(chunks)
+    if key is not None:
+        reader.expect("{")
+        while True:
+            char = reader.peek()
+            if char == "}":
+                reader.drain()
+                return
+            if char == ",":
+                reader.pos += 1
+                continue
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value()
+
+    reader.expect("[")
+    while True:
+        char = reader.peek()
+        if char == "]":
+            reader.drain()
+            return
+        if char == ",":
+            reader.pos += 1
+            continue
+        if not char:
+            raise ValueError("Unterminated JSON array")
+        yield reader.value()
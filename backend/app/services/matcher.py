@@ -1,128 +1,155 @@
 # [file name]: matcher.py
-import re
-from typing import Dict, Any, List
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+
+from app.services.job_features import LEVEL_CODES, LEVEL_LEAD, LEVEL_SENIOR, get_job_features
+from app.services.skills import SKILL_INDEX, extract_skills, mask_from_skills, skill_mask
+
+# Skill weights (higher = more important)
+SKILL_WEIGHTS = {
+    'aws': 10, 'azure': 10, 'gcp': 10,
+    'terraform': 9, 'kubernetes': 9, 'docker': 8,
+    'devops': 8, 'sre': 8, 'ci/cd': 7,
+    'python': 6, 'java': 5, 'linux': 5,
+    'ansible': 6, 'puppet': 6, 'chef': 6,
+    'jenkins': 5, 'git': 4, 'bash': 4,
+    'javascript': 4, 'typescript': 4, 'react': 3,
+    'node': 4, 'microservices': 5, 'api': 4,
+    'sql': 4
+}
+
+SCORED_SKILLS_MASK = mask_from_skills(SKILL_WEIGHTS)
+_SKILL_BIT_WEIGHTS = [(1 << SKILL_INDEX[skill], weight) for skill, weight in SKILL_WEIGHTS.items()]
 
 def extract_skills_from_text(text: str) -> List[str]:
-    """Extract technical skills from text using pattern matching"""
-    if not text:
-        return []
-    
-    text_lower = text.lower()
+    """Extract technical skills from text using the shared skill taxonomy"""
+    return [skill for skill in extract_skills(text) if skill in SKILL_WEIGHTS]
+
+# In-memory profile cache, bounded so a burst of one-off users cannot grow it forever
+PROFILE_CACHE_SIZE = 10000
+
+@dataclass(frozen=True)
+class UserMatchProfile:
+    """User side of the match, parsed once per profile version"""
+    skill_mask: int
+    levels: FrozenSet[int]
+    locations: Tuple[str, ...]
+    wants_remote: bool
+    salary_floor: Optional[int]
+
+_profile_cache: "OrderedDict[Any, Tuple[str, UserMatchProfile]]" = OrderedDict()
+_profile_lock = threading.Lock()
+
+def profile_content_hash(user) -> str:
+    """Hash of every profile field that affects matching"""
+    parts = [
+        getattr(user, 'resume_text', None) or "",
+        getattr(user, 'skills', None) or "",
+        getattr(user, 'preferred_locations', None) or "",
+        str(getattr(user, 'desired_salary_min', None) or ""),
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+def build_user_match_profile(user) -> UserMatchProfile:
+    """Parse resume, skills and preferences into a UserMatchProfile"""
+    user_resume = getattr(user, 'resume_text', None) or ""
+    user_skills_text = getattr(user, 'skills', None) or ""
+    preferred_locations = getattr(user, 'preferred_locations', None) or ""
+    
+    locations = tuple(loc.strip().lower() for loc in preferred_locations.split(',')) if preferred_locations else ()
+    
+    return UserMatchProfile(
+        skill_mask=skill_mask(user_resume) | skill_mask(user_skills_text),
+        levels=frozenset(LEVEL_CODES[level] for level in extract_experience_level(user_resume)),
+        locations=locations,
+        wants_remote=any('remote' in loc for loc in locations),
+        salary_floor=getattr(user, 'desired_salary_min', None) or None,
+    )
+
+def get_user_match_profile(user) -> UserMatchProfile:
+    """Cached UserMatchProfile, rebuilt whenever the profile content changes"""
+    user_id = getattr(user, 'id', None)
+    content_hash = profile_content_hash(user)
+    
+    with _profile_lock:
+        cached = _profile_cache.get(user_id)
+        if cached and cached[0] == content_hash:
+            _profile_cache.move_to_end(user_id)
+            return cached[1]
+    
+    profile = build_user_match_profile(user)
+    if user_id is not None:
+        with _profile_lock:
+            _profile_cache[user_id] = (content_hash, profile)
+            _profile_cache.move_to_end(user_id)
+            while len(_profile_cache) > PROFILE_CACHE_SIZE:
+                _profile_cache.popitem(last=False)
+    return profile
+
+def invalidate_user_match_profile(user_id: int) -> None:
+    """Drop the cached profile after the user's resume, skills or preferences change"""
+    with _profile_lock:
+        _profile_cache.pop(user_id, None)
+
+def skill_mask_weight(mask: int) -> int:
+    """Total weight of the scored skills set in a skill bitmask"""
+    return sum(weight for bit, weight in _SKILL_BIT_WEIGHTS if mask & bit)
+
+def calculate_advanced_match_score(job, user, profile: Optional[UserMatchProfile] = None) -> float:
+    """Advanced matching with skill weights and priorities.
     
-    # Comprehensive skill patterns
-    skill_patterns = {
-        'aws': r'\b(aws|amazon web services)\b',
-        'azure': r'\b(azure|microsoft azure)\b', 
-        'gcp': r'\b(gcp|google cloud|gcp platform)\b',
-        'terraform': r'\b(terraform)\b',
-        'kubernetes': r'\b(kubernetes|k8s)\b',
-        'docker': r'\b(docker|container)\b',
-        'python': r'\b(python)\b',
-        'java': r'\b(java)\b',
-        'javascript': r'\b(javascript|js)\b',
-        'typescript': r'\b(typescript|ts)\b',
-        'react': r'\b(react)\b',
-        'node': r'\b(node|nodejs|node.js)\b',
-        'linux': r'\b(linux|unix)\b',
-        'bash': r'\b(bash|shell scripting)\b',
-        'git': r'\b(git)\b',
-        'jenkins': r'\b(jenkins)\b',
-        'ansible': r'\b(ansible)\b',
-        'puppet': r'\b(puppet)\b',
-        'chef': r'\b(chef)\b',
-        'ci/cd': r'\b(ci/cd|continuous integration|continuous deployment)\b',
-        'devops': r'\b(devops)\b',
-        'sre': r'\b(sre|site reliability)\b',
-        'microservices': r'\b(microservices)\b',
-        'api': r'\b(api|rest api|graphql)\b',
-        'sql': r'\b(sql|mysql|postgresql|mongodb|redis)\b'
-    }
-    
-    skills = []
-    for skill, pattern in skill_patterns.items():
-        if re.search(pattern, text_lower):
-            skills.append(skill)
-    
-    return skills
-
-def calculate_advanced_match_score(job, user) -> float:
-    """Advanced matching with skill weights and priorities"""
+    Pass a profile from get_user_match_profile() when scoring many jobs for
+    the same user so the profile is looked up once per request.
+    """
     if not user:
         return 75.0
     
     score = 0
     max_score = 100
     
-    # Extract skills from job description and user profile
-    job_desc = job.description if hasattr(job, 'description') else ""
-    user_resume = user.resume_text if hasattr(user, 'resume_text') else ""
-    user_skills_text = user.skills if hasattr(user, 'skills') else ""
-    
-    job_skills = extract_skills_from_text(job_desc)
-    user_skills = extract_skills_from_text(user_resume) + extract_skills_from_text(user_skills_text)
-    
-    # Remove duplicates
-    user_skills = list(set(user_skills))
-    
-    # Skill weights (higher = more important)
-    skill_weights = {
-        'aws': 10, 'azure': 10, 'gcp': 10,
-        'terraform': 9, 'kubernetes': 9, 'docker': 8,
-        'devops': 8, 'sre': 8, 'ci/cd': 7,
-        'python': 6, 'java': 5, 'linux': 5,
-        'ansible': 6, 'puppet': 6, 'chef': 6,
-        'jenkins': 5, 'git': 4, 'bash': 4,
-        'javascript': 4, 'typescript': 4, 'react': 3,
-        'node': 4, 'microservices': 5, 'api': 4,
-        'sql': 4
-    }
-    
-    # Calculate skill match score (50 points max)
-    skill_score = 0
-    matched_skills = []
-    
-    for skill in job_skills:
-        if skill in user_skills:
-            weight = skill_weights.get(skill, 3)
-            skill_score += weight
-            matched_skills.append(skill)
-    
-    # Normalize skill score to 50 points
-    max_possible_skill_score = sum(skill_weights.get(skill, 3) for skill in job_skills)
+    # Job side comes from the feature record stored at ingestion,
+    # user side from the cached match profile
+    features = get_job_features(job)
+    if profile is None:
+        profile = get_user_match_profile(user)
+    
+    job_mask = features.skill_mask & SCORED_SKILLS_MASK
+    
+    # Calculate skill match score (50 points max), normalized to the job's skills
+    max_possible_skill_score = skill_mask_weight(job_mask)
     if max_possible_skill_score > 0:
+        skill_score = skill_mask_weight(job_mask & profile.skill_mask)
         score += min((skill_score / max_possible_skill_score) * 50, 50)
     else:
         score += 25  # Default score if no skills detected
     
     # Experience level matching (15 points)
-    job_level = (getattr(job, 'level', '') or "").lower()
-    user_experience = extract_experience_level(user_resume)
-    
-    if job_level in user_experience:
+    if features.level_code in profile.levels:
         score += 15
-    elif any(level in user_experience for level in ['senior', 'lead']) and job_level in ['senior', 'lead']:
+    elif features.level_code == LEVEL_LEAD and LEVEL_SENIOR in profile.levels:
         score += 12
-    elif any(level in user_experience for level in ['mid']) and job_level in ['mid']:
-        score += 10
     
     # Location matching (20 points)
-    if hasattr(user, 'preferred_locations') and user.preferred_locations and hasattr(job, 'location') and job.location:
-        user_locations = [loc.strip().lower() for loc in user.preferred_locations.split(',')]
-        job_location = job.location.lower()
+    if profile.locations and features.location_key:
+        job_location = features.location_key
         
-        if any(loc in job_location for loc in user_locations):
+        if any(loc in job_location for loc in profile.locations):
             score += 20
-        elif 'remote' in job_location and any('remote' in loc for loc in user_locations):
+        elif 'remote' in job_location and profile.wants_remote:
             score += 20
-        elif any(user_loc in job_location for user_loc in ['remote', 'anywhere', 'global']):
+        elif features.is_remote:
             score += 15
     
     # Salary matching (15 points)
-    if hasattr(user, 'desired_salary_min') and user.desired_salary_min and hasattr(job, 'salary_max') and job.salary_max:
-        if job.salary_max >= user.desired_salary_min:
-            salary_ratio = min(job.salary_max / user.desired_salary_min, 2.0)
+    if profile.salary_floor and (features.salary_max or features.salary_min):
+        if features.salary_max and features.salary_max >= profile.salary_floor:
+            salary_ratio = min(features.salary_max / profile.salary_floor, 2.0)
             score += min(15 * salary_ratio, 15)
-        elif hasattr(job, 'salary_min') and job.salary_min and job.salary_min >= user.desired_salary_min:
+        elif features.salary_min and features.salary_min >= profile.salary_floor:
+            # Open-ended ("$100k+") or inconsistent ranges that still clear the floor
             score += 10
     
     return min(score, max_score)
@@ -144,9 +171,9 @@ def extract_experience_level(text: str) -> List[str]:
     
     return levels if levels else ['mid']  # Default to mid-level
 
-def calculate_match_score(job, user):
+def calculate_match_score(job, user, profile: Optional[UserMatchProfile] = None):
     """Main match score calculation - uses advanced matching"""
-    return calculate_advanced_match_score(job, user)
+    return calculate_advanced_match_score(job, user, profile)
 
 # Keep the original function for backward compatibility
 def compute_match_score(resume_text: str, job_description: str, job_title: str) -> float:
@@ -0,0 +1,203 @@
+# [file name]: parallel_scorer.py - multi-process catalog scoring over shared memory
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.batch_scorer import JobCatalog, score_columns
+from app.services.matcher import UserMatchProfile
+
+# Worker processes used for parallel scoring, defaults to one per core
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "0")) or os.cpu_count() or 1
+
+# Jobs per task; small enough to balance across workers, big enough to amortize task overhead
+SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "50000"))
+
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def _to_shared(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, ArraySpec]:
+    """Copy an array into a new shared memory block"""
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(spec: ArraySpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+# Worker-side state: the catalog columns the process is attached to, swapped
+# when a task arrives for another catalog
+_worker_specs: Dict[str, ArraySpec] = {}
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_columns: Dict[str, np.ndarray] = {}
+
+
+def _attach_columns(specs: Dict[str, ArraySpec]) -> None:
+    global _worker_specs
+    if specs == _worker_specs:
+        return
+    _worker_columns.clear()
+    for block in _worker_blocks:
+        block.close()
+    _worker_blocks.clear()
+    for name, spec in specs.items():
+        block, array = _attach(spec)
+        _worker_blocks.append(block)
+        _worker_columns[name] = array
+    _worker_specs = dict(specs)
+
+
+def _score_chunk(specs: Dict[str, ArraySpec], start: int, stop: int, terms_list: list, out_spec: ArraySpec) -> None:
+    """Score jobs [start, stop) for every profile and write into the shared output matrix"""
+    _attach_columns(specs)
+    out_block, out = _attach(out_spec)
+    try:
+        columns = {name: array[start:stop] for name, array in _worker_columns.items()}
+        for row, terms in enumerate(terms_list):
+            out[row, start:stop] = 75.0 if terms is None else score_columns(columns, terms)
+    finally:
+        del out
+        out_block.close()
+
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+
+class ParallelScorer:
+    """Partitions a JobCatalog across a process pool.
+
+    The catalog columns live in shared memory, so workers attach to them once
+    per catalog instead of having arrays pickled into every task. Results are
+    written into a shared output matrix as well.
+
+    A scorer given a pool shares it (the process-wide one outlives catalog
+    changes, so a new catalog does not spawn new workers); otherwise it owns
+    one. close() waits for calls in flight before releasing anything.
+    """
+
+    def __init__(self, catalog: JobCatalog, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                 pool: Optional[ProcessPoolExecutor] = None):
+        self.catalog = catalog
+        self.workers = workers or SCORING_WORKERS
+        self.chunk_size = chunk_size or SCORING_CHUNK_SIZE
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._specs: Dict[str, ArraySpec] = {}
+        self._in_flight = 0
+        self._closing = False
+        self._idle = threading.Condition()
+
+        for name, array in catalog.columns().items():
+            block, spec = _to_shared(array)
+            self._blocks.append(block)
+            self._specs[name] = spec
+
+        self._owns_pool = pool is None
+        self._pool = pool or _new_pool(self.workers)
+
+    def score_many(self, profiles: Sequence[Optional[UserMatchProfile]]) -> np.ndarray:
+        """(len(profiles), len(catalog)) score matrix, same values as catalog.score()"""
+        with self._idle:
+            if self._closing:
+                raise RuntimeError("ParallelScorer is closed")
+            self._in_flight += 1
+        try:
+            return self._score_many(profiles)
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def _score_many(self, profiles: Sequence[Optional[UserMatchProfile]]) -> np.ndarray:
+        n_jobs = len(self.catalog)
+        terms_list = [None if profile is None else self.catalog.profile_terms(profile) for profile in profiles]
+        out_block, out_spec = _to_shared(np.zeros((len(profiles), n_jobs)))
+        try:
+            # At least one chunk per worker so every core gets a share of the catalog
+            chunk_size = max(1, min(self.chunk_size, -(-n_jobs // self.workers)))
+            futures = [
+                self._pool.submit(_score_chunk, self._specs, start, min(start + chunk_size, n_jobs), terms_list, out_spec)
+                for start in range(0, n_jobs, chunk_size)
+            ]
+            for future in futures:
+                future.result()
+
+            # Read through this process's own handle; the view must be gone before close()
+            _, shape, dtype = out_spec
+            out = np.ndarray(shape, dtype=np.dtype(dtype), buffer=out_block.buf)
+            scores = out.copy()
+            del out
+            return scores
+        finally:
+            out_block.close()
+            out_block.unlink()
+
+    def close(self) -> None:
+        """Refuse new calls, wait for those in flight, then free the shared columns (and an owned pool)"""
+        with self._idle:
+            self._closing = True
+            self._idle.wait_for(lambda: self._in_flight == 0)
+            blocks, self._blocks = self._blocks, []
+        if self._owns_pool:
+            self._pool.shutdown(wait=True)
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_scorer: Optional[ParallelScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_parallel_scorer(catalog: JobCatalog) -> ParallelScorer:
+    """Process-wide scorer for the current catalog; the worker pool is shared by every catalog's scorer"""
+    global _pool, _scorer
+    with _scorer_lock:
+        if _scorer is None or _scorer.catalog is not catalog:
+            if _pool is None:
+                _pool = _new_pool(SCORING_WORKERS)
+            retired = _scorer
+            _scorer = ParallelScorer(catalog, pool=_pool)
+            if retired is not None:
+                # Calls still scoring the old catalog finish first
+                threading.Thread(target=retired.close, daemon=True).start()
+        return _scorer
+
+
+def parallel_score_many(catalog: JobCatalog, profiles: Sequence[Optional[UserMatchProfile]]) -> np.ndarray:
+    """score_many on the process-wide scorer for the catalog.
+
+    A scorer retired by a catalog change between fetching it and calling it
+    refuses the call, which is then retried on the current one.
+    """
+    while True:
+        scorer = get_parallel_scorer(catalog)
+        try:
+            return scorer.score_many(profiles)
+        except RuntimeError:
+            if not scorer._closing:
+                raise
+
+
+@atexit.register
+def _close_scorer() -> None:
+    if _scorer is not None:
+        _scorer.close()
+    if _pool is not None:
+        _pool.shutdown(wait=True)
@@ -0,0 +1,63 @@
+# [file name]: quantization.py - compact embedding formats and scoring on them
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+# How job embeddings are stored: "float32", or "int8" (one byte per dimension
+# plus a float32 scale per row)
+EMBEDDING_STORAGE = os.getenv("EMBEDDING_STORAGE", "float32")
+
+# Keep only the first N dimensions (0 keeps all). text-embedding-3 vectors are
+# trained so that prefixes remain usable embeddings once renormalized.
+EMBEDDING_DIMS = int(os.getenv("EMBEDDING_DIMS", "0"))
+
+STORAGE_DTYPES = {"float32": np.float32, "int8": np.int8}
+
+# Size of the float32 block int8 rows are widened into while scoring; small
+# enough to stay in cache between the conversion and the product
+SCORE_BLOCK_BYTES = 1 << 20
+
+
+def truncate(vectors, dims: int = 0) -> np.ndarray:
+    """float32 unit rows cut to the first dims dimensions (0 keeps all)"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    if dims and dims < vectors.shape[1]:
+        vectors = vectors[:, :dims]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def quantize_int8(vectors) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 codes and the float32 scale that maps them back"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(stored: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """float32 rows from stored data (scales is None for float32 storage)"""
+    if scales is None:
+        return np.asarray(stored, dtype=np.float32)
+    return stored.astype(np.float32) * scales[:, None]
+
+
+def dot_scores(stored: np.ndarray, scales: Optional[np.ndarray], query: np.ndarray) -> np.ndarray:
+    """Inner product of every stored row with a float32 query, as float64.
+
+    float32 rows take one matrix-vector product. int8 rows are widened one
+    block at a time and the per-row scale is applied to the block's products,
+    so the full-precision matrix never exists in memory.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    if scales is None:
+        return (stored @ query).astype(np.float64)
+    out = np.empty(len(stored), dtype=np.float64)
+    block_rows = max(1, SCORE_BLOCK_BYTES // (4 * stored.shape[1]))
+    for start in range(0, len(stored), block_rows):
+        block = stored[start:start + block_rows]
+        out[start:start + len(block)] = (block.astype(np.float32) @ query) * scales[start:start + len(block)]
+    return out
@@ -0,0 +1,105 @@
+# [file name]: recommendations.py - materialized per-user recommendations
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+
+from app.models import JobMatch, User
+from app.services.batch_scorer import JobCatalog, get_job_catalog, get_scores, top_k
+from app.services.job_features import get_job_features
+from app.services.matcher import get_user_match_profile, profile_content_hash
+
+# How many of each user's best matches are kept in job_matches
+MATCH_TOP_N = 500
+
+
+def _trim_user_matches(db, user_id: int) -> None:
+    """Keep only the user's MATCH_TOP_N best rows"""
+    keep = db.query(JobMatch.job_id).filter(JobMatch.user_id == user_id).order_by(
+        JobMatch.score.desc(), JobMatch.job_id.asc()
+    ).limit(MATCH_TOP_N)
+    db.query(JobMatch).filter(
+        JobMatch.user_id == user_id,
+        JobMatch.job_id.notin_(keep.scalar_subquery())
+    ).delete(synchronize_session=False)
+
+
+def refresh_user_matches(db, user: User) -> int:
+    """Rescore the catalog for one user and replace their materialized top N"""
+    profile = get_user_match_profile(user)
+    catalog = get_job_catalog(db)
+    ranked = top_k(catalog, get_scores(catalog, profile), MATCH_TOP_N)
+
+    db.query(JobMatch).filter(JobMatch.user_id == user.id).delete(synchronize_session=False)
+    db.bulk_insert_mappings(JobMatch, [
+        {"user_id": user.id, "job_id": job_id, "score": score} for job_id, score in ranked
+    ])
+    user.matches_profile_hash = profile_content_hash(user)
+    db.commit()
+    return len(ranked)
+
+
+def add_jobs_to_matches(db, jobs: Iterable) -> int:
+    """Score only newly inserted jobs against every materialized user.
+
+    jobs are Job rows or (job_id, JobFeatures) pairs; pairs let a caller that
+    just committed the rows score them without reloading each one.
+    """
+    jobs = [job if isinstance(job, tuple) else (job.id, get_job_features(job)) for job in jobs]
+    if not jobs:
+        return 0
+
+    new_catalog = JobCatalog.from_features(jobs)
+    inserted = 0
+    for user in db.query(User).filter(User.matches_profile_hash.isnot(None)):
+        # A stale materialization gets rebuilt on the next read anyway
+        if user.matches_profile_hash != profile_content_hash(user):
+            continue
+
+        ranked = top_k(new_catalog, new_catalog.score(get_user_match_profile(user)), MATCH_TOP_N)
+        count, floor = db.query(func.count(JobMatch.job_id), func.min(JobMatch.score)).filter(
+            JobMatch.user_id == user.id
+        ).one()
+        if count >= MATCH_TOP_N:
+            ranked = [(job_id, score) for job_id, score in ranked if score >= floor]
+        if not ranked:
+            continue
+
+        db.bulk_insert_mappings(JobMatch, [
+            {"user_id": user.id, "job_id": job_id, "score": score} for job_id, score in ranked
+        ])
+        _trim_user_matches(db, user.id)
+        inserted += len(ranked)
+
+    db.commit()
+    return inserted
+
+
+def get_top_matches(
+    db,
+    user: User,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[Tuple[int, float]]:
+    """(job_id, score) page of the user's recommendations, read from job_matches"""
+    if user.matches_profile_hash != profile_content_hash(user):
+        refresh_user_matches(db, user)
+
+    matches = db.query(JobMatch.job_id, JobMatch.score).filter(JobMatch.user_id == user.id)
+    if after is not None:
+        after_score, after_id = after
+        matches = matches.filter(or_(
+            JobMatch.score < after_score,
+            and_(JobMatch.score == after_score, JobMatch.job_id > after_id)
+        ))
+    ranked = [(row.job_id, row.score) for row in matches.order_by(
+        JobMatch.score.desc(), JobMatch.job_id.asc()
+    ).limit(limit)]
+
+    # Paging past the materialized top N falls back to scoring the catalog
+    if len(ranked) < limit:
+        materialized = db.query(func.count(JobMatch.job_id)).filter(JobMatch.user_id == user.id).scalar()
+        if materialized >= MATCH_TOP_N:
+            catalog = get_job_catalog(db)
+            ranked = top_k(catalog, get_scores(catalog, get_user_match_profile(user)), limit, after)
+
+    return ranked
@@ -0,0 +1,152 @@
+# [file name]: salary_parser.py - free-text salaries to annual USD ranges
+import re
+from typing import NamedTuple, Optional
+
+# Rough USD value of one unit of each currency; salaries are compared in USD
+USD_RATES = {
+    "USD": 1.0,
+    "EUR": 1.08,
+    "GBP": 1.27,
+    "CHF": 1.13,
+    "CAD": 0.73,
+    "AUD": 0.66,
+    "NZD": 0.61,
+    "SEK": 0.095,
+    "NOK": 0.094,
+    "DKK": 0.145,
+    "PLN": 0.25,
+    "INR": 0.012,
+    "JPY": 0.0067,
+    "SGD": 0.74,
+    "BRL": 0.2,
+}
+
+# Longest first, so "C$" wins over "$"
+_CURRENCY_SYMBOLS = (
+    ("US$", "USD"), ("C$", "CAD"), ("CA$", "CAD"), ("A$", "AUD"), ("AU$", "AUD"), ("NZ$", "NZD"),
+    ("S$", "SGD"), ("R$", "BRL"), ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("₹", "INR"), ("¥", "JPY"),
+)
+
+# Pay periods and how many of them make a working year
+_PERIODS = (
+    ("hour", 2080, re.compile(r"/\s*h(?:ou)?r\b|/\s*h\b|\bper hour\b|\bhourly\b|\ban hour\b|\bp/?h\b")),
+    ("day", 260, re.compile(r"/\s*day\b|\bper day\b|\bdaily\b|\ba day\b")),
+    ("week", 52, re.compile(r"/\s*w(?:ee)?k\b|\bper week\b|\bweekly\b")),
+    ("month", 12, re.compile(r"/\s*mo(?:nth)?\b|\bper month\b|\bmonthly\b|\ba month\b|\bpcm\b")),
+    ("year", 1, re.compile(r"/\s*y(?:ea)?r\b|\bper (?:year|annum)\b|\bannual(?:ly)?\b|\bp\.?a\.?(?=\s|$)|\ba year\b")),
+)
+
+# Amounts with an optional k/m suffix: "130,000", "130.000", "110'000", "1.5k", "90K", "1.2m";
+# counts of hours, years and the like are not amounts
+_AMOUNT = re.compile(
+    r"(?<![\d.,'])(\d+(?:[.,']\d+)*)(?!\d|[.,']\d)\s*([km])?(?![a-z])(?!\s*(?:%|\+?\s*(?:hours?|hrs?|years?|yrs?|days?|weeks?|months?)\b))",
+    re.IGNORECASE,
+)
+_NOT_SALARY = re.compile(r"\b401\s*\(?k\)?", re.IGNORECASE)
+
+# A lone amount is only a ceiling ("up to $180,000") or only a floor ("from
+# $90k", "$100k+") when one of these is right next to it; "$150k+equity" is not a floor
+_CEILING_BEFORE = re.compile(r"\b(?:up\s*to|upto|max(?:imum)?|under|below)\b\W*(?:[a-z]{1,3}\b\W*)?$")
+_FLOOR_BEFORE = re.compile(r"\b(?:from|at least|starting (?:at|from)|min(?:imum)?|over|above)\b\W*(?:[a-z]{1,3}\b\W*)?$")
+_FLOOR_AFTER = re.compile(r"\+(?!\s*(?:equity|bonus|benefits|commission|stock|options|tips|ote)\b)")
+_CURRENCY_CODE = re.compile(r"\b(" + "|".join(USD_RATES) + r")\b", re.IGNORECASE)
+
+# Annual USD salaries outside this range are treated as unparseable
+MIN_ANNUAL_SALARY = 5_000
+MAX_ANNUAL_SALARY = 2_000_000
+
+# Bare amounts up to this are taken as hourly rates ("$45 - $60")
+MAX_HOURLY_RATE = 500
+
+
+class SalaryRange(NamedTuple):
+    """A parsed salary: annual USD bounds plus what the text stated; one bound
+    is None when the text gives only a ceiling or only a floor"""
+    salary_min: Optional[int]
+    salary_max: Optional[int]
+    currency: str
+    period: str
+
+
+def _number(text: str) -> float:
+    """'130,000' / '130.000' / '18,00,000' / '1,5' / '1.5' as a number"""
+    text = text.replace("'", "")
+    if "," in text and "." in text:
+        # Whichever separator comes last is the decimal point
+        decimal = "," if text.rfind(",") > text.rfind(".") else "."
+        thousands = "." if decimal == "," else ","
+        return float(text.replace(thousands, "").replace(decimal, "."))
+    for separator in ",.":
+        if separator in text:
+            groups = text.split(separator)
+            # A decimal point occurs once; lakh grouping ("18,00,000") has 2-digit groups
+            if len(groups) > 2 or len(groups[1]) == 3:
+                return float("".join(groups))
+            return float(text.replace(separator, "."))
+    return float(text)
+
+
+def _currency(text: str) -> str:
+    code = _CURRENCY_CODE.search(text)
+    if code:
+        return code.group(1).upper()
+    for symbol, currency in _CURRENCY_SYMBOLS:
+        if symbol in text:
+            return currency
+    return "USD"
+
+
+def parse_salary(salary: Optional[str]) -> Optional[SalaryRange]:
+    """Parse '$130,000 - $160,000', '£75k-£90k', '$65/hr', 'EUR 4.500 per month' and the like.
+
+    The first two amounts are the range. One amount is a fixed salary, unless
+    it is only a ceiling ('up to $180,000', no salary_min) or only a floor
+    ('$100k+', 'from $90k', no salary_max). A k suffix on the second bound
+    applies to a bare first one ('120-150k').
+    Hourly, daily, weekly and monthly rates are annualized; without a stated
+    period, amounts up to MAX_HOURLY_RATE are taken as hourly. None when
+    there is no plausible salary in the text.
+    """
+    if not salary:
+        return None
+    text = _NOT_SALARY.sub(" ", salary.strip().lower())
+
+    amounts = []
+    suffixes = []
+    spans = []
+    for match in _AMOUNT.finditer(text):
+        try:
+            value = _number(match.group(1))
+        except ValueError:
+            continue
+        if value <= 0:
+            continue
+        amounts.append(value)
+        suffixes.append((match.group(2) or "").lower())
+        spans.append(match.span())
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return None
+
+    if len(suffixes) == 2 and suffixes[1] and not suffixes[0] and amounts[0] < 1000:
+        suffixes[0] = suffixes[1]
+    amounts = [value * {"k": 1_000, "m": 1_000_000}.get(suffix, 1) for value, suffix in zip(amounts, suffixes)]
+
+    period, per_year = next(((name, count) for name, count, pattern in _PERIODS if pattern.search(text)), (None, 1))
+    if period is None:
+        period, per_year = ("hour", 2080) if max(amounts) <= MAX_HOURLY_RATE else ("year", 1)
+
+    currency = _currency(salary)
+    low, high = min(amounts), max(amounts)
+    annual_min = round(low * per_year * USD_RATES[currency])
+    annual_max = round(high * per_year * USD_RATES[currency])
+    if annual_min < MIN_ANNUAL_SALARY or annual_max > MAX_ANNUAL_SALARY:
+        return None
+    if len(amounts) == 1:
+        start, end = spans[0]
+        if _CEILING_BEFORE.search(text, 0, start):
+            annual_min = None
+        elif _FLOOR_BEFORE.search(text, 0, start) or _FLOOR_AFTER.match(text, end):
+            annual_max = None
+    return SalaryRange(annual_min, annual_max, currency, period)
@@ -0,0 +1,140 @@
+# [file name]: skills.py - shared skill taxonomy
+import re
+from typing import Dict, FrozenSet, List, Tuple
+
+# One taxonomy for the whole backend: canonical skill -> aliases that count as
+# a mention of it. Order matters, it is the order skills are reported in and
+# the bit order used by the matcher.
+SKILL_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    'aws': ('aws', 'amazon web services'),
+    'azure': ('azure', 'microsoft azure'),
+    'gcp': ('gcp', 'google cloud', 'gcp platform'),
+    'terraform': ('terraform',),
+    'kubernetes': ('kubernetes', 'k8s'),
+    'docker': ('docker', 'container'),
+    'python': ('python', 'python3'),
+    'java': ('java',),
+    'javascript': ('javascript', 'js'),
+    'typescript': ('typescript', 'ts'),
+    'react': ('react', 'react.js'),
+    'node': ('node', 'nodejs', 'node.js'),
+    'linux': ('linux', 'unix'),
+    'bash': ('bash', 'shell scripting'),
+    'git': ('git', 'github', 'gitlab'),
+    'jenkins': ('jenkins',),
+    'ansible': ('ansible',),
+    'puppet': ('puppet',),
+    'chef': ('chef',),
+    'ci/cd': ('ci/cd', 'continuous integration', 'continuous deployment'),
+    'devops': ('devops',),
+    'sre': ('sre', 'site reliability'),
+    'microservices': ('microservices',),
+    'api': ('api', 'rest api', 'graphql'),
+    'sql': ('sql', 'mysql', 'postgresql', 'mongodb', 'redis'),
+    'angular': ('angular',),
+    'vue': ('vue',),
+    'express': ('express',),
+    'django': ('django',),
+    'flask': ('flask',),
+    'spring': ('spring', 'spring boot'),
+    'machine learning': ('machine learning', 'ml'),
+    'data analysis': ('data analysis',),
+    'cloud': ('cloud',),
+    'infrastructure': ('infrastructure',),
+    'automation': ('automation',),
+    'mobile': ('mobile', 'android', 'ios'),
+    'kotlin': ('kotlin',),
+    'swift': ('swift',),
+    'react native': ('react native',),
+    'flutter': ('flutter',),
+}
+
+SKILLS: Tuple[str, ...] = tuple(SKILL_TAXONOMY)
+SKILL_INDEX: Dict[str, int] = {skill: i for i, skill in enumerate(SKILLS)}
+
+
+def _trie_pattern(aliases: List[str]) -> str:
+    """Build a prefix-factored alternation so each position is tried once per character"""
+    trie: Dict = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def render(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: try the longer alias first, fall back to the shorter one
+        if terminal:
+            return '(?:' + body + ')?'
+        return body
+
+    return render(trie)
+
+
+def _implied_skills(alias: str) -> FrozenSet[str]:
+    """Every skill mentioned inside an alias, e.g. 'react native' also counts as 'react'"""
+    return frozenset(
+        skill for skill, aliases in SKILL_TAXONOMY.items()
+        if any(re.search(r'\b' + re.escape(other) + r'\b', alias) for other in aliases)
+    )
+
+
+_ALIAS_SKILLS: Dict[str, FrozenSet[str]] = {
+    alias: _implied_skills(alias)
+    for aliases in SKILL_TAXONOMY.values()
+    for alias in aliases
+}
+
+_SKILL_REGEX = re.compile(r'\b(?:' + _trie_pattern(list(_ALIAS_SKILLS)) + r')\b')
+
+
+def find_skills(text: str) -> FrozenSet[str]:
+    """Return the set of skills mentioned in text in a single regex pass"""
+    if not text:
+        return frozenset()
+
+    found = set()
+    seen_aliases = set()
+    for match in _SKILL_REGEX.finditer(text.lower()):
+        alias = match.group(0)
+        if alias in seen_aliases:
+            continue
+        seen_aliases.add(alias)
+        found |= _ALIAS_SKILLS[alias]
+        # Nothing left to find, skip the rest of a long document
+        if len(found) == len(SKILLS):
+            break
+    return frozenset(found)
+
+
+def extract_skills(text: str) -> List[str]:
+    """Skills mentioned in text, in taxonomy order"""
+    found = find_skills(text)
+    return [skill for skill in SKILLS if skill in found]
+
+
+def skill_mask(text: str) -> int:
+    """Bitmask of the skills mentioned in text, bit i is SKILLS[i]"""
+    mask = 0
+    for skill in find_skills(text):
+        mask |= 1 << SKILL_INDEX[skill]
+    return mask
+
+
+def mask_from_skills(skills) -> int:
+    """Bitmask for an iterable of canonical skill names"""
+    mask = 0
+    for skill in skills:
+        if skill in SKILL_INDEX:
+            mask |= 1 << SKILL_INDEX[skill]
+    return mask
+
+
+def skills_from_mask(mask: int) -> List[str]:
+    """Canonical skill names for a bitmask, in taxonomy order"""
+    return [skill for i, skill in enumerate(SKILLS) if mask >> i & 1]
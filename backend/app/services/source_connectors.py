@@ -0,0 +1,248 @@
+# [file name]: source_connectors.py - job source connectors with rate limits and circuit breakers
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+# Requests a connector may make per minute, and how many it may burst; None
+# rate_per_minute on a connector leaves it unlimited
+SOURCE_RATE_PER_MINUTE = float(os.getenv("SOURCE_RATE_PER_MINUTE", "30"))
+SOURCE_RATE_BURST = int(os.getenv("SOURCE_RATE_BURST", "5"))
+
+# Consecutive failures or timeouts that open a connector's circuit, and how
+# long it stays open before one probe request is let through
+SOURCE_FAILURE_THRESHOLD = int(os.getenv("SOURCE_FAILURE_THRESHOLD", "3"))
+SOURCE_RESET_TIMEOUT = float(os.getenv("SOURCE_RESET_TIMEOUT", "60"))
+
+# Weight of the newest call in a connector's moving average latency
+LATENCY_SMOOTHING = 0.2
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def acquire(self, wait: float) -> bool:
+        """Take a token, waiting up to `wait` seconds for one to refill"""
+        deadline = time.monotonic() + wait
+        while not self.try_acquire():
+            with self._lock:
+                needed = (1 - self._tokens) / self.rate
+            remaining = deadline - time.monotonic()
+            if needed > remaining:
+                return False
+            time.sleep(needed)
+        return True
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures; open -> half_open
+    after `reset_timeout` seconds, when a single probe decides whether it closes again"""
+
+    def __init__(self, failure_threshold: int = SOURCE_FAILURE_THRESHOLD, reset_timeout: float = SOURCE_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; in half_open only the one probe may"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return False
+
+    def cancel_probe(self) -> None:
+        """Return a half-open breaker whose probe never ran to open, ready to probe again"""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self._opened_at = time.monotonic() - self.reset_timeout
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class SourceUnavailable(Exception):
+    """A connector declined to call its source (circuit open or rate limited)"""
+
+    def __init__(self, status: str):
+        super().__init__(status)
+        self.status = status
+
+
+class Connector:
+    """One job source: how to fetch it, how to parse it, and how hard to hit it.
+
+    fetcher(parse, timeout, since, throttle, start_page) returns the source's
+    parsed jobs, newer than the since watermark when there is one, as an
+    iterable; parse turns the raw postings, as an iterable, into normalized
+    job dicts. A call is charged one rate-limit token up front; a fetcher
+    that makes further requests (pages) calls throttle() before each of them.
+    A paginated fetcher starts at start_page, where an interrupted sync left
+    off, and tags each job with the page it came from as "source_page".
+    """
+
+    def __init__(self, name: str, fetcher: Callable[[Callable[[Iterable[Any]], Iterable[Dict]], float, Optional[Any], Callable[[], None], int], Iterable[Dict]],
+                 parser: Callable[[Iterable[Any]], Iterable[Dict]], rate_per_minute: Optional[float] = SOURCE_RATE_PER_MINUTE,
+                 burst: int = SOURCE_RATE_BURST, failure_threshold: int = SOURCE_FAILURE_THRESHOLD,
+                 reset_timeout: float = SOURCE_RESET_TIMEOUT):
+        self.name = name
+        self.fetcher = fetcher
+        self.parser = parser
+        self.bucket = TokenBucket(rate_per_minute / 60, burst) if rate_per_minute else None
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._lock = threading.Lock()
+        self.counts = {"calls": 0, "errors": 0, "timeouts": 0, "circuit_open": 0, "rate_limited": 0}
+        self.last_latency_ms: Optional[float] = None
+        self.avg_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[datetime] = None
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def _record_latency(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.last_latency_ms = round(elapsed_ms, 1)
+            if self.avg_latency_ms is None:
+                self.avg_latency_ms = self.last_latency_ms
+            else:
+                self.avg_latency_ms = round(
+                    (1 - LATENCY_SMOOTHING) * self.avg_latency_ms + LATENCY_SMOOTHING * elapsed_ms, 1
+                )
+
+    def throttle(self, wait: float) -> None:
+        """Take a token for a further request of the current call, waiting up to
+        `wait` seconds; raises SourceUnavailable if none comes"""
+        if self.bucket is not None and not self.bucket.acquire(wait):
+            self._count("rate_limited")
+            raise SourceUnavailable("rate_limited")
+
+    def stream(self, timeout: float, since: Optional[Any] = None, start_page: int = 1) -> Iterator[Dict]:
+        """Parsed jobs of one call, yielded as the source delivers them.
+
+        Raises SourceUnavailable if the connector is holding off: its circuit
+        is open, or no rate-limit token comes within `timeout`, before the
+        first request or between pages (the pages already read count as a
+        success). Errors are re-raised after
+        being recorded, timeouts (`timeout` is per read, and bounds the wait
+        for a token) separately from other failures. Latency is the time
+        spent producing jobs, not the time the consumer spends on them.
+        """
+        if not self.breaker.allow():
+            self._count("circuit_open")
+            raise SourceUnavailable("circuit_open")
+        if self.bucket is not None and not self.bucket.acquire(timeout):
+            self._count("rate_limited")
+            self.breaker.cancel_probe()
+            raise SourceUnavailable("rate_limited")
+
+        self._count("calls")
+        elapsed = 0.0
+        try:
+            start = time.perf_counter()
+            jobs = iter(self.fetcher(self.parser, timeout, since, lambda: self.throttle(timeout), start_page))
+            while True:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield job
+                start = time.perf_counter()
+        except GeneratorExit:
+            # A consumer that stopped early leaves no verdict; a probe gets retried
+            self.breaker.cancel_probe()
+            raise
+        except SourceUnavailable:
+            self._record_latency(elapsed * 1000)
+            self.breaker.record_success()
+            raise
+        except Exception as e:
+            self._record_latency(elapsed * 1000)
+            self._count("timeouts" if isinstance(e, (requests.Timeout, TimeoutError)) else "errors")
+            self.last_error = str(e)
+            self.breaker.record_failure()
+            raise
+        self._record_latency(elapsed * 1000)
+        self.last_success = datetime.utcnow()
+        self.breaker.record_success()
+
+    def fetch(self, timeout: float, since: Optional[Any] = None, start_page: int = 1) -> List[Dict]:
+        """All parsed jobs of one call, see stream()"""
+        return list(self.stream(timeout, since, start_page))
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.breaker.state,
+                "consecutive_failures": self.breaker.failures,
+                **self.counts,
+                "last_latency_ms": self.last_latency_ms,
+                "avg_latency_ms": self.avg_latency_ms,
+                "last_error": self.last_error,
+                "last_success": self.last_success.isoformat() if self.last_success else None,
+            }
+
+
+class ConnectorRegistry:
+    """Connectors by name, in registration order"""
+
+    def __init__(self):
+        self._connectors: Dict[str, Connector] = {}
+
+    def register(self, connector: Connector) -> Connector:
+        if connector.name in self._connectors:
+            raise ValueError(f"Connector {connector.name!r} is already registered")
+        self._connectors[connector.name] = connector
+        return connector
+
+    def __getitem__(self, name: str) -> Connector:
+        return self._connectors[name]
+
+    def __iter__(self):
+        return iter(list(self._connectors.values()))
+
+    def __len__(self) -> int:
+        return len(self._connectors)
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state, call counts and latency of every connector"""
+        return {connector.name: connector.health() for connector in self}
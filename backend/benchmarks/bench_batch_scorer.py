@@ -0,0 +1,89 @@
+"""
+Scores a synthetic catalog with the per-job calculate_advanced_match_score
+loop and with the vectorized JobCatalog, and checks they agree.
+
+    cd backend && python -m benchmarks.bench_batch_scorer [n_jobs]
+"""
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.batch_scorer import JobCatalog
+from app.services.job_features import FEATURES_VERSION, JobFeatures
+from app.services.matcher import calculate_advanced_match_score, get_user_match_profile
+from app.services.skills import SKILLS
+
+LOCATIONS = ["Remote", "Berlin, Germany", "San Francisco, CA", "New York, NY", "Anywhere", "London", "", "Global"]
+
+
+def synthetic_features(n_jobs, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for job_id in range(1, n_jobs + 1):
+        mask = 0
+        for _ in range(rng.randint(0, 8)):
+            mask |= 1 << rng.randrange(len(SKILLS))
+        salary_min = rng.choice([None, 60000, 90000, 120000, 150000])
+        salary_max = salary_min + rng.choice([0, 20000, 50000]) if salary_min else None
+        rows.append((job_id, JobFeatures(
+            skill_mask=mask,
+            level_code=rng.randrange(5),
+            location_key=rng.choice(LOCATIONS).lower(),
+            is_remote=False,
+            salary_min=salary_min,
+            salary_max=salary_max,
+        )))
+    return rows
+
+
+def as_job(features):
+    return SimpleNamespace(
+        features_version=FEATURES_VERSION,
+        skill_mask=features.skill_mask,
+        level_code=features.level_code,
+        location_key=features.location_key,
+        is_remote=any(word in features.location_key for word in ('remote', 'anywhere', 'global')),
+        salary_min=features.salary_min,
+        salary_max=features.salary_max,
+    )
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    user = SimpleNamespace(
+        id=1,
+        resume_text="Senior engineer with 6+ years of AWS, Kubernetes, Terraform, Python and CI/CD",
+        skills="AWS, Azure, Terraform, Kubernetes, Docker, Python, DevOps",
+        preferred_locations="Remote, San Francisco, New York",
+        desired_salary_min=120000,
+    )
+    profile = get_user_match_profile(user)
+    rows = synthetic_features(n_jobs)
+    jobs = [as_job(features) for _, features in rows]
+
+    start = time.perf_counter()
+    catalog = JobCatalog.from_features(rows)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_scores = np.array([calculate_advanced_match_score(job, user, profile) for job in jobs])
+    loop_time = time.perf_counter() - start
+
+    repeat = 20
+    start = time.perf_counter()
+    for _ in range(repeat):
+        batch_scores = catalog.score(profile)
+    batch_time = (time.perf_counter() - start) / repeat
+
+    print(f"jobs:                {n_jobs}")
+    print(f"catalog build:       {build_time * 1e3:.1f} ms (once per catalog change)")
+    print(f"per-job loop:        {loop_time * 1e3:.1f} ms")
+    print(f"vectorized:          {batch_time * 1e3:.1f} ms ({loop_time / batch_time:.0f}x)")
+    print(f"max abs difference:  {np.max(np.abs(loop_scores - batch_scores)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
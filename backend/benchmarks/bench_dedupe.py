@@ -0,0 +1,100 @@
+"""
+Dedupe at ingest: lookup cost as the index grows, and how well near-duplicate
+detection catches postings cross-listed on several boards without merging a
+company's distinct postings.
+
+    cd backend && python -m benchmarks.bench_dedupe [indexed_jobs ...]
+"""
+import random
+import sys
+import time
+
+from app.services.enhanced_job_sources import parse_arbeitnow_jobs, parse_remoteok_jobs, parse_remotive_jobs
+from app.services.job_dedupe import ContentSignature, DedupeIndex, job_signature
+from benchmarks.fake_job_boards import BOARDS, posting
+
+PARSERS = {"remotive": parse_remotive_jobs, "arbeitnow": parse_arbeitnow_jobs, "remoteok": parse_remoteok_jobs}
+
+# Postings per company in the synthetic index
+POSTINGS_PER_COMPANY = 20
+
+
+def random_signature(rng: random.Random, companies: int) -> ContentSignature:
+    return ContentSignature(
+        fingerprint=f"{rng.getrandbits(160):040x}",
+        simhash=rng.getrandbits(64),
+        company=rng.randrange(companies),
+        title=rng.getrandbits(32),
+    )
+
+
+def lookup_cost(sizes, per_company: int = POSTINGS_PER_COMPANY):
+    print(f"{'indexed':>10}{'per company':>13}{'build s':>9}{'lookup us':>11}")
+    for size in sizes:
+        rng = random.Random(0)
+        companies = max(size // per_company, 1)
+        index = DedupeIndex()
+        start = time.perf_counter()
+        for i in range(size):
+            index.add(f"board_{i}", random_signature(rng, companies))
+        built = time.perf_counter() - start
+
+        probes = [(f"new_{i}", random_signature(rng, companies)) for i in range(20000)]
+        start = time.perf_counter()
+        misses = sum(index.match(external_id, signature) is None for external_id, signature in probes)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10}{per_company:>13}{built:>9.1f}{elapsed / len(probes) * 1e6:>11.2f}   ({misses} of {len(probes)} new)")
+
+
+def cross_listed(job, retitle: bool):
+    """The same posting as another board shows it: other markup, a legal suffix, tags appended"""
+    description = job["description"].replace("<p>", "<div>").replace("</p>", "</div><br>")
+    return {
+        **job,
+        "external_id": f"other_{job['external_id']}",
+        "title": f"{job['title']} - Remote" if retitle else job["title"],
+        "company": f"{job['company']} Inc.",
+        "description": f"{description} ['remote', 'full-time', 'english']",
+    }
+
+
+def detection():
+    jobs = []
+    for board in BOARDS:
+        postings = [posting(board, i) for i in range(50)]
+        jobs += list(PARSERS[board]([{}] + postings if board == "remoteok" else postings))
+    index = DedupeIndex()
+    for job in jobs:
+        index.add(job["external_id"], job_signature(job))
+
+    print()
+    for label, variants in (
+        ("cross-listed, same title", [cross_listed(job, False) for job in jobs]),
+        ("cross-listed, retitled", [cross_listed(job, True) for job in jobs]),
+    ):
+        caught = sum(index.match(job["external_id"], job_signature(job)) == "near_duplicate" for job in variants)
+        print(f"{label:<34}{caught:>4} of {len(variants)} caught")
+
+    # Another posting of the same company: a different recorded posting under its name
+    siblings = []
+    for board in BOARDS:
+        for job in [job for job in jobs if job["external_id"].startswith(board)]:
+            other = next(other for other in jobs if other["external_id"].startswith(board)
+                         and other["title"] != job["title"])
+            siblings.append({**other, "external_id": f"sibling_{job['external_id']}", "company": job["company"],
+                             "description": other["description"].replace(other["company"], job["company"])})
+    merged = sum(index.match(job["external_id"], job_signature(job)) is not None for job in siblings)
+    print(f"{'distinct postings of a company':<34}{merged:>4} of {len(siblings)} wrongly merged")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    lookup_cost(sizes)
+    # Large employers on aggregated boards: thousands of postings under one company
+    for per_company in (1_000, 10_000, 100_000):
+        lookup_cost([100_000], per_company)
+    detection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Embedding throughput against the local fake server: one request per text,
+the coalescing EmbeddingBatcher under concurrent callers, and aembed_many.
+
+    cd backend && python -m benchmarks.bench_embedding_client [n_texts] [latency_ms]
+"""
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_embeddings_server import FakeEmbeddingsServer
+
+
+def main():
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+
+    server = FakeEmbeddingsServer(latency_ms=latency_ms, failure_rate=0.01).start()
+    os.environ["OPENAI_API_KEY"] = "test"
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    # Imported after the environment points at the fake server
+    from app.services import embedding_client
+
+    model = "text-embedding-3-small"
+    texts = [f"Senior cloud engineer posting number {i} with AWS and Kubernetes" for i in range(n_texts)]
+    print(f"{n_texts} texts, {latency_ms:.0f} ms server latency, 1% injected failures")
+
+    def report(label, elapsed, requests):
+        print(f"{label:<36}{n_texts / elapsed:>10,.0f} texts/s{requests:>8} requests")
+
+    # One request per text is slow, time a sample and extrapolate
+    sample = texts[: min(200, n_texts)]
+    start = time.perf_counter()
+    for text in sample:
+        embedding_client.embed_batch([text], model)
+    elapsed = (time.perf_counter() - start) * n_texts / len(sample)
+    report("one request per text (extrapolated)", elapsed, n_texts)
+
+    batcher = embedding_client.EmbeddingBatcher(model)
+    before = server.requests
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        list(pool.map(batcher.embed, texts))
+    report("batcher, 64 concurrent callers", time.perf_counter() - start, server.requests - before)
+
+    before = server.requests
+    start = time.perf_counter()
+    asyncio.run(embedding_client.aembed_many(texts, model))
+    report("aembed_many, 4 in flight", time.perf_counter() - start, server.requests - before)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Memory per job embedding and ranking agreement with full precision for each
+storage layout: Python lists, float64, float32, int8 and truncated prefixes.
+
+    cd backend && python -m benchmarks.bench_embedding_storage [n_jobs] [dim] [n_queries]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.job_embeddings import JobEmbeddingMatrix
+from benchmarks.bench_ann_index import synthetic_embeddings
+
+LAYOUTS = [
+    ("float32", 0),
+    ("int8", 0),
+    ("float32", 512),
+    ("int8", 512),
+    ("int8", 256),
+]
+
+
+def overlap(found: np.ndarray, expected: np.ndarray) -> float:
+    return len(np.intersect1d(found, expected)) / len(expected)
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1536
+    n_queries = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    vectors = synthetic_embeddings(n_jobs + n_queries, dim)
+    vectors, queries = vectors[:n_jobs], vectors[n_jobs:]
+    job_ids = np.arange(1, n_jobs + 1)
+
+    # Full-precision reference ranking
+    reference = vectors.astype(np.float64)
+    start = time.perf_counter()
+    truth = [np.argsort(-(reference @ q))[:100] for q in queries.astype(np.float64)]
+    float64_ms = (time.perf_counter() - start) * 1000 / n_queries
+
+    as_list = vectors[0].astype(np.float64).tolist()
+    list_bytes = sys.getsizeof(as_list) + sum(sys.getsizeof(x) for x in as_list)
+    print(f"{n_jobs} jobs x {dim} dims, {n_queries} queries; agreement is top-k overlap with float64")
+    print(f"{'layout':<22}{'bytes/job':>10}{'catalog MB':>12}{'ms/query':>10}{'top10':>8}{'top100':>8}")
+    print(f"{'Python list[float]':<22}{list_bytes:>10,}{list_bytes * n_jobs / 2**20:>12.0f}{'':>10}{1:>8.3f}{1:>8.3f}")
+    print(f"{'float64 ndarray':<22}{dim * 8:>10,}{dim * 8 * n_jobs / 2**20:>12.0f}{float64_ms:>10.2f}{1:>8.3f}{1:>8.3f}")
+
+    for storage, dims in LAYOUTS:
+        with tempfile.TemporaryDirectory() as directory:
+            matrix = JobEmbeddingMatrix(directory, model="bench", storage=storage, dims=dims)
+            for chunk in range(0, n_jobs, 65536):
+                matrix.add(job_ids[chunk:chunk + 65536], vectors[chunk:chunk + 65536])
+            row_bytes = matrix.vectors.itemsize * matrix.dim + (4 if matrix.scales is not None else 0)
+
+            top10 = top100 = 0.0
+            start = time.perf_counter()
+            rankings = [np.argsort(-matrix.similarities(q))[:100] for q in queries]
+            elapsed_ms = (time.perf_counter() - start) * 1000 / n_queries
+            for found, expected in zip(rankings, truth):
+                top10 += overlap(found[:10], expected[:10])
+                top100 += overlap(found, expected)
+
+            label = storage + (f", first {dims} dims" if dims else "")
+            print(
+                f"{label:<22}{row_bytes:>10,}{row_bytes * n_jobs / 2**20:>12.0f}{elapsed_ms:>10.2f}"
+                f"{top10 / n_queries:>8.3f}{top100 / n_queries:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Full vs incremental (watermark) sync of local boards: requests, bytes and
+postings delivered when a handful of new postings appear on a large board.
+
+    cd backend && python -m benchmarks.bench_incremental_sync [postings_per_board] [new_postings]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_job_boards import BOARDS, FakeJobBoards
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_new = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    boards = FakeJobBoards(n_jobs=n_jobs).start()
+    os.environ["SOURCE_CACHE_DIR"] = tempfile.mkdtemp()
+    os.environ["SOURCE_CACHE_TTL"] = "0"
+    os.environ["SOURCE_RATE_PER_MINUTE"] = "6000"
+    for board in BOARDS:
+        os.environ[f"{board.upper()}_API_URL"] = boards.url(board)
+
+    # Imported after the environment points at the local boards and a scratch cache
+    from app.services import enhanced_job_sources as sources
+
+    def sync(label, watermarks):
+        requests = dict(boards.requests)
+        sent = dict(boards.bytes_sent)
+        report = {}
+        start = time.perf_counter()
+        jobs = list(sources.iter_source_jobs(deadline=60, report=report, watermarks=watermarks))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<30}{elapsed_ms:>9.1f} ms{len(jobs):>7} jobs")
+        for board, name in zip(BOARDS, ("Remotive", "Arbeitnow", "RemoteOK")):
+            print(
+                f"    {name:<12}{report[name]['jobs']:>6} jobs{boards.requests[board] - requests[board]:>4} requests"
+                f"{(boards.bytes_sent[board] - sent[board]) / 1024:>9.1f} KB"
+            )
+        return {name: info["watermark"] for name, info in report.items() if "watermark" in info}
+
+    print(f"{n_jobs} postings per board, {n_new} new between syncs")
+    watermarks = sync("full sync", None)
+    sync("incremental, nothing new", watermarks)
+    boards.publish(n_new)
+    sync(f"incremental, {n_new} new", watermarks)
+    sync("full sync again", None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+End-to-end ingestion throughput: postings streamed from the board simulator,
+deduplicated, built into Job rows and committed to a scratch SQLite database,
+reported as jobs/s along with per-source status and what the boards sent.
+
+    cd backend && python -m benchmarks.bench_ingestion --jobs 35000 [--jitter 0.05] [--error-rate remoteok=0.5] [--embed]
+"""
+import argparse
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_job_boards import BOARDS, PAGE_SIZE
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=35_000, help="postings per board")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--delay", action="append", default=[], help="board=seconds")
+    parser.add_argument("--error-rate", action="append", default=[], help="board=share of requests failed")
+    parser.add_argument("--embed", action="store_true", help="also embed the imported jobs")
+    args = parser.parse_args()
+
+    port = free_port()
+    command = [sys.executable, "-m", "benchmarks.fake_job_boards", "--port", str(port), "--jobs", str(args.jobs),
+               "--jitter", str(args.jitter)]
+    command += [flag for item in args.delay for flag in ("--delay", item)]
+    command += [flag for item in args.error_rate for flag in ("--error-rate", item)]
+    # The boards run in their own process so serving them does not compete with the import
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, cwd=os.path.dirname(os.path.dirname(__file__)) or ".")
+
+    for board in BOARDS:
+        os.environ[f"{board.upper()}_API_URL"] = f"http://127.0.0.1:{port}/{board}"
+    os.environ["SOURCE_CACHE_DIR"] = ""
+    os.environ["SOURCE_RATE_PER_MINUTE"] = "600000"
+    os.environ["SOURCE_RATE_BURST"] = "1000"
+    os.environ["SOURCE_MAX_PAGES"] = str(math.ceil(args.jobs / PAGE_SIZE) + 1)
+
+    # The app's database lives in the working directory, so a scratch one is used
+    sys.path.insert(0, os.getcwd())
+    os.chdir(tempfile.mkdtemp())
+    from app.database import SessionLocal, engine
+    from app.models import Base
+    from app.services.enhanced_job_sources import iter_enhanced_jobs
+    from app.services.job_import import import_job_stream
+
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        report = {}
+        start = time.perf_counter()
+        counts = import_job_stream(db, iter_enhanced_jobs("", deadline=600, report=report),
+                                   batch_size=args.batch_size, embed=args.embed)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+        server.terminate()
+        server.wait()
+
+    print()
+    print(f"{args.jobs} postings per board, batches of {args.batch_size}, embeddings {'on' if args.embed else 'off'}")
+    for name, info in report.items():
+        print(f"    {name:<18}{info['status']:<14}{info['jobs']:>8} jobs{info['latency_ms'] / 1000:>8.1f} s")
+    print(f"found {counts['found']}, imported {counts['imported']} in {elapsed:.1f} s: "
+          f"{counts['imported'] / elapsed:,.0f} jobs/s into the database")
+
+
+if __name__ == "__main__":
+    main()
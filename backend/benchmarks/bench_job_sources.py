@@ -0,0 +1,75 @@
+"""
+Timings of sequential vs concurrent source fetching against local boards with
+injected delays, of the overall deadline cutting off a hung board, and of a
+failing board's circuit opening and closing again after a half-open probe.
+The behaviour itself is asserted in tests/test_job_sources.py.
+
+    cd backend && python -m benchmarks.bench_job_sources
+"""
+import os
+import time
+
+from benchmarks.fake_job_boards import FakeJobBoards
+
+DELAYS = {"remotive": 0.4, "arbeitnow": 0.8, "remoteok": 1.2}
+
+
+def main():
+    boards = FakeJobBoards(delays=DELAYS).start()
+    os.environ["SOURCE_CACHE_DIR"] = ""
+    os.environ["SOURCE_RATE_PER_MINUTE"] = "6000"
+    os.environ["REMOTIVE_API_URL"] = boards.url("remotive")
+    os.environ["ARBEITNOW_API_URL"] = boards.url("arbeitnow")
+    os.environ["REMOTEOK_API_URL"] = boards.url("remoteok")
+
+    # Imported after the environment points at the local boards, with the cache off
+    from app.services import enhanced_job_sources as sources
+
+    print(f"board delays: {', '.join(f'{board} {delay:.1f}s' for board, delay in DELAYS.items())}")
+
+    start = time.perf_counter()
+    sequential = []
+    for connector in sources.CONNECTORS:
+        sequential.extend(connector.fetcher(connector.parser, 10))
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent, report = sources.fetch_sources(deadline=5)
+    concurrent_s = time.perf_counter() - start
+
+    print(f"{'sequential':<28}{sequential_s:>7.2f} s{len(sequential):>6} jobs")
+    print(f"{'concurrent':<28}{concurrent_s:>7.2f} s{len(concurrent):>6} jobs")
+
+    # A board that hangs past the deadline is reported and left out
+    boards.delays["remoteok"] = 5
+    start = time.perf_counter()
+    jobs, report = sources.fetch_sources(deadline=1.0)
+    elapsed = time.perf_counter() - start
+    print(f"{'deadline 1.0s, RemoteOK hung':<28}{elapsed:>7.2f} s{len(jobs):>6} jobs")
+    for name, info in report.items():
+        print(f"    {name:<18}{info['status']:<9}{info['latency_ms']:>8.0f} ms{info['jobs']:>5} jobs")
+
+    boards.failing.add("arbeitnow")
+    _, report = sources.fetch_sources(deadline=1.0)
+    print(f"{'Arbeitnow failing':<28}{report['Arbeitnow']['status']}")
+
+    # Two more failures open Arbeitnow's circuit; from then on it costs nothing
+    boards.delays["remoteok"] = DELAYS["remoteok"]
+    sources.CONNECTORS["Arbeitnow"].breaker.reset_timeout = 2.0
+    for _ in range(2):
+        sources.fetch_sources(deadline=3)
+    start = time.perf_counter()
+    _, report = sources.fetch_sources(deadline=3)
+    print(f"{'Arbeitnow circuit open':<28}{(time.perf_counter() - start):>7.2f} s   {report['Arbeitnow']['status']}")
+
+    # After the reset timeout one probe goes through and closes it again
+    boards.failing.clear()
+    time.sleep(2.0)
+    _, report = sources.fetch_sources(deadline=3)
+    health = sources.source_health()["Arbeitnow"]
+    print(f"{'Arbeitnow probe':<28}{report['Arbeitnow']['status']:>9}   circuit {health['state']}")
+    print(f"Arbeitnow health: {health}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Batch scoring throughput: the per-job calculate_advanced_match_score loop,
+the single-process vectorized JobCatalog and the shared-memory process pool
+at increasing worker counts.
+
+    cd backend && python -m benchmarks.bench_parallel_scorer [n_jobs] [n_users]
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.batch_scorer import JobCatalog
+from app.services.matcher import build_user_match_profile, calculate_advanced_match_score
+from app.services.parallel_scorer import ParallelScorer
+from benchmarks.bench_batch_scorer import as_job, synthetic_features
+
+RESUMES = [
+    "Senior engineer with 6+ years of AWS, Kubernetes, Terraform and Python",
+    "Junior frontend developer, React, TypeScript, JavaScript, Node",
+    "Lead SRE, Linux, Bash, Ansible, Puppet, Jenkins, CI/CD, microservices",
+    "Mid-level backend engineer, Java, SQL, REST API, Docker, Git",
+]
+
+
+def make_users(n_users):
+    return [
+        SimpleNamespace(
+            id=i,
+            resume_text=RESUMES[i % len(RESUMES)],
+            skills="AWS, Docker, Python" if i % 2 else "",
+            preferred_locations="Remote, Berlin" if i % 3 else "New York",
+            desired_salary_min=90000 + 10000 * (i % 5),
+        )
+        for i in range(n_users)
+    ]
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_users = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    rows = synthetic_features(n_jobs)
+    catalog = JobCatalog.from_features(rows)
+    users = make_users(n_users)
+    profiles = [build_user_match_profile(user) for user in users]
+    pairs = n_jobs * n_users
+
+    # The Python loop is far too slow to run in full, time a sample and extrapolate
+    sample = [as_job(features) for _, features in rows[:20_000]]
+    start = time.perf_counter()
+    for job in sample:
+        calculate_advanced_match_score(job, users[0], profiles[0])
+    loop_rate = len(sample) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    reference = np.stack([catalog.score(profile) for profile in profiles])
+    serial_time = time.perf_counter() - start
+
+    print(f"{n_jobs} jobs x {n_users} users = {pairs:,} pairs on {os.cpu_count()} cores")
+    print(f"{'per-job loop (extrapolated)':<30}{pairs / loop_rate:>10.2f} s{loop_rate:>16,.0f} pairs/s")
+    print(f"{'vectorized, 1 process':<30}{serial_time:>10.2f} s{pairs / serial_time:>16,.0f} pairs/s")
+
+    worker_counts = [w for w in (1, 2, 4, 8, 16) if w <= max(os.cpu_count() or 1, 1)]
+    for workers in worker_counts:
+        with ParallelScorer(catalog, workers=workers) as scorer:
+            scorer.score_many(profiles[:1])  # spawn and attach the workers outside the timing
+            start = time.perf_counter()
+            scores = scorer.score_many(profiles)
+            elapsed = time.perf_counter() - start
+        label = f"shared memory, {workers} workers"
+        print(
+            f"{label:<30}{elapsed:>10.2f} s{pairs / elapsed:>16,.0f} pairs/s"
+            f"   speedup {serial_time / elapsed:.1f}x, max diff {np.max(np.abs(scores - reference)):.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Salary parsing at ingest and the min_salary filter: parse rate over common
+salary formats, and selecting jobs above a floor in SQL through the
+salary_max index vs a full scan, over simulator postings in a scratch
+SQLite database.
+
+    cd backend && python -m benchmarks.bench_salary_filter [postings_per_board]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_job_boards import BOARDS, posting
+
+SALARIES = [
+    "$130,000 - $160,000", "$120k - $150k", "120-150k USD", "£75k - £90k", "€50.000 - €65.000 p.a.",
+    "EUR 4.500 per month", "$65/hr", "$45 - $60", "1.5k/week", "CHF 110'000", "C$90,000 to C$110,000",
+    "up to $200k/year", "$100k+", "$150K + equity", "Competitive", "DOE", "",
+]
+
+
+def timed(run, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    # The app's database lives in the working directory, so a scratch one is used
+    sys.path.insert(0, os.getcwd())
+    os.chdir(tempfile.mkdtemp())
+    from sqlalchemy import text
+
+    from app.database import SessionLocal, engine
+    from app.models import Base
+    from app.services.enhanced_job_sources import parse_arbeitnow_jobs, parse_remoteok_jobs, parse_remotive_jobs
+    from app.services.job_import import build_job
+    from app.services.salary_parser import parse_salary
+
+    for salary in SALARIES:
+        parsed = parse_salary(salary)
+        bounds = [f"{bound:>9,}" if bound is not None else f"{'':>9}" for bound in parsed[:2]] if parsed else None
+        print(f"{salary!r:<28}" + (f"{bounds[0]} - {bounds[1]} USD/yr  ({parsed.currency} per {parsed.period})" if parsed else "        -"))
+    parse_s = timed(lambda: [parse_salary(salary) for salary in SALARIES * 1000])
+    print(f"\n{parse_s / (len(SALARIES) * 1000) * 1e6:.1f} us per salary string")
+
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    parsers = {"remotive": parse_remotive_jobs, "arbeitnow": parse_arbeitnow_jobs, "remoteok": parse_remoteok_jobs}
+    db = SessionLocal()
+    for board in BOARDS:
+        postings = (posting(board, i) for i in range(n_jobs))
+        if board == "remoteok":
+            postings = iter([{}, *postings])
+        db.add_all(build_job(job_data) for job_data in parsers[board](postings))
+        db.commit()
+
+    total = db.execute(text("SELECT count(*) FROM jobs")).scalar()
+    with_salary = db.execute(text("SELECT count(*) FROM jobs WHERE salary_min IS NOT NULL OR salary_max IS NOT NULL")).scalar()
+    print(f"\n{total} jobs, {with_salary} with a salary range")
+    for floor in (100_000, 150_000, 175_000):
+        where = "salary_max >= :floor OR (salary_max IS NULL AND salary_min IS NOT NULL)"
+        indexed = text(f"SELECT id FROM jobs WHERE {where}")
+        scanned = text(f"SELECT id FROM jobs NOT INDEXED WHERE {where}")
+        count = len(db.execute(indexed, {"floor": floor}).all())
+        indexed_s = timed(lambda: db.execute(indexed, {"floor": floor}).all())
+        scanned_s = timed(lambda: db.execute(scanned, {"floor": floor}).all())
+        print(f"min_salary {floor:>7,}: {count:>6} jobs  index {indexed_s * 1000:>6.1f} ms  scan {scanned_s * 1000:>6.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Raw HTML descriptions vs the search_text stored at ingest: size, skill
+extraction time, and a keyword search in SQL, over postings of the board
+simulator in a scratch SQLite database.
+
+    cd backend && python -m benchmarks.bench_search_text [postings_per_board]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_job_boards import BOARDS, posting
+
+
+def timed(run, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    # The app's database lives in the working directory, so a scratch one is used
+    sys.path.insert(0, os.getcwd())
+    os.chdir(tempfile.mkdtemp())
+    from sqlalchemy import func
+
+    from app.database import SessionLocal, engine
+    from app.models import Base, Job
+    from app.services.enhanced_job_sources import parse_arbeitnow_jobs, parse_remoteok_jobs, parse_remotive_jobs
+    from app.services.job_import import build_job
+    from app.services.skills import skill_mask
+
+    engine.echo = False
+    Base.metadata.create_all(bind=engine)
+    parsers = {"remotive": parse_remotive_jobs, "arbeitnow": parse_arbeitnow_jobs, "remoteok": parse_remoteok_jobs}
+    db = SessionLocal()
+    for board in BOARDS:
+        postings = (posting(board, i) for i in range(n_jobs))
+        if board == "remoteok":
+            postings = iter([{}, *postings])
+        db.add_all(build_job(job_data) for job_data in parsers[board](postings))
+        db.commit()
+
+    descriptions = [row.description for row in db.query(Job.description)]
+    search_texts = [row.search_text for row in db.query(Job.search_text)]
+    print(f"{len(descriptions)} jobs")
+    print(f"{'':<22}{'description':>14}{'search_text':>14}")
+    print(f"{'stored KB':<22}{sum(map(len, descriptions)) / 1024:>14.0f}{sum(map(len, search_texts)) / 1024:>14.0f}")
+
+    raw_s = timed(lambda: [skill_mask(text) for text in descriptions])
+    clean_s = timed(lambda: [skill_mask(text) for text in search_texts])
+    print(f"{'skill scan ms':<22}{raw_s * 1000:>14.1f}{clean_s * 1000:>14.1f}")
+
+    for query in ("kubernetes", "on-call"):
+        raw_q = db.query(func.count(Job.id)).filter(Job.description.ilike(f"%{query}%"))
+        clean_q = db.query(func.count(Job.id)).filter(Job.search_text.like(f"%{query}%"))
+        raw_s = timed(raw_q.scalar)
+        clean_s = timed(clean_q.scalar)
+        print(f"{'search ' + query + ' ms':<22}{raw_s * 1000:>14.1f}{clean_s * 1000:>14.1f}"
+              f"   ({raw_q.scalar()} vs {clean_q.scalar()} matches)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-document cost of skill extraction.
+
+Compares the old per-skill regex loop (one re.search per skill) and the old
+substring loop from ai_generator with the shared single-pass matcher.
+
+    cd backend && python -m benchmarks.bench_skill_extraction
+"""
+import random
+import re
+import time
+
+from app.services.skills import SKILL_TAXONOMY, extract_skills
+
+LEGACY_PATTERNS = {
+    skill: r'\b(' + '|'.join(re.escape(alias) for alias in aliases) + r')\b'
+    for skill, aliases in SKILL_TAXONOMY.items()
+}
+
+FILLER = (
+    "We are looking for an engineer to join our growing team and own services "
+    "end to end with a focus on quality ownership and customer impact. "
+).split()
+
+
+def legacy_regex_loop(text):
+    text_lower = text.lower()
+    return [skill for skill, pattern in LEGACY_PATTERNS.items() if re.search(pattern, text_lower)]
+
+
+def legacy_substring_loop(text):
+    text_lower = text.lower()
+    return [skill for skill, aliases in SKILL_TAXONOMY.items() if any(alias in text_lower for alias in aliases)]
+
+
+def make_document(size_bytes, density=0.02, seed=0):
+    rng = random.Random(seed)
+    aliases = [alias for aliases in SKILL_TAXONOMY.values() for alias in aliases]
+    words = []
+    length = 0
+    while length < size_bytes:
+        word = rng.choice(aliases) if rng.random() < density else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def time_per_doc(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    cases = [
+        ("job description 2 KB", 2_000, 0.02, 2000),
+        ("long description 20 KB", 20_000, 0.02, 300),
+        ("huge resume 200 KB", 200_000, 0.02, 30),
+        ("huge sparse resume 200 KB", 200_000, 0.0005, 30),
+        ("pathological resume 2 MB", 2_000_000, 0.02, 3),
+        ("pathological sparse 2 MB", 2_000_000, 0.0005, 3),
+    ]
+    print(f"{'document':<28}{'regex loop':>14}{'substr loop':>14}{'single pass':>14}{'speedup':>10}")
+    for label, size, density, repeat in cases:
+        text = make_document(size, density)
+        regex_loop = time_per_doc(legacy_regex_loop, text, repeat)
+        substring_loop = time_per_doc(legacy_substring_loop, text, repeat)
+        single_pass = time_per_doc(extract_skills, text, repeat)
+        print(
+            f"{label:<28}{regex_loop * 1e3:>12.3f}ms{substring_loop * 1e3:>12.3f}ms"
+            f"{single_pass * 1e3:>12.3f}ms{regex_loop / single_pass:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
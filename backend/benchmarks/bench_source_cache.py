@@ -0,0 +1,60 @@
+"""
+Board fetches through the source cache: a cold fetch, a fresh hit inside the
+TTL, a conditional revalidation answered with 304, and a changed feed.
+
+    cd backend && python -m benchmarks.bench_source_cache [postings_per_board]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_job_boards import BOARDS, FakeJobBoards
+
+
+def main():
+    n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    boards = FakeJobBoards(delays={board: 0.05 for board in BOARDS}, n_jobs=n_jobs).start()
+    directory = tempfile.mkdtemp()
+    os.environ["SOURCE_CACHE_DIR"] = directory
+    os.environ["REMOTIVE_API_URL"] = boards.url("remotive")
+    os.environ["ARBEITNOW_API_URL"] = boards.url("arbeitnow")
+    os.environ["REMOTEOK_API_URL"] = boards.url("remoteok")
+
+    # Imported after the environment points at the local boards and a scratch cache
+    from app.services import enhanced_job_sources as sources
+
+    def run(label):
+        sent = sum(boards.bytes_sent.values())
+        requests = sum(boards.requests.values())
+        start = time.perf_counter()
+        jobs, _ = sources.fetch_sources(deadline=10)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"{label:<24}{elapsed_ms:>8.1f} ms{len(jobs):>6} jobs"
+            f"{sum(boards.requests.values()) - requests:>4} requests"
+            f"{(sum(boards.bytes_sent.values()) - sent) / 1024:>9.1f} KB"
+        )
+        return sorted(job["external_id"] for job in jobs)
+
+    print(f"{n_jobs} postings per board")
+    cold = run("cold")
+    assert run("fresh (within TTL)") == cold
+
+    sources.get_source_cache().ttl = 0
+    assert run("revalidated (304)") == cold
+
+    boards.publish(10)
+    changed = run("feed changed")
+    assert changed != cold
+
+    print()
+    for source, stats in sources.source_cache_stats().items():
+        print(
+            f"{source:<12}{stats['requests']:>3} fetches  hit rate {stats['hit_rate']:.2f}  "
+            f"downloaded {stats['bytes_downloaded'] / 1024:>8.1f} KB  saved {stats['bytes_saved'] / 1024:>8.1f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
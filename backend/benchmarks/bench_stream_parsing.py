@@ -0,0 +1,71 @@
+"""
+Peak Python memory and throughput of parsing a board feed whole
+(response.json()) vs streaming it element by element, as the feed grows.
+
+    cd backend && python -m benchmarks.bench_stream_parsing [postings ...]
+"""
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import requests
+
+from app.services.enhanced_job_sources import SourceCache, parse_remoteok_jobs
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure(consume):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = consume()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 100_000]
+    uncached = SourceCache(directory="")
+    print(f"{'postings':>9}  {'mode':<10}{'peak MB':>9}{'jobs/s':>10}")
+    for n_jobs in sizes:
+        # The boards run in their own process so their payloads stay out of the measurement
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_job_boards", "--port", str(port), "--jobs", str(n_jobs)],
+            stdout=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}/remoteok"
+        try:
+            for _ in range(100):
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+
+            def buffered():
+                response = requests.get(url, timeout=60)
+                return len(list(parse_remoteok_jobs(response.json())))
+
+            def streamed():
+                return sum(1 for _ in parse_remoteok_jobs(uncached.stream("bench", url, timeout=60)))
+
+            for mode, consume in (("buffered", buffered), ("streamed", streamed)):
+                count, elapsed, peak = measure(consume)
+                assert count == n_jobs
+                print(f"{n_jobs:>9}  {mode:<10}{peak / 2**20:>9.1f}{count / elapsed:>10.0f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
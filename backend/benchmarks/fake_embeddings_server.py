@@ -0,0 +1,118 @@
+"""
+Local stand-in for the OpenAI embeddings endpoint.
+
+Serves POST /v1/embeddings with deterministic unit vectors derived from a
+hash of each input, so the same text always gets the same vector. Supports
+float and base64 encoding, an artificial per-request latency and a failure
+rate for exercising retries.
+
+    cd backend && python -m benchmarks.fake_embeddings_server --port 8765 --latency-ms 50
+    OPENAI_API_KEY=test OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python -m uvicorn app.main:app
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+def fake_embedding(text: str, dim: int) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeEmbeddingsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), dim=1536, latency_ms=0.0, failure_rate=0.0):
+        super().__init__(address, _Handler)
+        self.dim = dim
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.inputs = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeEmbeddingsServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeEmbeddingsServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/embeddings":
+            self._reply(404, {"error": {"message": "not found"}})
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        inputs = request.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        server = self.server
+        with server._lock:
+            server.requests += 1
+            server.inputs += len(inputs)
+        if server.latency:
+            time.sleep(server.latency)
+        if server.failure_rate and random.random() < server.failure_rate:
+            self._reply(503, {"error": {"message": "injected failure"}})
+            return
+
+        data = []
+        for index, text in enumerate(inputs):
+            vector = fake_embedding(text, server.dim)
+            if request.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode()
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+        tokens = sum(len(text.split()) for text in inputs)
+        self._reply(200, {
+            "object": "list",
+            "data": data,
+            "model": request.get("model", "fake"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeEmbeddingsServer(("127.0.0.1", args.port), args.dim, args.latency_ms, args.failure_rate)
+    print(f"Fake embeddings server on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
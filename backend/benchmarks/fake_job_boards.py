@@ -0,0 +1,268 @@
+"""
+Local simulator of the Remotive, Arbeitnow and RemoteOK APIs.
+
+Postings are generated from recorded responses (benchmarks/fixtures), so each
+board answers in its real API's shape and field set: Remotive's {"jobs": [...]}
+with HTML descriptions, Arbeitnow's paginated {"data", "links", "meta"}
+(?page=N), and RemoteOK's bare array behind a legal notice. Boards list newest
+first and can hold 100k+ postings; each body is built once per board state.
+
+Latency (fixed plus random jitter) and failures (every request, or a random
+share of them) are injected per board. Responses carry an ETag and
+Last-Modified, conditional requests for an unchanged payload get a 304, and
+publish() adds newer postings to every board.
+
+    cd backend && python -m benchmarks.fake_job_boards --port 8766 --jobs 100000 --delay remoteok=3 --error-rate arbeitnow=0.1
+    REMOTIVE_API_URL=http://127.0.0.1:8766/remotive \\
+    ARBEITNOW_API_URL=http://127.0.0.1:8766/arbeitnow \\
+    REMOTEOK_API_URL=http://127.0.0.1:8766/remoteok python -m uvicorn app.main:app
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+BOARDS = ("remotive", "arbeitnow", "remoteok")
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Posting i of a board was published i minutes after this (2025-01-01 UTC)
+FIRST_POSTED = 1735689600
+
+# Postings per page of the paginated board (Arbeitnow, ?page=N)
+PAGE_SIZE = 100
+
+# Response bodies kept per simulator, least recently used dropped first
+BODY_CACHE_SIZE = 256
+
+_fixtures: Dict[str, object] = {}
+
+
+def load_fixture(board: str) -> object:
+    """The recorded response of a board"""
+    if board not in _fixtures:
+        with open(os.path.join(FIXTURES_DIR, f"{board}.json"), encoding="utf-8") as f:
+            _fixtures[board] = json.load(f)
+    return _fixtures[board]
+
+
+def _templates(board: str) -> List[Dict]:
+    fixture = load_fixture(board)
+    if board == "remotive":
+        return fixture["jobs"]
+    if board == "arbeitnow":
+        return fixture["data"]
+    return fixture[1:]
+
+
+def _posted(i: int) -> int:
+    return FIRST_POSTED + 60 * i
+
+
+def posting(board: str, i: int) -> Dict:
+    """Posting i of a board: a recorded posting with its own id, company and publication time"""
+    templates = _templates(board)
+    job = dict(templates[i % len(templates)])
+    # Every pass over the recordings gets its own company, so title and company stay unique
+    variant = i // len(templates)
+    posted = _posted(i)
+    description = f"{job['description']}<p>Ref. {board.upper()}-{i}</p>"
+    if board == "remotive":
+        job.update({
+            "id": 1_000_000 + i,
+            "url": f"https://remotive.com/remote-jobs/software-dev/job-{1_000_000 + i}",
+            "company_name": f"{job['company_name']} {variant}" if variant else job["company_name"],
+            "publication_date": datetime.fromtimestamp(posted, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+            "description": description,
+        })
+    elif board == "arbeitnow":
+        job.update({
+            "slug": f"{job['slug']}-{i}",
+            "url": f"{job['url']}-{i}",
+            "company_name": f"{job['company_name']} {variant}" if variant else job["company_name"],
+            "created_at": posted,
+            "description": description,
+        })
+    else:
+        job.update({
+            "id": str(2_000_000 + i),
+            "slug": f"{job['slug']}-{i}",
+            "url": f"https://remoteok.com/remote-jobs/{2_000_000 + i}",
+            "epoch": posted,
+            "date": datetime.fromtimestamp(posted, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            "company": f"{job['company']} {variant}" if variant else job["company"],
+            "description": description,
+        })
+    return job
+
+
+def board_payload(board: str, total: int = 20, page: Optional[int] = None, page_size: int = PAGE_SIZE,
+                  limit: Optional[int] = None) -> object:
+    """A response body of the board's real API, newest of `total` postings first"""
+    newest_first = range(total - 1, -1, -1)
+    fixture = load_fixture(board)
+    if board == "remotive":
+        shown = newest_first[:limit] if limit else newest_first
+        return {**fixture, "job-count": len(shown), "jobs": [posting(board, i) for i in shown]}
+    if board == "arbeitnow":
+        page = page or 1
+        on_page = newest_first[(page - 1) * page_size:page * page_size]
+        path = fixture["meta"]["path"]
+        return {
+            "data": [posting(board, i) for i in on_page],
+            "links": {
+                "first": f"{path}?page=1",
+                "last": None,
+                "prev": f"{path}?page={page - 1}" if page > 1 else None,
+                "next": f"{path}?page={page + 1}" if page * page_size < total else None,
+            },
+            "meta": {
+                **fixture["meta"],
+                "current_page": page,
+                "from": (page - 1) * page_size + 1,
+                "per_page": page_size,
+                "to": (page - 1) * page_size + len(on_page),
+            },
+        }
+    return [fixture[0]] + [posting(board, i) for i in newest_first]
+
+
+class FakeJobBoards(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), delays: Optional[Dict[str, float]] = None,
+                 failing: tuple = (), n_jobs: int = 20, jitter: float = 0.0,
+                 error_rates: Optional[Dict[str, float]] = None, page_size: int = PAGE_SIZE, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.delays = dict(delays or {})
+        self.failing = set(failing)
+        self.jitter = jitter
+        self.error_rates = dict(error_rates or {})
+        self.n_jobs = n_jobs
+        self.page_size = page_size
+        self.modified_at = time.time()
+        self.requests: Dict[str, int] = {board: 0 for board in BOARDS}
+        self.errors: Dict[str, int] = {board: 0 for board in BOARDS}
+        self.bytes_sent: Dict[str, int] = {board: 0 for board in BOARDS}
+        self._random = random.Random(seed)
+        self._bodies: "OrderedDict[Tuple, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def url(self, board: str) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/{board}"
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up on a delayed reply are expected, not errors
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def publish(self, count: int) -> None:
+        """Add `count` postings, newer than all others, to every board"""
+        with self._lock:
+            self.n_jobs += count
+            self.modified_at = time.time()
+            self._bodies.clear()
+
+    def body(self, board: str, page: int, limit: Optional[int]) -> Tuple[bytes, str]:
+        """(JSON body, ETag) of a board response, built once per board state"""
+        with self._lock:
+            key = (board, self.n_jobs, page, limit)
+            if key in self._bodies:
+                self._bodies.move_to_end(key)
+                return self._bodies[key]
+        body = json.dumps(board_payload(board, key[1], page, self.page_size, limit)).encode()
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+        with self._lock:
+            self._bodies[key] = entry
+            while len(self._bodies) > BODY_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+        return entry
+
+    def start(self) -> "FakeJobBoards":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeJobBoards
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        board = urlparse(self.path).path.strip("/")
+        if board in self.server.bytes_sent:
+            with self.server._lock:
+                self.server.bytes_sent[board] += len(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        board = url.path.strip("/")
+        query = parse_qs(url.query)
+        server = self.server
+        if board not in BOARDS:
+            self._reply(404, b'{"error": "not found"}')
+            return
+        with server._lock:
+            server.requests[board] += 1
+            delay = server.delays.get(board, 0) + server._random.uniform(0, server.jitter)
+            failed = board in server.failing or server._random.random() < server.error_rates.get(board, 0)
+            if failed:
+                server.errors[board] += 1
+        time.sleep(delay)
+        if failed:
+            self._reply(503, b'{"error": "injected failure"}')
+            return
+        page = int(query.get("page", ["1"])[0])
+        limit = int(query["limit"][0]) if "limit" in query else None
+        body, etag = server.body(board, page, limit)
+        validators = {"ETag": etag, "Last-Modified": formatdate(server.modified_at, usegmt=True)}
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, b"", validators)
+            return
+        self._reply(200, body, validators)
+
+
+def _per_board(items: List[str]) -> Dict[str, float]:
+    return {board: float(value) for board, value in (item.split("=") for item in items)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--jobs", type=int, default=20, help="postings per board")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--delay", action="append", default=[], help="board=seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per request")
+    parser.add_argument("--error-rate", action="append", default=[], help="board=share of requests failed with 503")
+    parser.add_argument("--fail", action="append", default=[], choices=BOARDS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeJobBoards(("127.0.0.1", args.port), _per_board(args.delay), tuple(args.fail), args.jobs,
+                           args.jitter, _per_board(args.error_rate), args.page_size, args.seed)
+    for board in BOARDS:
+        print(f"{board}: {server.url(board)}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
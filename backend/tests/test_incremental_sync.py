@@ -0,0 +1,86 @@
+"""
+Incremental sync of a large paginated board under the default rate limits
+(SOURCE_RATE_PER_MINUTE=30, burst 5): a sync cut short by its deadline stores
+where to resume, and the next one picks up from there and completes.
+"""
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from app.services import enhanced_job_sources as sources
+from app.services.job_import import load_resume_points, load_watermarks, save_watermarks
+from app.services.source_connectors import SOURCE_RATE_BURST, SOURCE_RATE_PER_MINUTE, Connector, ConnectorRegistry
+from benchmarks.fake_job_boards import PAGE_SIZE, FakeJobBoards, _posted
+
+PAGES = 10
+
+
+@pytest.fixture
+def boards():
+    server = FakeJobBoards(n_jobs=PAGES * PAGE_SIZE).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def arbeitnow(boards, monkeypatch):
+    """Only the paginated board, with the default rate limit"""
+    assert (SOURCE_RATE_PER_MINUTE, SOURCE_RATE_BURST) == (30, 5)
+    registry = ConnectorRegistry()
+    connector = registry.register(Connector(
+        "Arbeitnow", sources._board_fetcher("Arbeitnow", boards.url("arbeitnow"), "data", paginated=True),
+        sources.parse_arbeitnow_jobs
+    ))
+    monkeypatch.setattr(sources, "CONNECTORS", registry)
+    monkeypatch.setattr(sources, "source_cache", sources.SourceCache(directory=None))
+    return connector
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def sync(db, deadline: float):
+    report = {}
+    jobs = list(sources.iter_source_jobs(deadline, report, load_watermarks(db), load_resume_points(db)))
+    save_watermarks(db, report)
+    return jobs, report["Arbeitnow"]
+
+
+def test_interrupted_sync_resumes_and_completes(boards, arbeitnow, db):
+    # The interactive deadline cuts the first sync off partway through the board
+    first, info = sync(db, deadline=sources.JOB_FETCH_DEADLINE)
+    assert info["status"] == "timeout"
+    assert 1 < info["resume"]["page"] < PAGES
+    assert load_watermarks(db) == {}
+    assert load_resume_points(db)["Arbeitnow"] == info["resume"]
+
+    # The next sync starts at that page instead of page 1, and gets through
+    resume_page = info["resume"]["page"]
+    requests_before = boards.requests["arbeitnow"]
+    start = time.perf_counter()
+    second, info = sync(db, deadline=sources.IMPORT_FETCH_DEADLINE)
+    assert info["status"] == "ok"
+    # Pages resume_page..PAGES, the empty one after them, and one the cut-off sync may still have in flight
+    assert boards.requests["arbeitnow"] - requests_before <= PAGES - resume_page + 3
+    assert time.perf_counter() - start < sources.IMPORT_FETCH_DEADLINE
+
+    ids = {job["external_id"] for job in first} | {job["external_id"] for job in second}
+    assert len(ids) == PAGES * PAGE_SIZE
+    assert load_resume_points(db) == {}
+    # The watermark is the newest posting, delivered by the first sync
+    assert load_watermarks(db) == {"Arbeitnow": float(_posted(PAGES * PAGE_SIZE - 1))}
+
+    # Caught up: a later sync reads one page and finds only the newest posting again
+    third, info = sync(db, deadline=sources.IMPORT_FETCH_DEADLINE)
+    assert info["status"] == "ok"
+    assert len(third) == 1
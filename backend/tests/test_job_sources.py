@@ -0,0 +1,91 @@
+"""
+Concurrent source fetching against local stand-in boards (benchmarks/fake_job_boards.py)
+with injected delays: the boards' latencies overlap, the overall deadline cuts off
+a hung board, and a failing board's circuit opens and closes again after a probe.
+"""
+import time
+
+import pytest
+
+from app.services import enhanced_job_sources as sources
+from app.services.source_connectors import Connector, ConnectorRegistry
+from benchmarks.fake_job_boards import FakeJobBoards
+
+DELAYS = {"remotive": 0.4, "arbeitnow": 0.8, "remoteok": 1.2}
+
+
+@pytest.fixture
+def boards():
+    server = FakeJobBoards(delays=DELAYS).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def connectors(boards, monkeypatch):
+    """Fresh board connectors pointed at the local boards, without the response cache or rate limits"""
+    registry = ConnectorRegistry()
+    registry.register(Connector("Remotive", sources._board_fetcher("Remotive", boards.url("remotive"), "jobs"),
+                                sources.parse_remotive_jobs, rate_per_minute=None))
+    registry.register(Connector("Arbeitnow", sources._board_fetcher("Arbeitnow", boards.url("arbeitnow"), "data", paginated=True),
+                                sources.parse_arbeitnow_jobs, rate_per_minute=None))
+    registry.register(Connector("RemoteOK", sources._board_fetcher("RemoteOK", boards.url("remoteok")),
+                                sources.parse_remoteok_jobs, rate_per_minute=None))
+    monkeypatch.setattr(sources, "CONNECTORS", registry)
+    monkeypatch.setattr(sources, "source_cache", sources.SourceCache(directory=None))
+    return registry
+
+
+def test_board_delays_overlap(connectors):
+    sequential = [job for connector in connectors for job in connector.fetcher(connector.parser, 10)]
+
+    start = time.perf_counter()
+    jobs, report = sources.fetch_sources(deadline=5)
+    elapsed = time.perf_counter() - start
+
+    # Bounded by the slowest board, not the sum of the delays
+    assert elapsed < DELAYS["remoteok"] + 0.5 < sum(DELAYS.values())
+    assert sorted(job["external_id"] for job in jobs) == sorted(job["external_id"] for job in sequential)
+    assert {name: info["status"] for name, info in report.items()} == {
+        "Remotive": "ok", "Arbeitnow": "ok", "RemoteOK": "ok"
+    }
+
+
+def test_deadline_cuts_off_hung_board(boards, connectors):
+    boards.delays["remoteok"] = 5
+
+    start = time.perf_counter()
+    # Arbeitnow takes two delayed requests: its page, then an empty next page
+    jobs, report = sources.fetch_sources(deadline=2.0)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2.5
+    assert report["RemoteOK"]["status"] == "timeout"
+    assert report["Remotive"]["status"] == report["Arbeitnow"]["status"] == "ok"
+    assert len(jobs) == report["Remotive"]["jobs"] + report["Arbeitnow"]["jobs"] > 0
+
+
+def test_failing_board_opens_and_recloses_circuit(boards, connectors):
+    boards.failing.add("arbeitnow")
+    breaker = connectors["Arbeitnow"].breaker
+    breaker.reset_timeout = 1.0
+
+    _, report = sources.fetch_sources(deadline=3)
+    assert report["Arbeitnow"]["status"] == "error"
+    assert report["Remotive"]["status"] == "ok"
+
+    # Once the failure threshold is reached, further syncs skip the board
+    for _ in range(breaker.failure_threshold - 1):
+        sources.fetch_sources(deadline=3)
+    requests_made = boards.requests["arbeitnow"]
+    _, report = sources.fetch_sources(deadline=3)
+    assert report["Arbeitnow"]["status"] == "circuit_open"
+    assert boards.requests["arbeitnow"] == requests_made
+
+    # After the reset timeout one probe goes through and closes it again
+    boards.failing.clear()
+    time.sleep(breaker.reset_timeout)
+    _, report = sources.fetch_sources(deadline=3)
+    assert report["Arbeitnow"]["status"] == "ok"
+    assert sources.source_health()["Arbeitnow"]["state"] == "closed"
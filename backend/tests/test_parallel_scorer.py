@@ -0,0 +1,98 @@
+"""
+The process-wide parallel scorer while the job catalog is replaced underneath
+concurrent calls, as every import batch does.
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from app.models import User
+from app.services import parallel_scorer
+from app.services.batch_scorer import JobCatalog
+from app.services.job_features import compute_job_features
+from app.services.matcher import get_user_match_profile
+
+TITLES = ["DevOps Engineer", "Senior Cloud Architect", "Junior Python Developer", "Kubernetes SRE"]
+DESCRIPTIONS = ["aws terraform docker", "azure kubernetes python", "python django", "kubernetes go prometheus"]
+
+
+def make_catalog(n_jobs: int, offset: int) -> JobCatalog:
+    return JobCatalog.from_features(
+        (offset + i, compute_job_features({
+            "title": TITLES[i % len(TITLES)],
+            "description": DESCRIPTIONS[(i + offset) % len(DESCRIPTIONS)],
+            "location": "Remote" if i % 3 else "New York",
+        }))
+        for i in range(n_jobs)
+    )
+
+
+@pytest.fixture
+def profiles():
+    users = [
+        User(id=1, skills="AWS, Terraform, Docker", resume_text="", summary="", preferred_locations="Remote",
+             desired_salary_min=100000, desired_salary_max=150000),
+        User(id=2, skills="Python, Kubernetes", resume_text="", summary="", preferred_locations="New York",
+             desired_salary_min=90000, desired_salary_max=130000),
+    ]
+    return [get_user_match_profile(user) for user in users] + [None]
+
+
+@pytest.fixture
+def shared_scorer(monkeypatch):
+    monkeypatch.setattr(parallel_scorer, "SCORING_WORKERS", 2)
+    monkeypatch.setattr(parallel_scorer, "SCORING_CHUNK_SIZE", 500)
+    yield
+    if parallel_scorer._scorer is not None:
+        parallel_scorer._scorer.close()
+    if parallel_scorer._pool is not None:
+        parallel_scorer._pool.shutdown(wait=True)
+    parallel_scorer._scorer = None
+    parallel_scorer._pool = None
+
+
+def test_concurrent_calls_survive_catalog_changes(shared_scorer, profiles):
+    catalogs = [make_catalog(3000, offset) for offset in range(6)]
+    expected = [np.stack([catalog.score(profile) if profile else np.full(len(catalog), 75.0) for profile in profiles])
+                for catalog in catalogs]
+    current = [0]
+    calls = []
+    errors = []
+    done = threading.Event()
+
+    def request_loop():
+        while not done.is_set():
+            index = current[0]
+            try:
+                scores = parallel_scorer.parallel_score_many(catalogs[index], profiles)
+                np.testing.assert_allclose(scores, expected[index])
+                calls.append(index)
+            except Exception as e:  # noqa: BLE001 - every failure is reported below
+                errors.append(e)
+                return
+
+    # Spawn the workers before the clock matters
+    parallel_scorer.parallel_score_many(catalogs[0], profiles)
+    pool = parallel_scorer._pool
+
+    threads = [threading.Thread(target=request_loop) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for index in range(len(catalogs)):
+        if index:
+            # An import batch invalidates the catalog while requests are scoring
+            current[0] = index
+            parallel_scorer.get_parallel_scorer(catalogs[index])
+            # Worker processes are reused, not respawned per catalog
+            assert parallel_scorer._pool is pool
+        for _ in range(200):
+            if index in calls or errors:
+                break
+            threading.Event().wait(0.05)
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert set(calls) == set(range(len(catalogs)))
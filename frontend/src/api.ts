@@ -203,11 +203,36 @@ export const getRecommendedJobs = async (userId: number = 1): Promise<Job[]> =>
   }
 };
 
-export const searchJobs = async (query: string = '', location: string = '', userId: number = 1): Promise<Job[]> => {
+export interface JobPage {
+  jobs: Job[];
+  nextCursor: string | null;
+}
+
+export const getRecommendedJobsPage = async (
+  userId: number = 1,
+  limit: number = 50,
+  cursor: string | null = null,
+  mode: 'keyword' | 'semantic' = 'keyword'
+): Promise<JobPage> => {
+  const params = new URLSearchParams();
+  params.append('user_id', userId.toString());
+  params.append('limit', limit.toString());
+  if (cursor) params.append('cursor', cursor);
+  if (mode !== 'keyword') params.append('mode', mode);
+
+  const response = await api.get(`/jobs/recommended?${params}`);
+  return {
+    jobs: response.data,
+    nextCursor: response.headers['x-next-cursor'] || null
+  };
+};
+
+export const searchJobs = async (query: string = '', location: string = '', userId: number = 1, minSalary?: number): Promise<Job[]> => {
   try {
     const params = new URLSearchParams();
     if (query) params.append('query', query);
     if (location) params.append('location', location);
+    if (minSalary) params.append('min_salary', minSalary.toString());
     params.append('user_id', userId.toString());
     
     console.log('🔍 Searching jobs with params:', { query, location });
@@ -220,6 +245,12 @@ export const searchJobs = async (query: string = '', location: string = '', user
   }
 };
 
+export const getImportStatus = async (taskId: string): Promise<any> => {
+  const response = await api.get(`/jobs/import/${taskId}`);
+  return response.data;
+};
+
+// Imports run in the background; resolves with the finished task once it is done
 export const importJobs = async (query: string = 'cloud engineer', userId: number = 1): Promise<any> => {
   try {
     console.log('📥 Importing jobs...');
@@ -227,8 +258,16 @@ export const importJobs = async (query: string = 'cloud engineer', userId: numbe
       query,
       user_id: userId
     });
-    console.log('✅ Jobs imported:', response.data);
-    return response.data;
+    let task = response.data;
+    while (task.status === 'queued' || task.status === 'running') {
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      task = await getImportStatus(task.task_id);
+    }
+    if (task.status === 'failed') {
+      throw new Error(task.error || 'import task failed');
+    }
+    console.log('✅ Jobs imported:', task);
+    return task;
   } catch (error: any) {
     console.error('❌ Job import failed:', error);
     throw new Error(`Import failed: ${error.message}`);